@@ -0,0 +1,130 @@
+import pytest
+
+from playwright.sync_api import sync_playwright, Browser, Playwright
+
+from tests.page_objects.login_page import LoginPage
+from tests.support.benchmark import Baseline, measure
+from tests.support.local_app import LocalApp, USERNAME
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+layer_results_key = pytest.StashKey[dict]()
+regressions_key = pytest.StashKey[list]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--samples",
+    type=int,
+    default=10,
+    help="timed samples per setup layer",
+  )
+  parser.addoption(
+    "--warmup",
+    type=int,
+    default=1,
+    help="untimed samples per setup layer taken before the timed ones",
+  )
+  parser.addoption(
+    "--baseline",
+    default=BASELINE_PATH,
+    help="file holding the reference timings, only written with --update-baseline",
+  )
+  parser.addoption(
+    "--update-baseline",
+    action="store_true",
+    help="store the timings of this run as the new baseline",
+  )
+  parser.addoption(
+    "--regression-threshold",
+    type=float,
+    default=0.2,
+    help="fail a layer whose median is this much slower than the baseline (0.2 = 20%%)",
+  )
+  parser.addoption(
+    "--min-regression-ms",
+    type=float,
+    default=5,
+    help="ignore slowdowns smaller than this, they are noise on layers that take a few milliseconds",
+  )
+
+def pytest_configure(config):
+  config.stash[layer_results_key] = {}
+  config.stash[regressions_key] = []
+
+def pytest_sessionfinish(session):
+  config = session.config
+  results = config.stash[layer_results_key]
+  # never implicitly, a baseline recorded on another machine or by accident compares nothing
+  if results and config.getoption("update_baseline"):
+    Baseline(config.getoption("baseline")).save(results)
+
+def pytest_terminal_summary(terminalreporter, config):
+  results = config.stash[layer_results_key]
+  if not results:
+    return
+
+  width = max(len(name) for name in results)
+  terminalreporter.write_sep("-", f"setup layers ({config.getoption('samples')} samples)")
+  terminalreporter.write_line(f"{'layer':<{width}} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+  for name, summary in results.items():
+    terminalreporter.write_line(
+      f"{name:<{width}} {summary['p50_ms']:>9.1f} {summary['p90_ms']:>9.1f} {summary['p99_ms']:>9.1f} {summary['max_ms']:>9.1f}"
+    )
+  for regression in config.stash[regressions_key]:
+    terminalreporter.write_line(f"REGRESSION {regression}", red=True)
+
+@pytest.fixture(scope="session")
+def base_url():
+  with LocalApp() as app:
+    yield app.url
+
+@pytest.fixture(scope="session")
+def playwright():
+  with sync_playwright() as playwright:
+    yield playwright
+
+@pytest.fixture(scope="session")
+def browser(playwright: Playwright):
+  browser = playwright.chromium.launch()
+  yield browser
+  browser.close()
+
+@pytest.fixture(scope="function")
+def auth_context(browser: Browser, base_url):
+  """A logged-in context, the way `context_with_auth` creates it in cookie mode."""
+  with browser.new_context(storage_state=LoginPage.session_state(base_url, USERNAME)) as context:
+    yield context
+
+@pytest.fixture(scope="function")
+def benchmark(request):
+  """
+    Times a sample function for the layer named after the test and fails
+    the test when the layer regressed against the baseline, or has none.
+  """
+  config = request.config
+  name = request.node.name.removeprefix("test_")
+
+  def run(sample):
+    result = measure(sample, config.getoption("samples"), config.getoption("warmup"))
+    summary = result.summary()
+    config.stash[layer_results_key][name] = summary
+
+    if config.getoption("update_baseline"):
+      return summary
+
+    baseline = Baseline(config.getoption("baseline"))
+    if name not in baseline.layers:
+      pytest.fail(f"no baseline for {name} in {baseline.path}, record one with --update-baseline", pytrace=False)
+
+    regression = baseline.regression(
+      name,
+      summary,
+      config.getoption("regression_threshold"),
+      config.getoption("min_regression_ms"),
+    )
+    if regression is not None:
+      config.stash[regressions_key].append(regression)
+      pytest.fail(regression, pytrace=False)
+    return summary
+
+  return run
@@ -0,0 +1,91 @@
+"""
+Cost of every layer the test fixtures build before a test can start,
+measured against the local stand-in app. Run with `pytest benchmarks`.
+"""
+import re
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Playwright, expect
+
+from tests.page_objects.cart_page import CartPage
+from tests.page_objects.inventory_page import InventoryPage
+from tests.page_objects.login_page import LoginPage
+from tests.support.auth_state import AuthStateCache
+from tests.support.local_app import USERNAME, PASSWORD
+
+def start_playwright() -> float:
+  started = time.perf_counter()
+  playwright = sync_playwright().start()
+  elapsed = time.perf_counter() - started
+  playwright.stop()
+  return elapsed
+
+def test_playwright_start(benchmark):
+  """`sync_playwright` start, the first thing the session does."""
+  # the sync API refuses to start a second instance in a thread that already runs one
+  with ThreadPoolExecutor(max_workers=1) as executor:
+    benchmark(lambda: executor.submit(start_playwright).result())
+
+def test_browser_launch(benchmark, playwright: Playwright):
+  def sample():
+    started = time.perf_counter()
+    browser = playwright.chromium.launch()
+    elapsed = time.perf_counter() - started
+    browser.close()
+    return elapsed
+
+  benchmark(sample)
+
+def test_new_context(benchmark, browser: Browser):
+  def sample():
+    started = time.perf_counter()
+    context = browser.new_context()
+    elapsed = time.perf_counter() - started
+    context.close()
+    return elapsed
+
+  benchmark(sample)
+
+def test_storage_state_load(benchmark, browser: Browser, base_url, tmp_path):
+  """Reading the cached login from disk and opening a context with it, as `context_with_auth` does."""
+  path = str(tmp_path / "storagestate.json")
+  AuthStateCache(path, base_url, USERNAME).save(LoginPage.session_state(base_url, USERNAME))
+
+  def sample():
+    started = time.perf_counter()
+    state = AuthStateCache(path, base_url, USERNAME).load()
+    context = browser.new_context(storage_state=state)
+    elapsed = time.perf_counter() - started
+    context.close()
+    return elapsed
+
+  benchmark(sample)
+
+def test_ui_login(benchmark, browser: Browser, base_url):
+  def sample():
+    with browser.new_context() as context, context.new_page() as page:
+      page.goto(base_url)
+      login = LoginPage(page)
+      started = time.perf_counter()
+      login.perform_login(USERNAME, PASSWORD)
+      assert login.has_logged_in()
+      return time.perf_counter() - started
+
+  benchmark(sample)
+
+def navigate(context: BrowserContext, url: str, path: str) -> float:
+  with context.new_page() as page:
+    started = time.perf_counter()
+    page.goto(url)
+    page.wait_for_load_state('domcontentloaded')
+    expect(page).to_have_url(re.compile(".*" + path))
+    return time.perf_counter() - started
+
+def test_inventory_page_navigation(benchmark, auth_context: BrowserContext, base_url):
+  benchmark(lambda: navigate(auth_context, urljoin(base_url, InventoryPage.PATH), InventoryPage.PATH))
+
+def test_cart_page_navigation(benchmark, auth_context: BrowserContext, base_url):
+  benchmark(lambda: navigate(auth_context, urljoin(base_url, CartPage.PATH), CartPage.PATH))
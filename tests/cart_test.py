@@ -5,6 +5,7 @@ from playwright.sync_api import BrowserContext, Page
 from tests.page_objects.shared.nav_bar import NavBar
 from tests.page_objects.inventory_page import InventoryPage
 from tests.page_objects.cart_page import CartPage
+from tests.page_objects.cart_state import CartState
 
 def test_add_to_cart(inventory_page: Page):
   """
@@ -55,17 +56,16 @@ def test_remove_from_cart(inventory_page: Page):
   """
   inventory = InventoryPage(inventory_page)
   navbar = NavBar(inventory_page)
-  items = inventory.get_inventory_items()
+  snapshot = inventory.snapshot()
 
-  if len(items) == 0:
+  if len(snapshot) == 0:
     pytest.skip("No items to add to cart")
     return
 
-  # Add all items to the cart
-  for item in items:
-    if item.in_cart():
-      continue
-    item.add_to_cart()
+  # Seed the cart with all items, adding through the UI is covered by test_add_to_cart
+  CartState(inventory_page).set_items([item['id'] for item in snapshot])
+  inventory_page.reload()
+  items = inventory.get_inventory_items()
 
   total_items_in_cart = len(items)
   assert navbar.get_item_count() == total_items_in_cart
@@ -96,20 +96,20 @@ def test_ensure_cart_page_has_items(inventory_page: Page):
       continue
     item.add_to_cart()
   
-  serialized_items = [item.serialize() for item in items]
+  serialized_items = inventory.snapshot()
   items_map = {item['name']: item for item in serialized_items}
 
   # Navigate to the cart page
   navbar.click_shopping_cart_link()
   cart_page = CartPage(inventory_page)
-  cart_items = cart_page.get_cart_items()
+  cart_items = cart_page.snapshot()
 
   assert len(cart_items) == len(serialized_items)
 
   for item in cart_items:
-    assert item.get_name() in items_map
-    assert item.get_quantity() > 0
-    assert item.get_price() == items_map[item.get_name()]['price']
+    assert item['name'] in items_map
+    assert item['quantity'] > 0
+    assert item['price'] == items_map[item['name']]['price']
 
 def test_cart_page_remove_item(inventory_page: Page):
   """
@@ -118,14 +118,14 @@ def test_cart_page_remove_item(inventory_page: Page):
   """
   inventory = InventoryPage(inventory_page)
   navbar = NavBar(inventory_page)
-  items = inventory.get_inventory_items()
+  snapshot = inventory.snapshot()
 
-  if len(items) == 0:
+  if len(snapshot) == 0:
     pytest.skip("No items to add to cart")
 
-  # Add all items to the cart
-  for item in items:
-    item.add_to_cart()
+  # Seed the cart with all items, adding through the UI is covered by test_add_to_cart
+  CartState(inventory_page).set_items([item['id'] for item in snapshot])
+  inventory_page.reload()
 
   navbar.click_shopping_cart_link()
   cart_page = CartPage(inventory_page)
@@ -7,48 +7,71 @@ from playwright.sync_api import BrowserContext, Page, expect
 from tests.page_objects.shared.nav_bar import NavBar
 from tests.page_objects.inventory_page import InventoryPage
 from tests.page_objects.cart_page import CartPage
+from tests.page_objects.cart_state import CartState
 from tests.page_objects.checkout_info_page import CheckoutInfoPage
 from tests.page_objects.checkout_finalize_page import CheckoutFinalizePage
 from tests.page_objects.checkout_complete import CheckoutCompletePage
 
 @pytest.fixture(scope="function")
 def inventory_items(inventory_page):
-  """Adds all available inventory items to the cart and ensures they are removed after the test."""
+  """Puts all available inventory items in the cart and ensures they are removed after the test."""
   with allure.step("Adding all items to cart"):
-    inv_page = InventoryPage(inventory_page)
-    items = inv_page.get_inventory_items()
-    for item in items:
-      if item.in_cart():
-        continue
-      item.add_to_cart()
+    items = InventoryPage(inventory_page).snapshot()
+    cart = CartState(inventory_page)
+    cart.set_items([item['id'] for item in items])
     
-    yield [item.serialize() for item in items]
+    yield items
 
-  for item in items:
-    item.remove_from_cart()
+  cart.clear()
 
 @pytest.fixture(scope="function")
-def cart_page(context_with_auth: BrowserContext, env):
+def cart_page(context_with_auth: BrowserContext, env, har_archive, web_vitals):
   """Navigates to the cart page and ensures it is ready for testing."""
   with context_with_auth.new_page() as page, allure.step("Navigate to cart page"):
-    page.goto(urljoin(env["base_url"], CartPage.PATH))
-    page.wait_for_load_state('domcontentloaded')
+    har_archive.open(page, CartPage.PATH)
+    with web_vitals.navigation(page, CartPage.PATH):
+      page.goto(urljoin(env["base_url"], CartPage.PATH))
+      page.wait_for_load_state('domcontentloaded')
     yield page
+    har_archive.check(page)
 
 @pytest.fixture(scope="function")
-def checkout_step_one_page(cart_page: Page, env):
+def checkout_step_one_page(cart_page: Page, env, har_archive, web_vitals):
   """Proceeds to the checkout step one page from the cart."""
   with allure.step("Navigate to checkout step one page"):
-    cart_page.goto(urljoin(env["base_url"], CheckoutInfoPage.PATH))
-    cart_page.wait_for_load_state('domcontentloaded')
+    har_archive.open(cart_page, CheckoutInfoPage.PATH)
+    with web_vitals.navigation(cart_page, CheckoutInfoPage.PATH):
+      cart_page.goto(urljoin(env["base_url"], CheckoutInfoPage.PATH))
+      cart_page.wait_for_load_state('domcontentloaded')
     yield cart_page
 
 @pytest.fixture(scope="function")
-def checkout_finalize_page(context_with_auth: BrowserContext, env):
+def checkout_finalize_page(context_with_auth: BrowserContext, env, har_archive, web_vitals):
   """Loads the final checkout page."""
   with context_with_auth.new_page() as page, allure.step("Navigate to checkout finalize page"):
-    page.goto(urljoin(env["base_url"], CheckoutFinalizePage.PATH))
+    har_archive.open(page, CheckoutFinalizePage.PATH)
+    with web_vitals.navigation(page, CheckoutFinalizePage.PATH):
+      page.goto(urljoin(env["base_url"], CheckoutFinalizePage.PATH))
+      page.wait_for_load_state('domcontentloaded')
+    yield page
+    har_archive.check(page)
+
+@pytest.fixture(scope="function")
+def validation_checkout_page(request, shared_pages, env):
+  """The checkout information page with every item in the cart, shared by every validation case."""
+  def prepare(page: Page):
+    page.goto(urljoin(env["base_url"], InventoryPage.PATH))
+    CartState(page).set_items([item['id'] for item in InventoryPage(page).snapshot()])
+    page.goto(urljoin(env["base_url"], CheckoutInfoPage.PATH))
     page.wait_for_load_state('domcontentloaded')
+
+  with shared_pages.case(
+    request.node,
+    "checkout-info",
+    prepare=prepare,
+    reset=lambda page: CheckoutInfoPage(page).reset_form(),
+    logged_in=True,
+  ) as page:
     yield page
 
 def test_can_move_to_checkout(cart_page: Page, inventory_items):
@@ -88,9 +111,9 @@ def test_validate_checkout_input(checkout_step_one_page: Page, inventory_items):
   ('John', '', '123', 'Last Name is required'),
   ('John', 'Doe', '', 'Postal Code is required'),
 ])
-def test_checkout_info_has_validation_errors(inventory_items, checkout_step_one_page: Page, firstname, lastname, zipcode, msg):
+def test_checkout_info_has_validation_errors(validation_checkout_page: Page, firstname, lastname, zipcode, msg):
   """Checks for proper validation errors when checkout information is incomplete."""
-  info_page = CheckoutInfoPage(checkout_step_one_page)
+  info_page = CheckoutInfoPage(validation_checkout_page)
   info_page.set_first_name(firstname)
   info_page.set_last_name(lastname)
   info_page.set_zip_code(zipcode)
@@ -102,30 +125,28 @@ def test_validate_finalize_checkout_details(inventory_items: [dict], checkout_fi
   """Verifies that final checkout details match expected values."""
   finalize_page = CheckoutFinalizePage(checkout_finalize_page)
   item_map = {item['name']: item for item in inventory_items}
+  summary = finalize_page.snapshot()
 
   with allure.step("Verifying labels are visible"):
-    assert finalize_page.sub_total_price_label.is_visible()
-    assert finalize_page.tax_label.is_visible()
-    assert finalize_page.total_label.is_visible()
+    assert summary['summary_visible']
   
-  cart_items = finalize_page.get_cart_items()
+  cart_items = summary['items']
   assert len(cart_items) == len(inventory_items)
 
   with allure.step("Verifying cart items are visible"):
     for item in cart_items:
-      with allure.step(f"Verifying item {item.get_name()} is visible"):
-        assert item.is_visible()
-        item_name = item.get_name()
-        assert item_name in item_map
-        assert item.get_price() == item_map[item_name]['price']
+      with allure.step(f"Verifying item {item['name']} is visible"):
+        assert item['visible']
+        assert item['name'] in item_map
+        assert item['price'] == item_map[item['name']]['price']
   
-  total_expected_price = sum([item.get_price() for item in cart_items])
+  total_expected_price = sum([item['price'] for item in cart_items])
   total_expected_tax = round(total_expected_price * 0.08, 2)
   
   with allure.step("Verifying cart totals match"):
-    assert finalize_page.get_sub_total_price() == total_expected_price
-    assert finalize_page.get_tax() == total_expected_tax
-    assert finalize_page.get_total() == total_expected_price + total_expected_tax
+    assert summary['sub_total_price'] == total_expected_price
+    assert summary['tax'] == total_expected_tax
+    assert summary['total'] == total_expected_price + total_expected_tax
 
   with allure.step("Verifying finish button is visible"):
     assert finalize_page.finish_button.is_visible()
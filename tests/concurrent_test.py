@@ -0,0 +1,48 @@
+from urllib.parse import urljoin
+
+from playwright.async_api import Browser
+
+from tests.page_objects.login_page import LoginPage
+from tests.page_objects.shared.nav_bar import NavBar
+from tests.page_objects.inventory_page import InventoryPage
+from tests.page_objects.cart_page import CartPage
+from tests.page_objects.checkout_info_page import CheckoutInfoPage
+from tests.page_objects.checkout_finalize_page import CheckoutFinalizePage
+from tests.page_objects.checkout_complete import CheckoutCompletePage
+
+SHOPPERS = 4
+
+async def checkout_journey(browser: Browser, env, item_index: int) -> dict:
+  """Buys a single item with the async page objects and returns the checkout summary."""
+  context = await browser.new_context(storage_state=LoginPage.session_state(env["base_url"], env["username"]))
+  try:
+    page = await context.new_page()
+    await page.goto(urljoin(env["base_url"], InventoryPage.PATH))
+
+    items = await InventoryPage(page).get_inventory_items()
+    await items[item_index % len(items)].add_to_cart()
+    await NavBar(page).click_shopping_cart_link()
+    await CartPage(page).checkout_button.click()
+
+    info_page = CheckoutInfoPage(page)
+    await info_page.set_first_name('John')
+    await info_page.set_last_name('Doe')
+    await info_page.set_zip_code('12345')
+    await info_page.continue_button_click()
+
+    finalize_page = CheckoutFinalizePage(page)
+    summary = await finalize_page.snapshot()
+    await finalize_page.click_finish()
+    await CheckoutCompletePage(page).verify_order_completion()
+    return summary
+  finally:
+    await context.close()
+
+def test_concurrent_checkouts(async_runner, async_browser: Browser, env):
+  """Runs several independent checkouts as concurrent tasks on one browser."""
+  summaries = async_runner.gather(*[checkout_journey(async_browser, env, i) for i in range(SHOPPERS)])
+
+  assert len(summaries) == SHOPPERS
+  for summary in summaries:
+    assert len(summary['items']) == 1
+    assert summary['sub_total_price'] == summary['items'][0]['price']
@@ -1,30 +1,66 @@
 import pytest
 import allure
-import datetime
 import os
 import re
 
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, Playwright, expect
-
-from tests.page_objects.login_page import LoginPage
+from playwright.async_api import async_playwright, Browser as AsyncBrowser
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Playwright, expect
 from urllib.parse import urljoin
 
-from tests.page_objects.inventory_page import InventoryPage
-
-
-@pytest.fixture(scope="session", autouse=True)
-def setup_session_dirs():
-  os.makedirs("screenshots", exist_ok=True)
-
-  yield
+# the plugins below are imported here before pytest_plugins loads them
+pytest.register_assert_rewrite("tests.support.plugins")
 
-  if os.path.exists(".auth/storagestate.json"):
-    os.remove(".auth/storagestate.json")
+from tests.page_objects.inventory_page import InventoryPage
+from tests.support.async_runner import AsyncRunner
+from tests.support.auth_state import AuthStateCache
+from tests.support.context_pool import ContextPool
+from tests.support.har_archive import HarArchive
+from tests.support.resource_policy import ResourcePolicy
+from tests.support.shared_pages import SharedPages
+from tests.support.tracing import Tracer
+from tests.support.web_vitals import WebVitals
+from tests.support.local_app import USERNAME as LOCAL_USERNAME, PASSWORD as LOCAL_PASSWORD
+from tests.support.plugins.auth import auth_storage_state
+from tests.support.plugins.local_app import local_app_url_key
+from tests.support.plugins.tracing import traced
+
+# every feature of the suite is a plugin of its own, see "Plugins" in the README.
+# `defaults` comes first, so disabling one of the others falls back to its fixtures
+pytest_plugins = [
+  "tests.support.plugins.defaults",
+  "tests.support.plugins.core",
+  "tests.support.plugins.local_app",
+  "tests.support.plugins.auth",
+  "tests.support.plugins.context_pool",
+  "tests.support.plugins.resources",
+  "tests.support.plugins.screenshots",
+  "tests.support.plugins.steps",
+  "tests.support.plugins.latency",
+  "tests.support.plugins.scheduling",
+  "tests.support.plugins.impact",
+  "tests.support.plugins.har",
+  "tests.support.plugins.web_vitals",
+  "tests.support.plugins.budgets",
+  "tests.support.plugins.tracing",
+  "tests.support.plugins.retries",
+  "tests.support.plugins.allure_results",
+]
 
 @pytest.fixture(scope='session')
-def env():
+def env(pytestconfig):
   load_dotenv()
+
+  # the local stand-in only knows its own demo accounts
+  local_url = pytestconfig.stash.get(local_app_url_key, None)
+  if local_url is not None:
+    return {
+      "headless": os.getenv("HEADLESS", "true").lower() == "true",
+      "base_url": local_url,
+      "username": LOCAL_USERNAME,
+      "password": LOCAL_PASSWORD
+    }
+
   return {
     "headless": os.getenv("HEADLESS").lower() == "true",
     "base_url": os.getenv("BASE_URL"),
@@ -42,56 +78,67 @@ def browser(playwright: Playwright, env):
   with playwright.chromium.launch(headless=env['headless']) as browser:
     yield browser
 
+@pytest.fixture(scope="session")
+def async_runner():
+  runner = AsyncRunner().start()
+  yield runner
+  runner.stop()
+
+@pytest.fixture(scope='session')
+def async_browser(async_runner: AsyncRunner, env) -> AsyncBrowser:
+  """A browser driven through playwright.async_api, for running scenarios as concurrent tasks."""
+  playwright = async_runner.run(async_playwright().start())
+  browser = async_runner.run(playwright.chromium.launch(headless=env['headless']))
+  yield browser
+  async_runner.run(browser.close())
+  async_runner.run(playwright.stop())
+
 @pytest.fixture(scope='function')
-def context(browser: Browser):
-  with browser.new_context() as context:
+def context(request, context_pool: ContextPool, har_archive: HarArchive, resource_policy: ResourcePolicy, tracer: Tracer):
+  context = context_pool.acquire()
+  # the resource policy goes last, so it runs before the HAR replay
+  har_archive.install(context)
+  resource_policy.install(context)
+  with traced(request, tracer, context):
     yield context
+  resource_policy.uninstall(context)
+  har_archive.uninstall(context)
+  context_pool.release(context)
 
 @pytest.fixture(scope='function')
-def context_with_auth(browser: Browser, env):
-  # if we already have a session, don't create a new one
-  # load the existing session from disk
-  if os.path.exists('.auth/storagestate.json'):
-    with browser.new_context(storage_state='.auth/storagestate.json') as context:
-      yield context
-    return
-
-  # if we don't have a session, create a new one
-  # and save it to disk
-  with browser.new_context() as context:
-    with context.new_page() as page:
-      page.goto(env["base_url"])
-      login = LoginPage(page)
-      login.perform_login(env["username"], env["password"])
-      assert login.has_logged_in()
-
-    context.storage_state(path='.auth/storagestate.json')
+def context_with_auth(request, browser: Browser, env, auth_state: AuthStateCache, context_pool: ContextPool, har_archive: HarArchive, resource_policy: ResourcePolicy, tracer: Tracer, pytestconfig):
+  context = context_pool.acquire(auth_storage_state(browser, env, auth_state, pytestconfig))
+  # the resource policy goes last, so it runs before the HAR replay
+  har_archive.install(context)
+  resource_policy.install(context)
+  with traced(request, tracer, context):
     yield context
-
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-  outcome = yield
-  report = outcome.get_result()
-  failing_status = "skipped" if hasattr(report, "wasxfail") else "failed"
-  if report.when != "call" or report.outcome != failing_status:
-    return
-
-  for arg in item.funcargs:
-    if not isinstance(item.funcargs[arg], Page):
-      continue
-
-    page = item.funcargs[arg]
-    now = datetime.datetime.now()
-    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
-    path = f"screenshots/{item.name}_{timestamp}.png"
-    page.screenshot(path=path)
-    allure.attach.file(path, "image/png")
+  resource_policy.uninstall(context)
+  har_archive.uninstall(context)
+  context_pool.release(context)
+
+@pytest.fixture(scope='module')
+def shared_pages(browser: Browser, env, auth_state: AuthStateCache, context_pool: ContextPool, resource_sizes, default_resource_policy, pytestconfig):
+  """
+    Pages shared by the cases of a parametrized test in this module, see
+    `tests/support/shared_pages.py`. `resources` markers do not apply to them.
+  """
+  pages = SharedPages(
+    context_pool,
+    ResourcePolicy(default_resource_policy, env["base_url"], resource_sizes),
+    lambda: auth_storage_state(browser, env, auth_state, pytestconfig),
+  )
+  yield pages
+  pages.close()
 
 @pytest.fixture(scope='function')
-def inventory_page(context_with_auth: BrowserContext, env):
+def inventory_page(context_with_auth: BrowserContext, env, har_archive: HarArchive, web_vitals: WebVitals):
   """Navigates to the inventory page and ensures it is ready for testing."""
   with context_with_auth.new_page() as page, allure.step("Navigate to inventory page"):
-    page.goto(urljoin(env["base_url"], "/inventory.html"))
-    page.wait_for_load_state('domcontentloaded')
+    har_archive.open(page, InventoryPage.PATH)
+    with web_vitals.navigation(page, InventoryPage.PATH):
+      page.goto(urljoin(env["base_url"], "/inventory.html"))
+      page.wait_for_load_state('domcontentloaded')
     expect(page).to_have_url(re.compile(".*" + InventoryPage.PATH))
-    yield page
\ No newline at end of file
+    yield page
+    har_archive.check(page)
\ No newline at end of file
@@ -1,12 +1,20 @@
 import re
+import json
 import allure
 import pytest
+from dataclasses import asdict
 from urllib.parse import urljoin
-from playwright.sync_api import BrowserContext, Page, expect
+from playwright.sync_api import Browser, BrowserContext, Page, expect
 
 from tests.page_objects.shared.nav_bar import NavBar
+from tests.page_objects.inventory_item import InventoryItem
 from tests.page_objects.inventory_page import InventoryPage
+from tests.page_objects.login_page import LoginPage
+from tests.support.har_archive import HarArchive
+from tests.support.image_check import check_images
+from tests.support.resource_policy import ResourcePolicy
 
+@pytest.mark.resources("images")
 def test_inventory_items_are_displayed(inventory_page: Page, env):
   """Ensures that all inventory items have visible and non-empty properties, and their images load correctly."""
   inventory = InventoryPage(inventory_page)
@@ -21,11 +29,17 @@ def test_inventory_items_are_displayed(inventory_page: Page, env):
         with allure.step(f"Verifying {key} is visible and non-empty"):
           assert prop.is_visible() and len(prop.text_content()) > 0, f"{prop} is not visible or empty"
 
-      with allure.step(f"Verifying image {item.image.get_attribute('src')} loads correctly"):
-        img_src = item.image.get_attribute('src')
-        img_url = urljoin(env["base_url"], img_src)
-        res = inventory_page.request.get(img_url)
-        assert res.status == 200, f"Image {img_url} failed to load with status {res.status}"
+  with allure.step("Verifying images load correctly"):
+    image_urls = [urljoin(env["base_url"], item['image']) if item['image'] else None for item in inventory.snapshot()]
+    results = check_images(image_urls, cookies=inventory_page.context.cookies())
+    allure.attach(
+      json.dumps([asdict(result) for result in results], indent=2),
+      name="Image availability",
+      attachment_type=allure.attachment_type.JSON
+    )
+
+    failed = [f"{result.url} ({result.status or result.error})" for result in results if not result.ok]
+    assert not failed, f"Images failed to load: {', '.join(failed)}"
 
 @pytest.mark.parametrize("sort,key,order", [
   ('az', 'name', 'asc'),
@@ -36,19 +50,42 @@ def test_inventory_items_are_displayed(inventory_page: Page, env):
 def test_sort_by(inventory_page: Page, sort, key, order):
   """Verifies that sorting functionality works correctly for different criteria."""
   inventory = InventoryPage(inventory_page)
-  items = inventory.get_inventory_items()
-  if len(items) == 0:
+  li = inventory.snapshot()
+  if len(li) == 0:
     pytest.skip("No items present in inventory")
 
   with allure.step("Sorting items"):
-    li = [item.serialize() for item in items]
     li = sorted(li, key=lambda x: x[key], reverse=order == 'desc')
   
   inventory.set_sort_by(sort)
-  sorted_li = [item.serialize() for item in inventory.get_inventory_items()]
+  sorted_li = inventory.snapshot()
   
   with allure.step("Verifying sorting results"):
     for i in range(len(li)):
       assert li[i]['name'] == sorted_li[i]['name'], f"Sorting mismatch at index {i}: Expected {li[i]['name']}, got {sorted_li[i]['name']}"
       assert li[i]['price'] == sorted_li[i]['price'], f"Price mismatch at index {i}: Expected {li[i]['price']}, got {sorted_li[i]['price']}"
 
+def test_har_replay_keeps_the_resource_policy(browser: Browser, env, tmp_path):
+  """Replays a recording that holds the product images, the "none" resource policy must still stub them."""
+  har_archive = HarArchive(str(tmp_path), env["base_url"], "record", browser)
+  policy = ResourcePolicy("none", env["base_url"], {})
+
+  with browser.new_context(storage_state=LoginPage.session_state(env["base_url"], env["username"])) as context:
+    # the order of the context fixtures
+    har_archive.install(context)
+    policy.install(context)
+    with context.new_page() as page:
+      har_archive.open(page, InventoryPage.PATH)
+      page.goto(urljoin(env["base_url"], InventoryPage.PATH))
+      page.wait_for_load_state("load")
+      widths = page.eval_on_selector_all(InventoryItem.image.selector, "images => images.map(image => image.naturalWidth)")
+      har_archive.check(page)
+
+  with allure.step("Verifying the recording holds the images"):
+    with open(har_archive.path(InventoryPage.PATH)) as f:
+      entries = json.load(f)["log"]["entries"]
+    assert any(entry["response"]["content"].get("mimeType", "").startswith("image/") for entry in entries)
+
+  with allure.step("Verifying the images were stubbed, not replayed"):
+    assert widths and set(widths) == {1}, f"Image widths: {widths}"
+    assert policy.stats.stubbed >= len(widths)
@@ -4,10 +4,22 @@ from playwright.sync_api import BrowserContext, Page
 from tests.page_objects.login_page import LoginPage
 
 @pytest.fixture(scope="function")
-def login_page(context: BrowserContext, env):
+def login_page(context: BrowserContext, env, web_vitals):
   """Navigates to the login page and ensures it is ready for testing."""
   with context.new_page() as page:
-    page.goto(env["base_url"])
+    with web_vitals.navigation(page, LoginPage.PATH):
+      page.goto(env["base_url"])
+    yield page
+
+@pytest.fixture(scope="function")
+def validation_login_page(request, shared_pages, env):
+  """The login page shared by every validation case, with the form emptied for each case."""
+  with shared_pages.case(
+    request.node,
+    "login",
+    prepare=lambda page: page.goto(env["base_url"]),
+    reset=lambda page: LoginPage(page).reset_form(),
+  ) as page:
     yield page
 
 def test_login_should_succeed(login_page: Page, env):
@@ -21,9 +33,9 @@ def test_login_should_succeed(login_page: Page, env):
   ('wrong_user', '', 'Password is required'),
   ('wrong', 'wrong', "do not match any user")
 ])
-def test_login_field_validation(login_page: Page, username, password, error_txt):
+def test_login_field_validation(validation_login_page: Page, username, password, error_txt):
   """Check validation messages for invalid credentials."""
-  login = LoginPage(login_page)
+  login = LoginPage(validation_login_page)
   login.perform_login(username, password)
 
   assert not login.has_logged_in()
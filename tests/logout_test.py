@@ -6,19 +6,19 @@ from urllib.parse import urljoin
 from playwright.sync_api import BrowserContext, Page, expect
 
 from tests.page_objects.login_page import LoginPage
+from tests.page_objects.inventory_page import InventoryPage
 from tests.page_objects.shared.nav_bar import NavBar
 from tests.page_objects.shared.side_bar import SideBar
 
 @pytest.fixture(scope="function")
-def home_page(context: BrowserContext, env):
+def home_page(context_with_auth: BrowserContext, env, web_vitals):
   """
-  Fixture to log in to the application and return a Playwright page object.
+  Fixture to open the inventory page with an authenticated session and return a Playwright page object.
   """
-  with context.new_page() as page, allure.step("Setup login"):
-    page.goto(urljoin(env["base_url"], LoginPage.PATH))
-    login_page = LoginPage(page)
-    login_page.perform_login(env["username"], env["password"])
-    assert login_page.has_logged_in()
+  with context_with_auth.new_page() as page, allure.step("Setup login"):
+    with web_vitals.navigation(page, InventoryPage.PATH):
+      page.goto(urljoin(env["base_url"], InventoryPage.PATH))
+    assert LoginPage.is_logged_in(page.context)
     yield page
 
 def test_logout(home_page: Page):
@@ -1,53 +1,98 @@
-import allure
 import re
 
 from playwright.sync_api import Locator
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
+
+# builds the serialized form of one cart line, visibility follows Playwright's
+# definition: a non-empty bounding box and no `visibility: hidden`
+RECORD_SCRIPT = """
+(node, selectors) => {
+  const visible = (el) => {
+    if (!el) return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  const name = node.querySelector(selectors.name);
+  const price = node.querySelector(selectors.price);
+  const quantity = node.querySelector(selectors.quantity);
+  return {
+    name: name ? name.innerText : null,
+    price: price ? price.innerText : null,
+    quantity: quantity ? quantity.innerText : null,
+    visible: visible(node) && visible(name) && visible(price) && visible(quantity),
+  };
+}
+"""
+
+class CartItem(PageObject):
+  ROOT = "item_node"
+
+  name = Selector("[data-test='inventory-item-name']")
+  price = Selector("[data-test='inventory-item-price']")
+  quantity = Selector("[data-test='item-quantity']")
+  remove = Selector('[data-test^="remove-"]')
 
-class CartItem:
   def __init__(self, item_node: Locator):
-    self.item_node = item_node
-    self.name = item_node.locator("[data-test='inventory-item-name']")
-    self.price = item_node.locator("[data-test='inventory-item-price']")
-    self.quantity = item_node.locator("[data-test='item-quantity']")
-    self.remove = item_node.locator('[data-test^="remove-"]')
+    super().__init__(item_node)
+
+  @staticmethod
+  def selectors() -> dict:
+    return { "name": CartItem.name.selector, "price": CartItem.price.selector, "quantity": CartItem.quantity.selector }
 
-  @allure.step("Clicking remove button")
+  @staticmethod
+  def parse_record(record: dict) -> dict:
+    """
+      Converts a raw record from RECORD_SCRIPT into the shape returned by serialize.
+      Fields whose node is missing are None.
+    """
+    price, quantity = record["price"], record["quantity"]
+    return {
+      "name": record["name"],
+      "price": None if price is None else float(re.sub(r'[^\d\.]', '', price)),
+      "quantity": None if quantity is None else int(quantity),
+      "visible": record["visible"]
+    }
+
+  @step("Clicking remove button")
   def click_remove(self):
-    self.remove.click()
+    yield self.remove.click()
 
-  @allure.step("Verifying item is visible")
+  @step("Verifying item is visible", fine=True)
   def is_visible(self):
     try:
-      assert self.item_node.is_visible()
-      assert self.name.is_visible()
-      assert self.price.is_visible()
-      assert self.quantity.is_visible()
-    except:
+      assert (yield self.item_node.is_visible())
+      assert (yield self.name.is_visible())
+      assert (yield self.price.is_visible())
+      assert (yield self.quantity.is_visible())
+    except Exception:
       return False
     return True
 
-  @allure.step("Getting price")
+  @step("Getting price", fine=True)
   def get_price(self):
-    return float(re.sub(r'[^\d\.]', '', self.price.inner_text()))
+    price = yield self.price.inner_text()
+    return float(re.sub(r'[^\d\.]', '', price))
 
-  @allure.step("Getting quantity")  
+  @step("Getting quantity", fine=True)  
   def get_quantity(self):
-    return int(self.quantity.inner_text())
+    quantity = yield self.quantity.inner_text()
+    return int(quantity)
 
-  @allure.step("Getting name")
+  @step("Getting name", fine=True)
   def get_name(self):
-    return self.name.inner_text()
+    return (yield self.name.inner_text())
   
-  @allure.step("Getting total price")
+  @step("Getting total price", fine=True)
   def total_price(self):
-    return self.get_price() * self.get_quantity()
+    price = yield self.get_price()
+    quantity = yield self.get_quantity()
+    return price * quantity
 
-  @allure.step("Serializing item")
+  @step("Serializing item", fine=True)
   def serialize(self):
     return {
-      "name": self.name.inner_text(),
-      "price": self.get_price(),
-      "quantity": self.get_quantity()
+      "name": (yield self.name.inner_text()),
+      "price": (yield self.get_price()),
+      "quantity": (yield self.get_quantity())
     }
-  
-  
\ No newline at end of file
@@ -1,25 +1,38 @@
-import allure
 import pytest
 
 from playwright.sync_api import Page
-from tests.page_objects.cart_item import CartItem
+from tests.page_objects.cart_item import CartItem, RECORD_SCRIPT
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
 
-class CartPage:
+class CartPage(PageObject):
   PATH = "/cart.html"
 
-  def __init__(self, page: Page):
-    self.page = page
+  cart_items = Selector('[data-test="inventory-item"]')
+  checkout_button = Selector('[data-test="checkout"]')
+  continue_shopping_button = Selector('[data-test="continue-shopping"]')
 
-    self.cart_items = page.locator('[data-test="inventory-item"]')
-    self.checkout_button = page.locator('[data-test="checkout"]')
-    self.continue_shopping_button = page.locator('[data-test="continue-shopping"]')
+  def __init__(self, page: Page):
+    super().__init__(page)
 
-  @allure.step("Getting cart items")
+  @step("Getting cart items", fine=True)
   def get_cart_items(self) -> list[CartItem]:
-    cart_items = self.cart_items.all()
+    cart_items = yield self.cart_items.all()
     cart_li = []
     for item in cart_items:
       item_node = CartItem(item)
       cart_li.append(item_node)
 
-    return cart_li
\ No newline at end of file
+    return cart_li
+
+  @step("Taking cart snapshot")
+  def snapshot(self) -> list[dict]:
+    """
+      Returns name, price, quantity and visibility of every cart item
+      using a single `evaluate_all` call.
+    """
+    records = yield self.cart_items.evaluate_all(
+      f"(nodes, selectors) => nodes.map((node) => ({RECORD_SCRIPT})(node, selectors))",
+      CartItem.selectors()
+    )
+    return [CartItem.parse_record(record) for record in records]
@@ -0,0 +1,34 @@
+import json
+
+from playwright.sync_api import Page
+from tests.page_objects.shared.steps import step
+
+class CartState:
+  """
+    Reads and writes the cart straight from the `cart-contents` localStorage
+    key the site keeps it in, so a test can start with any cart in a single
+    call instead of clicking every add-to-cart button.
+
+    The page must already be on the app origin. Pages that are open keep
+    showing the old cart until they are reloaded or navigated.
+  """
+  STORAGE_KEY = "cart-contents"
+
+  def __init__(self, page: Page):
+    self.page = page
+
+  @step("Seeding cart")
+  def set_items(self, item_ids: list[int]):
+    yield self.page.evaluate(
+      "([key, value]) => value === null ? localStorage.removeItem(key) : localStorage.setItem(key, value)",
+      [self.STORAGE_KEY, json.dumps(item_ids) if item_ids else None]
+    )
+
+  @step("Clearing cart")
+  def clear(self):
+    yield self.set_items([])
+
+  @step("Getting cart contents", fine=True)
+  def get_items(self) -> list[int]:
+    value = yield self.page.evaluate("(key) => localStorage.getItem(key)", self.STORAGE_KEY)
+    return json.loads(value) if value else []
@@ -1,32 +1,33 @@
-import allure
-from playwright.sync_api import Page, expect
+from playwright.sync_api import Page
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step, nested_step, expect
 
-class CheckoutCompletePage:
+class CheckoutCompletePage(PageObject):
     PATH = "/checkout-complete.html"
 
-    def __init__(self, page: Page):
-      self.page = page
+    _back_home_button = Selector("#back-to-products")  # Using the ID, which is best practice
+    _complete_header = Selector("[data-test='complete-header']") # Better selector
+    _complete_text = Selector("[data-test='complete-text']") # Added for more thorough checking
 
-      self._back_home_button = self.page.locator("#back-to-products")  # Using the ID, which is best practice
-      self._complete_header = self.page.locator("[data-test='complete-header']") # Better selector
-      self._complete_text = self.page.locator("[data-test='complete-text']") # Added for more thorough checking
+    def __init__(self, page: Page):
+      super().__init__(page)
 
-    @allure.step("Clicking back home button")
+    @step("Clicking back home button")
     def click_back_home(self):
-        self._back_home_button.click()
+        yield self._back_home_button.click()
 
-    @allure.step("Verifying order completion")
+    @step("Verifying order completion")
     def verify_order_completion(self):
       """
         Verifies the order completion message and other elements on the page.
       """
-      with allure.step("Verifying back home button is visible"):
-        expect(self._complete_header).to_be_visible()
-      with allure.step("Verifying complete header text"):
-        expect(self._complete_header).to_have_text("Thank you for your order!") # More specific check
-      with allure.step("Verifying complete text is visible"):
-        expect(self._complete_text).to_be_visible()
-      with allure.step("Verifying complete text text"):
-        expect(self._complete_text).to_have_text("Your order has been dispatched, and will arrive just as fast as the pony can get there!") # More specific check
-      with allure.step("Verifying back home button is visible"):
-        expect(self._back_home_button).to_be_visible()  # Ensure button is present
+      with nested_step(self, "Verifying back home button is visible"):
+        yield expect(self._complete_header).to_be_visible()
+      with nested_step(self, "Verifying complete header text"):
+        yield expect(self._complete_header).to_have_text("Thank you for your order!") # More specific check
+      with nested_step(self, "Verifying complete text is visible"):
+        yield expect(self._complete_text).to_be_visible()
+      with nested_step(self, "Verifying complete text text"):
+        yield expect(self._complete_text).to_have_text("Your order has been dispatched, and will arrive just as fast as the pony can get there!") # More specific check
+      with nested_step(self, "Verifying back home button is visible"):
+        yield expect(self._back_home_button).to_be_visible()  # Ensure button is present
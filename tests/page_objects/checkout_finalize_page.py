@@ -1,38 +1,60 @@
-import allure
 import re
 
 from playwright.sync_api import Page
-from tests.page_objects.cart_item import CartItem
+from tests.page_objects.cart_item import CartItem, RECORD_SCRIPT
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
 
-class CheckoutFinalizePage:
+SNAPSHOT_SCRIPT = f"""
+(selectors) => {{
+  const record = {RECORD_SCRIPT};
+  const label = (selector) => {{
+    const el = document.querySelector(selector);
+    if (!el) return {{ text: null, visible: false }};
+    const rect = el.getBoundingClientRect();
+    return {{ text: el.innerText, visible: rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden' }};
+  }};
+  return {{
+    items: Array.from(document.querySelectorAll(selectors.item)).map((node) => record(node, selectors)),
+    subTotal: label(selectors.subTotal),
+    tax: label(selectors.tax),
+    total: label(selectors.total),
+  }};
+}}
+"""
+
+class CheckoutFinalizePage(PageObject):
   PATH = "/checkout-step-two.html"
 
-  def __init__(self, page: Page):
-    self.page = page
+  finish_button = Selector('[data-test="finish"]')
+  cancel_button = Selector('[data-test="cancel"]')
+  cart_item = Selector('[data-test="inventory-item"]')
 
-    self.finish_button = page.locator('[data-test="finish"]')
-    self.cancel_button = page.locator('[data-test="cancel"]')
-    self.cart_item = page.locator('[data-test="inventory-item"]')
+  sub_total_price_label = Selector('[data-test="subtotal-label"]')
+  tax_label = Selector('[data-test="tax-label"]')
+  total_label = Selector('[data-test="total-label"]')
 
-    self.sub_total_price_label = page.locator('[data-test="subtotal-label"]')
-    self.tax_label = page.locator('[data-test="tax-label"]')
-    self.total_label = page.locator('[data-test="total-label"]')
+  def __init__(self, page: Page):
+    super().__init__(page)
 
-  @allure.step("Getting sub total price")
+  @step("Getting sub total price", fine=True)
   def get_sub_total_price(self):
-    return float(re.sub(r'[^\d\.]', '', self.sub_total_price_label.inner_text()))
+    sub_total = yield self.sub_total_price_label.inner_text()
+    return float(re.sub(r'[^\d\.]', '', sub_total))
   
-  @allure.step("Getting tax")
+  @step("Getting tax", fine=True)
   def get_tax(self):
-    return float(re.sub(r'[^\d\.]', '', self.tax_label.inner_text()))
+    tax = yield self.tax_label.inner_text()
+    return float(re.sub(r'[^\d\.]', '', tax))
   
-  @allure.step("Getting total")
+  @step("Getting total", fine=True)
   def get_total(self):
-    return float(re.sub(r'[^\d\.]', '', self.total_label.inner_text()))
+    total = yield self.total_label.inner_text()
+    return float(re.sub(r'[^\d\.]', '', total))
 
-  @allure.step("Getting cart items")
+  @step("Getting cart items", fine=True)
   def get_cart_items(self) -> list[CartItem]:
-    cart_items = self.cart_item.all()
+    cart_items = yield self.cart_item.all()
     cart_li = []
     for item in cart_items:
       item_node = CartItem(item)
@@ -40,10 +62,35 @@ class CheckoutFinalizePage:
 
     return cart_li
 
-  @allure.step("Clicking finish button")
+  @step("Taking checkout summary snapshot")
+  def snapshot(self) -> dict:
+    """
+      Returns every cart line plus the parsed summary totals using a single
+      `evaluate` call. Totals are None when their label is missing.
+    """
+    raw = yield self.page.evaluate(SNAPSHOT_SCRIPT, {
+      **CartItem.selectors(),
+      "item": CheckoutFinalizePage.cart_item.selector,
+      "subTotal": CheckoutFinalizePage.sub_total_price_label.selector,
+      "tax": CheckoutFinalizePage.tax_label.selector,
+      "total": CheckoutFinalizePage.total_label.selector,
+    })
+
+    def parse(label):
+      return None if label["text"] is None else float(re.sub(r'[^\d\.]', '', label["text"]))
+
+    return {
+      "items": [CartItem.parse_record(record) for record in raw["items"]],
+      "sub_total_price": parse(raw["subTotal"]),
+      "tax": parse(raw["tax"]),
+      "total": parse(raw["total"]),
+      "summary_visible": all(raw[key]["visible"] for key in ("subTotal", "tax", "total"))
+    }
+
+  @step("Clicking finish button")
   def click_finish(self):
-    self.finish_button.click() 
+    yield self.finish_button.click() 
   
-  @allure.step("Clicking cancel button")
+  @step("Clicking cancel button")
   def click_cancel(self):
-    self.cancel_button.click()
\ No newline at end of file
+    yield self.cancel_button.click()
\ No newline at end of file
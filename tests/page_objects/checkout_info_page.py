@@ -1,49 +1,60 @@
-import allure
 from playwright.sync_api import Page
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
 
-class CheckoutInfoPage:
+class CheckoutInfoPage(PageObject):
   PATH = "/checkout-step-one.html"
 
-  def __init__(self, page: Page):
-    self.page = page
+  first_name = Selector('[data-test="firstName"]')
+  last_name = Selector('[data-test="lastName"]')
+  zip_code = Selector('[data-test="postalCode"]')
 
-    self.first_name = page.locator('[data-test="firstName"]')
-    self.last_name = page.locator('[data-test="lastName"]')
-    self.zip_code = page.locator('[data-test="postalCode"]')
+  continue_button = Selector('[data-test="continue"]')
+  error_message = Selector('.error-message-container')
+  error_button = Selector('[data-test="error-button"]')
 
-    self.continue_button = page.locator('[data-test="continue"]')
-    self.error_message = page.locator('.error-message-container')
+  def __init__(self, page: Page):
+    super().__init__(page)
 
-  @allure.step("Getting error message")
+  @step("Getting error message", fine=True)
   def get_error_message(self):
-    if not self.error_message.is_visible():
+    if not (yield self.error_message.is_visible()):
       return None
-    return self.error_message.text_content()
-
-  @allure.step("Setting first name")
+    return (yield self.error_message.text_content())
+
+  @step("Resetting form")
+  def reset_form(self):
+    """Empties every field and dismisses the error banner, so the form can be submitted again."""
+    yield self.first_name.clear()
+    yield self.last_name.clear()
+    yield self.zip_code.clear()
+    if (yield self.error_button.is_visible()):
+      yield self.error_button.click()
+
+  @step("Setting first name")
   def set_first_name(self, first_name: str):
-    self.first_name.fill(first_name)
+    yield self.first_name.fill(first_name)
 
-  @allure.step("Setting last name")
+  @step("Setting last name")
   def set_last_name(self, last_name: str):
-    self.last_name.fill(last_name)
+    yield self.last_name.fill(last_name)
 
-  @allure.step("Setting zip code")
+  @step("Setting zip code")
   def set_zip_code(self, zip_code: str):
-    self.zip_code.fill(zip_code)
+    yield self.zip_code.fill(zip_code)
 
-  @allure.step("Getting first name")
+  @step("Getting first name", fine=True)
   def get_first_name(self):
-    return self.first_name.input_value()
+    return (yield self.first_name.input_value())
 
-  @allure.step("Getting last name")
+  @step("Getting last name", fine=True)
   def get_last_name(self):
-    return self.last_name.input_value()
+    return (yield self.last_name.input_value())
 
-  @allure.step("Getting zip code")
+  @step("Getting zip code", fine=True)
   def get_zip_code(self):
-    return self.zip_code.input_value()
+    return (yield self.zip_code.input_value())
 
-  @allure.step("Clicking continue button")
+  @step("Clicking continue button")
   def continue_button_click(self):
-    self.continue_button.click()
\ No newline at end of file
+    yield self.continue_button.click()
\ No newline at end of file
@@ -1,41 +1,45 @@
-import allure
 import re
 
 from playwright.sync_api import Locator
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step, nested_step
 
-class InventoryItem:
-  def __init__(self, item_node: Locator):
-    self.item_node = item_node
+class InventoryItem(PageObject):
+  ROOT = "item_node"
+
+  name = Selector("[data-test='inventory-item-name']")
+  price = Selector("[data-test='inventory-item-price']")
+  description = Selector("[data-test='inventory-item-description']")
+  image = Selector("img.inventory_item_img")
+  title_link = Selector("a[id$='_title_link']")
 
-    self.name = item_node.locator("[data-test='inventory-item-name']")
-    self.price = item_node.locator("[data-test='inventory-item-price']")
-    self.description = item_node.locator("[data-test='inventory-item-description']")
-    self.image = item_node.locator("img.inventory_item_img")
+  add_to_cart_btn = Selector('[data-test^="add-to-cart"]')
+  remove_from_cart_btn = Selector('[data-test^="remove-"]')
 
-    self.add_to_cart_btn = item_node.locator('[data-test^="add-to-cart"]')
-    self.remove_from_cart_btn = item_node.locator('[data-test^="remove-"]')
+  def __init__(self, item_node: Locator):
+    super().__init__(item_node)
   
-  @allure.step("Removing item from cart")
+  @step("Removing item from cart")
   def remove_from_cart(self):
-    self.remove_from_cart_btn.click()
+    yield self.remove_from_cart_btn.click()
   
-  @allure.step("Adding item to cart")
+  @step("Adding item to cart")
   def add_to_cart(self):
-    self.add_to_cart_btn.click()
+    yield self.add_to_cart_btn.click()
 
-  @allure.step("Serializing item")
+  @step("Serializing item", fine=True)
   def serialize(self):
-    with allure.step("Getting name"):
-      name = self.name.inner_text()
+    with nested_step(self, "Getting name"):
+      name = yield self.name.inner_text()
     
-    with allure.step("Getting price"):
-      price = float(re.sub(r'[^\d\.]', '', self.price.inner_text()))
+    with nested_step(self, "Getting price"):
+      price = float(re.sub(r'[^\d\.]', '', (yield self.price.inner_text())))
     
-    with allure.step("Getting description"):
-      description = self.description.inner_text()
+    with nested_step(self, "Getting description"):
+      description = yield self.description.inner_text()
     
-    with allure.step("Getting image"):
-      image = self.image.get_attribute('src')
+    with nested_step(self, "Getting image"):
+      image = yield self.image.get_attribute('src')
     
     return {
       "name": name ,
@@ -44,6 +48,6 @@ class InventoryItem:
       "image": image
     }
   
-  @allure.step("Verifying item is in cart")
+  @step("Verifying item is in cart", fine=True)
   def in_cart(self):
-    return self.remove_from_cart_btn.is_visible()
\ No newline at end of file
+    return (yield self.remove_from_cart_btn.is_visible())
\ No newline at end of file
@@ -1,34 +1,58 @@
-import allure
+import re
 
 from playwright.sync_api import Page
 from tests.page_objects.inventory_item import InventoryItem
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step, nested_step
 
-class InventoryPage:
+# reads the same fields as InventoryItem.serialize, plus the product id, for every item in one browser call
+SNAPSHOT_SCRIPT = """
+(nodes, selectors) => nodes.map((node) => {
+  const text = (selector) => {
+    const el = node.querySelector(selector);
+    return el ? el.innerText : null;
+  };
+  const image = node.querySelector(selectors.image);
+  const link = node.querySelector(selectors.titleLink);
+  const id = link ? link.id.match(/^item_(\\d+)_title_link$/) : null;
+  return {
+    id: id ? Number(id[1]) : null,
+    name: text(selectors.name),
+    price: text(selectors.price),
+    description: text(selectors.description),
+    image: image ? image.getAttribute('src') : null,
+  };
+})
+"""
+
+class InventoryPage(PageObject):
   PATH = "/inventory.html"
 
-  def __init__(self, page: Page):
-    self.page = page
+  inventory_list = Selector('[data-test="inventory-item"]')
+  inventory_item = Selector('[data-test="inventory-item"]')
+  sort_by = Selector('[data-test="product-sort-container"]')
 
-    self.inventory_list = page.locator('[data-test="inventory-item"]')
-    self.inventory_item = page.locator('[data-test="inventory-item"]')
-    self.sort_by = page.locator('[data-test="product-sort-container"]')
+  def __init__(self, page: Page):
+    super().__init__(page)
  
-  @allure.step("Setting sort by")
+  @step("Setting sort by")
   def set_sort_by(self, sort):
-    with allure.step("Finding available sort options"):
-      all_options = self.sort_by.locator('option').all()
+    with nested_step(self, "Finding available sort options"):
+      all_options = yield self.sort_by.locator('option').all()
 
-    with allure.step("Verifying sort option is available"):
-      available_options = [option.get_attribute('value') for option in all_options ]
+    with nested_step(self, "Verifying sort option is available"):
+      available_options = []
+      for option in all_options:
+        available_options.append((yield option.get_attribute('value')))
       assert sort in available_options
 
-    with allure.step("Selecting sort option"):
-      self.sort_by.select_option(sort)
+    with nested_step(self, "Selecting sort option"):
+      yield self.sort_by.select_option(sort)
   
-  @allure.step("Getting inventory items")
+  @step("Getting inventory items", fine=True)
   def get_inventory_items(self) -> list[InventoryItem]:
-    with allure.step("Getting inventory items"):
-      inventory_items = self.inventory_list.all()
+    with nested_step(self, "Getting inventory items"):
+      inventory_items = yield self.inventory_list.all()
 
     inventory_li = []
     for item in inventory_items:
@@ -36,4 +60,24 @@ class InventoryPage:
       inventory_li.append(item_node)
 
     return inventory_li
-  
\ No newline at end of file
+
+  @step("Taking inventory snapshot")
+  def snapshot(self) -> list[dict]:
+    """
+      Returns the serialized form of every inventory item using a single
+      `evaluate_all` call instead of one round trip per field per item.
+      Fields whose node is missing are None.
+    """
+    records = yield self.inventory_item.evaluate_all(SNAPSHOT_SCRIPT, {
+      "name": InventoryItem.name.selector,
+      "price": InventoryItem.price.selector,
+      "description": InventoryItem.description.selector,
+      "image": InventoryItem.image.selector,
+      "titleLink": InventoryItem.title_link.selector,
+    })
+
+    for record in records:
+      if record["price"] is not None:
+        record["price"] = float(re.sub(r'[^\d\.]', '', record["price"]))
+
+    return records
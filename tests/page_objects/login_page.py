@@ -1,59 +1,97 @@
-import allure
+import time
 
+from urllib.parse import urlsplit
 from playwright.sync_api import Page, BrowserContext
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
 
-class LoginPage:
+class LoginPage(PageObject):
   PATH = "/"
-  def __init__(self, page: Page):
-    self.page = page
+  SESSION_COOKIE = "session-username"
+  # the site expires its session cookie 10 minutes after login
+  SESSION_TTL = 600
+
+  username_field = Selector("[data-test='username']")
+  password_field = Selector("[data-test='password']")
+  login_button = Selector("[data-test='login-button']")
+  error_message = Selector("[data-test='error']")
+  error_button = Selector("[data-test='error-button']")
 
-    self.username_field = page.locator("[data-test='username']")
-    self.password_field = page.locator("[data-test='password']")
-    self.login_button = page.locator("[data-test='login-button']")
-    self.error_message = page.locator("[data-test='error']")
+  # helper selector to wait for the login action to complete
+  error_or_success = Selector('[data-test="logout-sidebar-link"],[data-test="error"]')
 
-    # helper selector to wait for the login action to complete
-    self.error_or_success = page.locator('[data-test="logout-sidebar-link"],[data-test="error"]')
+  def __init__(self, page: Page):
+    super().__init__(page)
   
-  @allure.step("Setting username")
+  @step("Setting username")
   def set_username(self, username: str):
-    self.username_field.fill(username)
+    yield self.username_field.fill(username)
 
-  @allure.step("Getting username field")
+  @step("Getting username field", fine=True)
   def get_username_field(self):
-    return self.username_field.text_content()
+    return (yield self.username_field.text_content())
 
-  @allure.step("Getting error message")
+  @step("Getting error message", fine=True)
   def get_error_message(self):
-    if not self.error_message.is_visible():
+    if not (yield self.error_message.is_visible()):
       return None
-    return self.error_message.text_content()
+    return (yield self.error_message.text_content())
 
-  @allure.step("Setting password")
+  @step("Setting password")
   def set_password(self, password: str):
-    self.password_field.fill(password) 
+    yield self.password_field.fill(password) 
 
-  @allure.step("Clicking login button")
+  @step("Clicking login button")
   def click_login(self):
-    self.login_button.click() 
+    yield self.login_button.click() 
   
-  def is_logged_in(context: BrowserContext):
-    cookies = context.cookies()
+  def session_cookie(cookies: list[dict]):
     for cookie in cookies:
-      if cookie['name'] == 'session-username':
-        return True
-    return False
+      if cookie['name'] == LoginPage.SESSION_COOKIE:
+        return cookie
+    return None
+
+  def session_state(base_url: str, username: str) -> dict:
+    """
+      Builds a storage state holding the session cookie the site sets on a
+      successful login. Loading it into a new context skips the login form.
+    """
+    return {
+      "cookies": [{
+        "name": LoginPage.SESSION_COOKIE,
+        "value": username,
+        "domain": urlsplit(base_url).hostname,
+        "path": "/",
+        "expires": time.time() + LoginPage.SESSION_TTL,
+        "httpOnly": False,
+        "secure": False,
+        "sameSite": "Lax"
+      }],
+      "origins": []
+    }
+
+  def is_logged_in(context: BrowserContext):
+    return LoginPage.session_cookie(context.cookies()) is not None
   
-  @allure.step("Verifying login")
+  @step("Verifying login", fine=True)
   def has_logged_in(self):
-    return LoginPage.is_logged_in(self.page.context)
+    cookies = yield self.page.context.cookies()
+    return LoginPage.session_cookie(cookies) is not None
+
+  @step("Resetting login form")
+  def reset_form(self):
+    """Empties both fields and dismisses the error banner, so the form can be submitted again."""
+    yield self.username_field.clear()
+    yield self.password_field.clear()
+    if (yield self.error_button.is_visible()):
+      yield self.error_button.click()
 
-  @allure.step("Performing login")
+  @step("Performing login")
   def perform_login(self, username: str, password: str): 
-    self.set_username(username)
-    self.set_password(password)
-    self.click_login()
+    yield self.set_username(username)
+    yield self.set_password(password)
+    yield self.click_login()
 
     # wait for either the logout sidebar link or the error message to appear
-    self.error_or_success.wait_for(state='visible')
+    yield self.error_or_success.wait_for(state='visible')
 
@@ -0,0 +1,97 @@
+"""
+Class-level locators for page objects.
+
+  class LoginPage(PageObject):
+    login_button = Selector("[data-test='login-button']")
+
+A `Selector` builds its `Locator` from the page object's root (`page`, or
+`item_node` for the item wrappers) the first time it is read, and keeps it
+in a slot of that instance. Page objects are `__slots__` classes, so
+wrapping every item of a long list costs one small object and no locator
+until a field is actually used. Selectors are checked when the class is
+created, so a typo fails at import instead of half way through a run.
+"""
+import re
+
+# Playwright selector engines that may prefix a selector, as in `text=Login`
+ENGINES = {"css", "xpath", "text", "id", "data-testid", "data-test-id", "data-test"}
+ENGINE_PREFIX = re.compile(r"^([a-z][a-z0-9-]*)=")
+BRACKETS = {"[": "]", "(": ")"}
+
+def check_selector(selector: str) -> str:
+  """Returns what is wrong with `selector`, an empty string when nothing is."""
+  if not isinstance(selector, str) or not selector.strip():
+    return "selector must be a non-empty string"
+
+  match = ENGINE_PREFIX.match(selector)
+  if match and match.group(1) not in ENGINES:
+    return f"unknown selector engine {match.group(1)!r}"
+  if match and match.group(1) != "css":
+    return ""
+
+  # CSS: brackets must pair up outside of quoted strings
+  expected, quote = [], None
+  for char in selector[match.end() if match else 0:]:
+    if quote:
+      quote = None if char == quote else quote
+    elif char in "'\"":
+      quote = char
+    elif char in BRACKETS:
+      expected.append(BRACKETS[char])
+    elif char in BRACKETS.values():
+      if not expected or expected.pop() != char:
+        return f"unbalanced {char!r}"
+  if quote:
+    return f"unterminated {quote} string"
+  if expected:
+    return f"missing {expected[-1]!r}"
+  return ""
+
+class Selector:
+  """A locator declared on the class, built on first access and cached per instance."""
+  __slots__ = ("selector", "name", "cache")
+
+  def __init__(self, selector: str):
+    self.selector = selector
+    self.name = None
+    self.cache = None
+
+  def __set_name__(self, owner, name: str):
+    problem = check_selector(self.selector)
+    if problem:
+      raise ValueError(f"{owner.__qualname__}.{name} = Selector({self.selector!r}): {problem}")
+
+    self.name = name
+    # the slot descriptor created for this selector by PageObjectMeta
+    self.cache = owner.__dict__[cache_slot(name)]
+
+  def __get__(self, instance, owner=None):
+    if instance is None:
+      return self
+    try:
+      return self.cache.__get__(instance, owner)
+    except AttributeError:
+      locator = getattr(instance, instance.ROOT).locator(self.selector)
+      self.cache.__set__(instance, locator)
+      return locator
+
+def cache_slot(name: str) -> str:
+  return f"_locator_{name}"
+
+class PageObjectMeta(type):
+  """Gives every page object class a slot for its root and one per selector."""
+  def __new__(mcs, name, bases, namespace):
+    slots = list(namespace.get("__slots__", ()))
+    root = namespace.get("ROOT")
+    if root is not None and not any(root in getattr(base, "__slots__", ()) for base in bases):
+      slots.append(root)
+    slots += [cache_slot(key) for key, value in namespace.items() if isinstance(value, Selector)]
+    namespace["__slots__"] = tuple(slots)
+    return super().__new__(mcs, name, bases, namespace)
+
+class PageObject(metaclass=PageObjectMeta):
+  # attribute holding what the selectors are resolved against
+  ROOT = "page"
+
+  def __init__(self, root):
+    setattr(self, self.ROOT, root)
@@ -1,24 +1,26 @@
-import allure
-class NavBar:
-  def __init__(self, page):
-    self.page = page
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
+
+class NavBar(PageObject):
+  shopping_cart_link = Selector("[data-test='shopping-cart-link']")
+  shopping_cart_badge = Selector("[data-test='shopping-cart-badge']")
 
-    self.shopping_cart_link = page.locator("[data-test='shopping-cart-link']")
-    self.shopping_cart_badge = page.locator("[data-test='shopping-cart-badge']")
+  burger_menu = Selector('#react-burger-menu-btn')
 
-    self.burger_menu = page.locator('#react-burger-menu-btn')
+  def __init__(self, page):
+    super().__init__(page)
   
-  @allure.step("Clicking burger menu")
+  @step("Clicking burger menu")
   def click_burger_menu(self):
-    self.burger_menu.click()
+    yield self.burger_menu.click()
   
-  @allure.step("Clicking shopping cart link")
+  @step("Clicking shopping cart link")
   def click_shopping_cart_link(self):
-    self.shopping_cart_link.click()
+    yield self.shopping_cart_link.click()
 
-  @allure.step("Getting item count")
+  @step("Getting item count", fine=True)
   def get_item_count(self):
-    if not self.shopping_cart_badge.is_visible():
+    if not (yield self.shopping_cart_badge.is_visible()):
       return 0
 
-    return int(self.shopping_cart_badge.text_content())
\ No newline at end of file
+    return int((yield self.shopping_cart_badge.text_content()))
\ No newline at end of file
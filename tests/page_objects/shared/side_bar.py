@@ -1,14 +1,15 @@
-import allure
-
 from playwright.sync_api import Page
+from tests.page_objects.shared.locators import PageObject, Selector
+from tests.page_objects.shared.steps import step
+
+class SideBar(PageObject):
+  _logout_link = Selector("#logout_sidebar_link")
+  _inventory_link = Selector("#inventory_sidebar_link")
+  _about_link = Selector("#about_sidebar_link")
 
-class SideBar:
   def __init__(self, page: Page):
-    self.page = page
-    self._logout_link = page.locator("#logout_sidebar_link")
-    self._inventory_link = page.locator("#inventory_sidebar_link")
-    self._about_link = page.locator("#about_sidebar_link")
+    super().__init__(page)
   
-  @allure.step("Clicking on the logout button")
+  @step("Clicking on the logout button")
   def logout(self):
-    self._logout_link.click()
\ No newline at end of file
+    yield self._logout_link.click()
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Helpers that let one page-object definition drive both Playwright APIs.
+
+Page objects build their locators with `page.locator(...)`, which is
+synchronous in `playwright.sync_api` and `playwright.async_api` alike, so
+locators are shared as-is. Steps are written as generators that `yield`
+every Playwright call and receive its result back:
+
+  @step("Getting price")
+  def get_price(self):
+    text = yield self.price.inner_text()
+    return float(text)
+
+Against a sync page the call has already run and its value is sent straight
+back, so `item.get_price()` returns a float. Against an async page the call
+returns an awaitable, so the step becomes a coroutine and callers write
+`await item.get_price()`.
+
+Allure steps are only recorded for sync page objects. Concurrent tasks share
+one thread, and allure nests steps per thread, so async steps would end up
+attached to whichever task opened a step last.
+
+How many steps reach the report is set once, at import time, by the
+`ALLURE_STEPS` environment variable (the time spent in every step is
+recorded by `tests.support.latency` regardless):
+
+  off      no page-object steps at all
+  actions  page actions become allure steps; fine-grained steps (getters,
+           marked `fine=True`) go to a bounded in-memory buffer that is
+           attached to the report only when the test fails (default)
+  full     every step becomes an allure step
+"""
+import allure
+import contextlib
+import functools
+import inspect
+import os
+import time
+
+from collections import deque
+from dataclasses import dataclass
+
+from playwright.async_api import Locator as AsyncLocator, Page as AsyncPage, expect as async_expect
+from playwright.sync_api import expect as sync_expect
+from tests.support.latency import LATENCY
+
+STEP_LEVELS = ("off", "actions", "full")
+STEP_LEVEL = os.getenv("ALLURE_STEPS", "actions")
+if STEP_LEVEL not in STEP_LEVELS:
+  raise ValueError(f"ALLURE_STEPS must be one of {STEP_LEVELS}, got {STEP_LEVEL!r}")
+
+# most recent fine-grained steps kept for a failure report
+STEP_BUFFER_SIZE = 500
+
+@dataclass
+class StepStats:
+  recorded: int = 0
+  buffered: int = 0
+  overhead_seconds: float = 0
+
+class StepBuffer:
+  """Remembers the latest fine-grained steps of the running test."""
+  def __init__(self, maxlen: int = STEP_BUFFER_SIZE):
+    self.entries = deque(maxlen=maxlen)
+    self.depth = 0
+    self.stats = StepStats()
+
+  def clear(self):
+    self.entries.clear()
+    self.depth = 0
+    self.stats = StepStats()
+
+  @contextlib.contextmanager
+  def record(self, title: str):
+    started = time.perf_counter()
+    entry = [self.depth, title, None, None]
+    self.entries.append(entry)
+    self.stats.buffered += 1
+    self.depth += 1
+    self.stats.overhead_seconds += time.perf_counter() - started
+    try:
+      yield
+    except Exception as e:
+      entry[3] = f"{type(e).__name__}: {e}"
+      raise
+    finally:
+      self.depth -= 1
+      entry[2] = (time.perf_counter() - started) * 1000
+
+  def render(self) -> str:
+    lines = []
+    for depth, title, duration_ms, error in self.entries:
+      duration = "running" if duration_ms is None else f"{duration_ms:.1f}ms"
+      lines.append(f"{'  ' * depth}{title} ({duration})" + (f" FAILED {error}" if error else ""))
+    return "\n".join(lines)
+
+STEP_BUFFER = StepBuffer()
+
+class _AllureStep:
+  """allure.step that adds its own bookkeeping time to the step stats."""
+  def __init__(self, title: str):
+    self.context = allure.step(title)
+
+  def __enter__(self):
+    started = time.perf_counter()
+    self.context.__enter__()
+    STEP_BUFFER.stats.recorded += 1
+    STEP_BUFFER.stats.overhead_seconds += time.perf_counter() - started
+
+  def __exit__(self, *exc):
+    started = time.perf_counter()
+    self.context.__exit__(*exc)
+    STEP_BUFFER.stats.overhead_seconds += time.perf_counter() - started
+    return False
+
+def _step_context(title: str, fine: bool):
+  """Picks how a step is reported for the configured level, or None when it is not."""
+  if STEP_LEVEL == "full" or (STEP_LEVEL == "actions" and not fine):
+    return lambda: _AllureStep(title)
+  if STEP_LEVEL == "actions":
+    return lambda: STEP_BUFFER.record(title)
+  return None
+
+def is_async(page_object) -> bool:
+  target = getattr(page_object, "page", None) or getattr(page_object, "item_node", None)
+  return isinstance(target, (AsyncPage, AsyncLocator))
+
+def expect(target):
+  """Returns the `expect` matching the API `target` was created with."""
+  return async_expect(target) if isinstance(target, (AsyncPage, AsyncLocator)) else sync_expect(target)
+
+def nested_step(page_object, title: str):
+  """A fine-grained step inside a step body, skipped for async page objects."""
+  context = _step_context(title, fine=True)
+  if context is None or is_async(page_object):
+    return contextlib.nullcontext()
+  return context()
+
+def _run_sync(gen, name: str):
+  started = time.perf_counter()
+  value = None
+  try:
+    while True:
+      try:
+        value = gen.send(value)
+      except StopIteration as stop:
+        return stop.value
+  finally:
+    LATENCY.add(name, time.perf_counter() - started)
+
+async def _run_async(gen, name: str):
+  started = time.perf_counter()
+  value = None
+  error = None
+  try:
+    while True:
+      try:
+        value = gen.throw(error) if error is not None else gen.send(value)
+      except StopIteration as stop:
+        return stop.value
+
+      error = None
+      if inspect.isawaitable(value):
+        try:
+          value = await value
+        except Exception as e:
+          # raise inside the step so its own try/except blocks still apply
+          error, value = e, None
+  finally:
+    LATENCY.add(name, time.perf_counter() - started)
+
+def step(title: str, fine: bool = False):
+  """
+    Marks a generator method as a page-object step, see the module docstring.
+    `fine` marks getters and checks that are only worth reporting on failure.
+  """
+  def decorator(func):
+    if not inspect.isgeneratorfunction(func):
+      raise TypeError(f"{func.__qualname__} must yield its Playwright calls to be used as a step")
+
+    context = _step_context(title, fine)
+    name = func.__qualname__
+
+    if context is None:
+      @functools.wraps(func)
+      def wrapper(self, *args, **kwargs):
+        if is_async(self):
+          return _run_async(func(self, *args, **kwargs), name)
+        return _run_sync(func(self, *args, **kwargs), name)
+
+      return wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+      if is_async(self):
+        return _run_async(func(self, *args, **kwargs), name)
+
+      with context():
+        return _run_sync(func(self, *args, **kwargs), name)
+
+    return wrapper
+
+  return decorator
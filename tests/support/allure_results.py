@@ -0,0 +1,205 @@
+"""
+Allure results written in batches, and old runs archived with a retention limit.
+
+`BatchedResultsLogger` takes the place of allure's own file logger. Test
+results and fixture containers are kept in memory and appended as compact
+JSON lines to one batch file per worker (`reports.batches/<worker>.jsonl`),
+instead of one indented file each. Attachments are stored under a name
+derived from their content, so the same body attached by many tests, or by
+several workers, is written once. At the end of the session the controller
+merges the batches into the result files `allure generate` reads.
+
+Results of a previous run are moved into a compressed archive
+(`reports.archive/<time>.tar.gz`) when the next run starts, keeping the
+last runs within a count and size limit, so `reports/` only ever holds one
+run and the archive cannot grow without bound.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import time
+import uuid
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import attr
+
+from allure_commons import hookimpl
+
+# results kept in memory before they are appended to the worker's batch file
+BATCH_SIZE = 50
+
+@dataclass
+class ResultsStats:
+  results: int = 0
+  containers: int = 0
+  attachments: int = 0
+  duplicate_attachments: int = 0
+  saved_bytes: int = 0
+
+  def merge(self, other: "ResultsStats"):
+    for key, value in asdict(other).items():
+      setattr(self, key, getattr(self, key) + value)
+
+def batches_dir(report_dir: str) -> Path:
+  return Path(f"{Path(report_dir).absolute()}.batches")
+
+def archive_dir(report_dir: str) -> Path:
+  return Path(f"{Path(report_dir).absolute()}.archive")
+
+def content_name(digest: str, file_name: str) -> str:
+  return f"{digest[:32]}-attachment{Path(file_name).suffix}"
+
+def replace_sources(data, aliases: dict[str, str]):
+  """Points attachments of a result, its steps and fixtures at the stored copy of their content."""
+  if isinstance(data, dict):
+    if "source" in data and data["source"] in aliases:
+      data["source"] = aliases[data["source"]]
+    for value in data.values():
+      replace_sources(value, aliases)
+  elif isinstance(data, list):
+    for value in data:
+      replace_sources(value, aliases)
+
+class BatchedResultsLogger:
+  def __init__(self, report_dir: str, worker: str, batch_size: int = BATCH_SIZE):
+    self.report_dir = Path(report_dir).absolute()
+    self.report_dir.mkdir(parents=True, exist_ok=True)
+    self.batch_path = batches_dir(report_dir) / f"{worker}.jsonl"
+    self.batch_path.parent.mkdir(parents=True, exist_ok=True)
+    self.batch_size = batch_size
+    self.stats = ResultsStats()
+    self._pending: list[tuple[str, dict]] = []
+    self._aliases: dict[str, str] = {}
+    self._stored: set[str] = set()
+    self._closed = False
+
+  def _report_item(self, item):
+    data = attr.asdict(item, filter=lambda _, value: value or value is False)
+    self._pending.append((item.file_pattern.format(prefix=uuid.uuid4()), data))
+    if self._closed or len(self._pending) >= self.batch_size:
+      self.flush()
+
+  @hookimpl
+  def report_result(self, result):
+    self.stats.results += 1
+    self._report_item(result)
+
+  @hookimpl
+  def report_container(self, container):
+    self.stats.containers += 1
+    self._report_item(container)
+
+  @hookimpl
+  def report_attached_file(self, source, file_name):
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+      for block in iter(lambda: f.read(1024 * 1024), b""):
+        digest.update(block)
+    self._store(digest.hexdigest(), file_name, os.path.getsize(source), lambda path: shutil.copyfile(source, path))
+
+  @hookimpl
+  def report_attached_data(self, body, file_name):
+    if isinstance(body, str):
+      body = body.encode("utf-8")
+    self._store(hashlib.sha256(body).hexdigest(), file_name, len(body), lambda path: path.write_bytes(body))
+
+  def _store(self, digest: str, file_name: str, size: int, write):
+    name = content_name(digest, file_name)
+    self._aliases[file_name] = name
+    self.stats.attachments += 1
+
+    path = self.report_dir / name
+    # another xdist worker may already have stored the same content
+    if name in self._stored or path.exists():
+      self.stats.duplicate_attachments += 1
+      self.stats.saved_bytes += size
+      self._stored.add(name)
+      return
+
+    tmp_path = path.with_name(f"{name}.{os.getpid()}.tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+    self._stored.add(name)
+
+  def flush(self):
+    if not self._pending:
+      return
+
+    lines = []
+    for name, data in self._pending:
+      replace_sources(data, self._aliases)
+      lines.append(json.dumps({"name": name, "data": data}, ensure_ascii=False, separators=(",", ":")))
+    with open(self.batch_path, "a", encoding="utf-8") as f:
+      f.write("\n".join(lines) + "\n")
+    self._pending.clear()
+
+  def close(self):
+    """Writes what is still buffered, anything reported later is written right away."""
+    self.flush()
+    self._closed = True
+
+def merge_batches(report_dir: str) -> int:
+  """Turns the batch files of every worker into allure result files, returns how many were written."""
+  directory = batches_dir(report_dir)
+  if not directory.is_dir() or not Path(report_dir).is_dir():
+    return 0
+
+  written = 0
+  for batch in sorted(directory.glob("*.jsonl")):
+    with open(batch, encoding="utf-8") as f:
+      for line in f:
+        item = json.loads(line)
+        with open(Path(report_dir) / item["name"], "w", encoding="utf-8") as result:
+          json.dump(item["data"], result, ensure_ascii=False, separators=(",", ":"))
+        written += 1
+    batch.unlink()
+  return written
+
+@dataclass
+class Retention:
+  archived: int = 0
+  pruned: int = 0
+  archive_bytes: int = 0
+
+def archive_previous_run(report_dir: str, keep_runs: int, keep_bytes: int) -> Retention:
+  """Moves the results left in `report_dir` into a compressed archive, then prunes the oldest archives."""
+  retention = Retention()
+  report_dir = Path(report_dir).absolute()
+  archives = archive_dir(report_dir)
+  # batches left by a run that was interrupted still belong to it
+  merge_batches(report_dir)
+  files = [path for path in report_dir.iterdir() if path.is_file()] if report_dir.is_dir() else []
+
+  if files and keep_runs > 0:
+    archives.mkdir(parents=True, exist_ok=True)
+    finished = time.strftime("%Y%m%d-%H%M%S", time.localtime(max(path.stat().st_mtime for path in files)))
+    tmp_path = archives / f"{finished}.{os.getpid()}.tmp"
+    with tarfile.open(tmp_path, "w:gz") as archive:
+      for path in files:
+        archive.add(path, arcname=path.name)
+    # runs that finished within the same second get a counter
+    target, counter = archives / f"{finished}.tar.gz", 1
+    while target.exists():
+      counter += 1
+      target = archives / f"{finished}-{counter}.tar.gz"
+    os.replace(tmp_path, target)
+    retention.archived = len(files)
+  for path in files:
+    path.unlink()
+
+  # newest first, by when they were archived
+  kept = sorted(archives.glob("*.tar.gz"), key=lambda path: (path.stat().st_mtime, path.name), reverse=True) if archives.is_dir() else []
+  total = 0
+  for index, path in enumerate(kept):
+    size = path.stat().st_size
+    if index >= keep_runs or total + size > keep_bytes:
+      path.unlink()
+      retention.pruned += 1
+    else:
+      total += size
+  retention.archive_bytes = total
+  return retention
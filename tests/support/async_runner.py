@@ -0,0 +1,39 @@
+"""
+Background event loop for the async page objects.
+
+The sync Playwright API keeps its own event loop suspended inside the test
+thread, so asyncio code cannot run there. The runner owns a loop in a
+separate thread and blocks the test until the submitted coroutines finish.
+"""
+import asyncio
+import threading
+
+from typing import Any, Awaitable
+
+class AsyncRunner:
+  def __init__(self):
+    self.loop = asyncio.new_event_loop()
+    self._thread = threading.Thread(target=self.loop.run_forever, name="async-runner", daemon=True)
+
+  def start(self):
+    self._thread.start()
+    return self
+
+  def run(self, awaitable: Awaitable, timeout: float = None) -> Any:
+    """Runs one awaitable on the loop and returns its result."""
+    async def wrapper():
+      return await awaitable
+
+    return asyncio.run_coroutine_threadsafe(wrapper(), self.loop).result(timeout)
+
+  def gather(self, *awaitables: Awaitable, timeout: float = None) -> list:
+    """Runs the awaitables as concurrent tasks and returns their results in order."""
+    async def wrapper():
+      return await asyncio.gather(*awaitables)
+
+    return asyncio.run_coroutine_threadsafe(wrapper(), self.loop).result(timeout)
+
+  def stop(self):
+    self.loop.call_soon_threadsafe(self.loop.stop)
+    self._thread.join()
+    self.loop.close()
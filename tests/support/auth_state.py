@@ -0,0 +1,104 @@
+"""
+Authenticated storage-state cache shared by all xdist workers.
+
+Exactly one process performs the UI login while the others wait on a file
+lock; everybody else reuses the saved state until the `session-username`
+cookie is about to expire. With a TTL the state also survives across
+pytest invocations. A failed login clears the cache.
+"""
+import json
+import os
+import tempfile
+import time
+
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from filelock import FileLock
+
+from tests.page_objects.login_page import LoginPage
+
+# a state that expires within this window is treated as already expired
+EXPIRY_MARGIN_SECONDS = 30
+
+class AuthStateCache:
+  def __init__(self, path: str, base_url: str, username: str, ttl: float = 0):
+    self.path = path
+    self.lock = FileLock(f"{path}.lock")
+    self.host = urlsplit(base_url).hostname
+    self.username = username
+    self.ttl = ttl
+    self._state = None
+
+  def is_valid(self, state: dict, created: float) -> bool:
+    """Checks the session cookie belongs to this app and user and is still alive."""
+    now = time.time()
+    if self.ttl > 0 and created + self.ttl < now:
+      return False
+
+    cookie = LoginPage.session_cookie(state.get("cookies", []))
+    if cookie is None or cookie["value"] != self.username:
+      return False
+    if cookie["domain"].lstrip(".") != self.host:
+      return False
+
+    # session cookies (expires == -1) live as long as the browser
+    return cookie["expires"] < 0 or cookie["expires"] > now + EXPIRY_MARGIN_SECONDS
+
+  def load(self) -> Optional[dict]:
+    if self._state is not None and self.is_valid(*self._state):
+      return self._state[0]
+
+    try:
+      created = os.path.getmtime(self.path)
+      with open(self.path) as f:
+        state = json.load(f)
+    except (OSError, ValueError):
+      return None
+
+    if not self.is_valid(state, created):
+      return None
+
+    self._state = (state, created)
+    return state
+
+  def save(self, state: dict):
+    """Writes the state atomically so readers never see a partial file."""
+    directory = os.path.dirname(self.path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".storagestate-", suffix=".tmp")
+    try:
+      with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+      os.replace(tmp_path, self.path)
+    except BaseException:
+      os.unlink(tmp_path)
+      raise
+
+    self._state = (state, os.path.getmtime(self.path))
+
+  def get_or_create(self, login: Callable[[], dict]) -> dict:
+    """Returns a valid storage state, calling `login` only if no worker has one yet."""
+    state = self.load()
+    if state is not None:
+      return state
+
+    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+    with self.lock:
+      # another worker may have logged in while we were waiting
+      state = self.load()
+      if state is None:
+        try:
+          state = login()
+        except BaseException:
+          # drop the state that failed validation too, the next worker or run logs in afresh
+          self.clear()
+          raise
+        self.save(state)
+    return state
+
+  def clear(self):
+    """Forgets the state, also on disk."""
+    self._state = None
+    if os.path.exists(self.path):
+      os.remove(self.path)
@@ -0,0 +1,90 @@
+"""
+Repeated timings of the suite's setup layers, compared with a stored baseline.
+
+A layer is timed by a sample function that does its own setup and cleanup
+and returns only the seconds spent in the layer. Layers are compared on
+their median, which is far less noisy than the mean on a shared CI machine.
+"""
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+
+from dataclasses import dataclass
+from importlib.metadata import version
+from typing import Callable, Optional
+
+def percentile(values: list[float], q: float) -> float:
+  """Nearest-rank percentile, `q` between 0 and 100."""
+  ordered = sorted(values)
+  rank = max(math.ceil(q / 100 * len(ordered)), 1)
+  return ordered[rank - 1]
+
+@dataclass
+class LayerResult:
+  samples_ms: list[float]
+
+  def percentile(self, q: float) -> float:
+    return percentile(self.samples_ms, q)
+
+  def summary(self) -> dict:
+    return {
+      "samples": len(self.samples_ms),
+      "min_ms": round(min(self.samples_ms), 3),
+      "p50_ms": round(self.percentile(50), 3),
+      "p90_ms": round(self.percentile(90), 3),
+      "p99_ms": round(self.percentile(99), 3),
+      "max_ms": round(max(self.samples_ms), 3),
+    }
+
+def measure(sample: Callable[[], float], samples: int, warmup: int = 1) -> LayerResult:
+  """Calls `sample` `warmup + samples` times and keeps the timings after the warmup."""
+  for _ in range(warmup):
+    sample()
+  return LayerResult([sample() * 1000 for _ in range(samples)])
+
+class Baseline:
+  def __init__(self, path: str):
+    self.path = path
+    self.layers = {}
+    if os.path.exists(path):
+      with open(path) as f:
+        self.layers = json.load(f)["layers"]
+
+  def regression(self, name: str, summary: dict, threshold: float, min_delta_ms: float) -> Optional[str]:
+    """Describes how `name` got slower than the baseline, None when it did not."""
+    base_p50 = self.layers.get(name, {}).get("p50_ms")
+    if base_p50 is None:
+      return None
+
+    delta = summary["p50_ms"] - base_p50
+    if delta <= min_delta_ms or summary["p50_ms"] <= base_p50 * (1 + threshold):
+      return None
+    # a layer recorded at 0ms has no relative change, only the absolute one
+    growth = f"+{delta / base_p50:.0%}" if base_p50 else f"+{delta:.1f}ms"
+    return (
+      f"{name} p50 went from {base_p50:.1f}ms to {summary['p50_ms']:.1f}ms "
+      f"({growth}, allowed +{threshold:.0%})"
+    )
+
+  def save(self, layers: dict):
+    """Merges `layers` into the file, layers that did not run keep their old numbers."""
+    self.layers.update(layers)
+    content = {
+      "recorded": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+      "machine": f"{platform.system()} {platform.machine()}, python {platform.python_version()}, playwright {version('playwright')}",
+      "layers": self.layers,
+    }
+
+    directory = os.path.dirname(self.path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".baseline-", suffix=".tmp")
+    try:
+      with os.fdopen(fd, "w") as f:
+        json.dump(content, f, indent=2)
+      os.replace(tmp_path, self.path)
+    except BaseException:
+      os.unlink(tmp_path)
+      raise
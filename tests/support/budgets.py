@@ -0,0 +1,186 @@
+"""
+Performance budgets checked at the end of a run.
+
+The budget file sets limits per throttling profile on the page loads of a
+page-object `PATH`, on journeys from one path to another within a page,
+and on the per-call latency of page-object actions:
+
+  {
+    "tolerance": {"sigmas": 3, "relative": 0.1, "runs": 10, "min_runs": 3},
+    "profiles": {
+      "desktop": {
+        "pages": {"/inventory.html": {"load_ms": 2000, "requests": 30}},
+        "journeys": {"login → inventory": {"from": "/", "to": "/inventory.html", "duration_ms": 4000}},
+        "actions": {"LoginPage.perform_login": {"latency_ms": 2000}}
+      }
+    }
+  }
+
+A metric fails when the median of this run is over its limit, or when it
+is above the median of the last `runs` passing runs by more than the noise
+of those runs (`sigmas` robust standard deviations) and more than
+`relative` of the baseline. Only metrics that pass join the baseline, so a
+regression does not become the new normal.
+"""
+import json
+import statistics
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+BASELINE_KEY = "swaglab/perf_baseline"
+
+# metrics a page budget can limit, all taken from the web vitals of its loads
+PAGE_METRICS = (
+  "load_ms",
+  "dom_content_loaded_ms",
+  "ttfb_ms",
+  "first_contentful_paint_ms",
+  "largest_contentful_paint_ms",
+  "cumulative_layout_shift",
+  "requests",
+  "transferred_bytes",
+  "js_heap_bytes",
+)
+
+# scales the median absolute deviation to a standard deviation of normally distributed samples
+MAD_TO_SIGMA = 1.4826
+
+@dataclass
+class Tolerance:
+  sigmas: float = 3
+  relative: float = 0.1
+  runs: int = 10
+  min_runs: int = 3
+
+@dataclass
+class Budgets:
+  profile: str
+  pages: dict[str, dict] = field(default_factory=dict)
+  journeys: dict[str, dict] = field(default_factory=dict)
+  actions: dict[str, dict] = field(default_factory=dict)
+  tolerance: Tolerance = field(default_factory=Tolerance)
+
+  @classmethod
+  def load(cls, path: str, profile: str) -> "Budgets":
+    with open(path) as f:
+      content = json.load(f)
+
+    budgets = content.get("profiles", {}).get(profile, {})
+    for page_path, limits in budgets.get("pages", {}).items():
+      unknown = set(limits) - set(PAGE_METRICS)
+      if unknown:
+        raise ValueError(f"Unknown page metrics {sorted(unknown)} for {page_path} in {path}, expected some of {PAGE_METRICS}")
+    for name, journey in budgets.get("journeys", {}).items():
+      if not {"from", "to", "duration_ms"} <= set(journey):
+        raise ValueError(f"Journey {name!r} in {path} needs 'from', 'to' and 'duration_ms'")
+
+    return cls(
+      profile,
+      pages=budgets.get("pages", {}),
+      journeys=budgets.get("journeys", {}),
+      actions=budgets.get("actions", {}),
+      tolerance=Tolerance(**content.get("tolerance", {})),
+    )
+
+  def limits(self) -> dict[str, float]:
+    """Every limited metric by its name in the report."""
+    limits = {}
+    for path, metrics in self.pages.items():
+      for metric, limit in metrics.items():
+        limits[f"page {path} {metric}"] = limit
+    for name, journey in self.journeys.items():
+      limits[f"journey {name} duration_ms"] = journey["duration_ms"]
+    for name, metrics in self.actions.items():
+      for metric, limit in metrics.items():
+        limits[f"action {name} {metric}"] = limit
+    return limits
+
+def journey_durations(visits: list[dict], start: str, end: str) -> list[float]:
+  """Milliseconds from each arrival at `start` to the next arrival at `end` in one page's visits."""
+  durations, started = [], None
+  for visit in visits:
+    if visit["path"] == end and started is not None:
+      durations.append(visit["at_ms"] - started)
+      started = None
+    if visit["path"] == start and started is None:
+      started = visit["at_ms"]
+  return durations
+
+def collect(budgets: Budgets, web_vitals: list[dict], latency: list[dict]) -> dict[str, list[float]]:
+  """Samples of every budgeted metric from the `web_vitals` and `latency` properties of the run's tests."""
+  samples = {name: [] for name in budgets.limits()}
+  for item in web_vitals:
+    for navigation in item["navigations"]:
+      for metric in budgets.pages.get(navigation["path"], {}):
+        if navigation.get(metric) is not None:
+          samples[f"page {navigation['path']} {metric}"].append(navigation[metric])
+    for name, journey in budgets.journeys.items():
+      for visits in item["visits"]:
+        samples[f"journey {name} duration_ms"] += journey_durations(visits, journey["from"], journey["to"])
+
+  for item in latency:
+    for name, metrics in budgets.actions.items():
+      if name not in item["timings"]:
+        continue
+      calls, total_ms, max_ms = item["timings"][name]
+      for metric in metrics:
+        samples[f"action {name} {metric}"].append(max_ms if metric == "max_ms" else total_ms / calls)
+  return samples
+
+@dataclass
+class Check:
+  metric: str
+  limit: float
+  current: Optional[float]
+  baseline: Optional[float] = None
+  allowed: Optional[float] = None
+  failure: str = ""
+
+def number(value: float) -> str:
+  return f"{value:.3f}".rstrip("0").rstrip(".")
+
+def check(budgets: Budgets, samples: dict[str, list[float]], history: dict[str, list[float]]) -> list[Check]:
+  """Compares the median of every metric with its limit and with the recent runs in `history`."""
+  tolerance = budgets.tolerance
+  checks = []
+  for metric, limit in budgets.limits().items():
+    if not samples.get(metric):
+      checks.append(Check(metric, limit, None))
+      continue
+
+    result = Check(metric, limit, statistics.median(samples[metric]))
+    previous = history.get(metric, [])[-tolerance.runs:]
+    if len(previous) >= tolerance.min_runs:
+      result.baseline = statistics.median(previous)
+      noise = MAD_TO_SIGMA * statistics.median(abs(value - result.baseline) for value in previous)
+      # a metric that is usually zero, like layout shift, is only held to its budget
+      if result.baseline > 0:
+        result.allowed = result.baseline + max(tolerance.sigmas * noise, tolerance.relative * result.baseline)
+
+    if result.current > limit:
+      result.failure = f"over budget by {number(result.current - limit)}"
+    elif result.allowed is not None and result.current > result.allowed:
+      result.failure = f"regressed {result.current / result.baseline - 1:+.0%} from the baseline"
+    checks.append(result)
+  return checks
+
+def update_history(history: dict[str, list[float]], checks: list[Check], runs: int) -> dict[str, list[float]]:
+  """Adds the medians of passing metrics, keeping the last `runs` of each."""
+  history = dict(history)
+  for result in checks:
+    if result.current is not None and not result.failure:
+      history[result.metric] = (history.get(result.metric, []) + [result.current])[-runs:]
+  return history
+
+def format_checks(checks: list[Check]) -> list[str]:
+  """A diff of every metric against its budget and baseline, failures first."""
+  def cell(value: Optional[float]) -> str:
+    return f"{'-' if value is None else number(value):>10}"
+
+  width = max([len(result.metric) for result in checks] + [6])
+  lines = [f"  {'metric':<{width}} {'budget':>10} {'baseline':>10} {'allowed':>10} {'current':>10}  result"]
+  for result in sorted(checks, key=lambda result: (not result.failure, result.metric)):
+    status = result.failure or ("no samples" if result.current is None else "ok")
+    lines.append(f"{'-' if result.failure else ' '} {result.metric:<{width}} {cell(result.limit)} {cell(result.baseline)} {cell(result.allowed)} {cell(result.current)}  {status}")
+  return lines
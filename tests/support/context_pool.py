@@ -0,0 +1,134 @@
+"""
+Per-worker pool of warm browser contexts.
+
+Creating a context is one of the more expensive setup steps, so contexts
+handed back by a test are reset and reused instead of closed. A reset
+closes every page, clears cookies, permissions and web storage, and the
+next `acquire` restores whatever storage state the test asks for.
+
+Storage is cleared from a blank document served through a context route
+on the app origin, so resets never touch the network.
+"""
+import time
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+from urllib.parse import urljoin
+
+from playwright.sync_api import Browser, BrowserContext, Route
+
+RESET_PATH = "/__context_reset__"
+
+CLEAR_STORAGE_SCRIPT = "() => { localStorage.clear(); sessionStorage.clear(); }"
+RESTORE_STORAGE_SCRIPT = """
+(entries) => {
+  for (const { name, value } of entries) {
+    localStorage.setItem(name, value);
+  }
+}
+"""
+
+@dataclass
+class PoolStats:
+  hits: int = 0
+  misses: int = 0
+  resets: int = 0
+  reset_seconds: float = 0
+  discarded: int = 0
+
+  def merge(self, other: "PoolStats"):
+    for key, value in asdict(other).items():
+      setattr(self, key, getattr(self, key) + value)
+
+  def summary(self) -> str:
+    acquired = self.hits + self.misses
+    hit_rate = self.hits / acquired * 100 if acquired else 0
+    avg_reset = self.reset_seconds / self.resets * 1000 if self.resets else 0
+    return (
+      f"{acquired} contexts acquired: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), "
+      f"{self.resets} resets in {self.reset_seconds:.2f}s (avg {avg_reset:.1f}ms), {self.discarded} discarded"
+    )
+
+def _fulfill_blank(route: Route):
+  route.fulfill(status=200, content_type="text/html", body="<!DOCTYPE html><title>reset</title>")
+
+class ContextPool:
+  def __init__(self, browser: Browser, base_url: str, max_size: int = 2):
+    self.browser = browser
+    self.base_url = base_url
+    self.max_size = max_size
+    self.stats = PoolStats()
+    self._idle: list[BrowserContext] = []
+
+  def _new_context(self, storage_state: Optional[dict]) -> BrowserContext:
+    context = self.browser.new_context(storage_state=storage_state)
+    context.route(f"**{RESET_PATH}", _fulfill_blank)
+    return context
+
+  def _reset_page_url(self, origin: str) -> str:
+    return urljoin(origin, RESET_PATH)
+
+  def acquire(self, storage_state: Optional[dict] = None) -> BrowserContext:
+    """Hands out an idle context seeded with `storage_state`, or creates one."""
+    if not self._idle:
+      self.stats.misses += 1
+      return self._new_context(storage_state)
+
+    self.stats.hits += 1
+    context = self._idle.pop()
+    if storage_state is None:
+      return context
+
+    if storage_state.get("cookies"):
+      context.add_cookies(storage_state["cookies"])
+
+    origins = storage_state.get("origins", [])
+    if origins:
+      with context.new_page() as page:
+        for origin in origins:
+          page.goto(self._reset_page_url(origin["origin"]))
+          page.evaluate(RESTORE_STORAGE_SCRIPT, origin.get("localStorage", []))
+    return context
+
+  def release(self, context: BrowserContext):
+    """Resets a context and keeps it for the next test, or closes it if the pool is full."""
+    if len(self._idle) >= self.max_size:
+      context.close()
+      return
+
+    started = time.perf_counter()
+    try:
+      self._reset(context)
+    except Exception:
+      # a context we cannot reset cannot be trusted to be isolated
+      self.stats.discarded += 1
+      context.close()
+      return
+    finally:
+      self.stats.resets += 1
+      self.stats.reset_seconds += time.perf_counter() - started
+
+    self._idle.append(context)
+
+  def _reset(self, context: BrowserContext):
+    for page in context.pages:
+      page.close()
+
+    context.clear_cookies()
+    context.clear_permissions()
+    context.set_offline(False)
+    context.set_extra_http_headers({})
+
+    # drop routes the test registered, then restore our own
+    context.unroute_all(behavior="ignoreErrors")
+    context.route(f"**{RESET_PATH}", _fulfill_blank)
+
+    # sessionStorage dies with the pages, localStorage needs a document on the origin
+    with context.new_page() as page:
+      page.goto(self._reset_page_url(self.base_url))
+      page.evaluate(CLEAR_STORAGE_SCRIPT)
+
+  def close(self):
+    for context in self._idle:
+      context.close()
+    self._idle.clear()
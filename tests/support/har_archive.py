@@ -0,0 +1,179 @@
+"""
+Recorded page loads served from disk instead of the network.
+
+Every page path has its own HAR file under `hars/v<HAR_VERSION>/<host>/`.
+In record mode the first test that opens a path in this run records it in
+a fresh context, so a scheduled `--har record` run refreshes the archive.
+Replay serves the responses from memory through context routing, matching
+requests to the app by path and query so the random port of the local
+stand-in does not matter. The replay is installed on a context before its
+resource policy, so the policy sees every request first and only passes
+the ones it allows on to the recording. Strict replay fails the test when
+the page requested anything that was not recorded.
+"""
+import base64
+import json
+import os
+import time
+import weakref
+
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+from filelock import FileLock
+from playwright.sync_api import Browser, BrowserContext, Error, Page, Route
+
+from tests.support.context_pool import RESET_PATH
+
+MODES = ("off", "record", "replay", "strict")
+
+# bump when the layout of the archive changes, old recordings are then ignored
+HAR_VERSION = 1
+
+# the body is served decoded, so headers describing the transfer no longer apply
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+class HarArchive:
+  def __init__(self, directory: str, base_url: str, mode: str, browser: Browser, run_started: float = None):
+    if mode not in MODES:
+      raise ValueError(f"Unknown HAR mode {mode!r}, expected one of {MODES}")
+
+    self.base_url = base_url
+    self.host = urlsplit(base_url).hostname
+    self.directory = Path(directory) / f"v{HAR_VERSION}" / self.host
+    self.mode = mode
+    self.browser = browser
+    self.run_started = time.time() if run_started is None else run_started
+    self._entries = {}
+    self._pages = {}
+    self._unrecorded = {}
+    self._routed = weakref.WeakSet()
+
+  def path(self, page_path: str) -> Path:
+    name = page_path.strip("/").removesuffix(".html") or "index"
+    return self.directory / f"{name}.har"
+
+  def _key(self, url: str) -> str:
+    parts = urlsplit(url)
+    if parts.hostname != self.host:
+      return url
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+  def record(self, page_path: str, storage_state: dict):
+    """Loads `page_path` in a fresh context and saves everything it fetched."""
+    path = self.path(page_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # one xdist worker records, the others wait and reuse the file
+    with FileLock(f"{path}.lock"):
+      if path.exists() and os.path.getmtime(path) >= self.run_started:
+        return
+
+      tmp_path = path.with_suffix(f".{os.getpid()}.tmp.har")
+      context = self.browser.new_context(storage_state=storage_state, record_har_path=tmp_path, record_har_content="embed")
+      try:
+        page = context.new_page()
+        page.goto(urljoin(self.base_url, page_path))
+        page.wait_for_load_state("networkidle")
+      finally:
+        # the HAR is written when the context closes
+        context.close()
+      os.replace(tmp_path, path)
+
+  def _load(self, page_path: str) -> Optional[dict]:
+    if page_path not in self._entries:
+      path = self.path(page_path)
+      if not path.exists():
+        return None
+
+      entries = {}
+      with open(path) as f:
+        for entry in json.load(f)["log"]["entries"]:
+          request, response = entry["request"], entry["response"]
+          # redirects and aborted requests have nothing to serve
+          if response["status"] <= 0 or 300 <= response["status"] < 400:
+            continue
+          entries.setdefault((request["method"], self._key(request["url"])), response)
+      self._entries[page_path] = entries
+    return self._entries[page_path]
+
+  def install(self, context: BrowserContext):
+    """Routes the pages of `context` through their recordings, call before installing a resource policy."""
+    if self.mode == "off":
+      return
+    # context routes run last registered first, the policy's fallback() then reaches this one
+    context.route("**/*", self._handle)
+    self._routed.add(context)
+
+  def uninstall(self, context: BrowserContext):
+    if context in self._routed:
+      context.unroute("**/*", self._handle)
+      self._routed.discard(context)
+
+  def open(self, page: Page, page_path: str):
+    """Serves `page` from the recording of `page_path`, call before navigating."""
+    if self.mode == "off":
+      return
+    if self.mode == "record":
+      self.record(page_path, page.context.storage_state())
+
+    entries = self._load(page_path)
+    if entries is None:
+      if self.mode == "strict":
+        raise AssertionError(f"No HAR recording of {page_path} at {self.path(page_path)}, run with --har record")
+      return
+
+    if page.context not in self._routed:
+      raise RuntimeError(f"HAR replay is not installed on the context of {page_path}, call install(context) first")
+
+    # a page that moves on to another path is served from both recordings
+    if page in self._pages:
+      self._pages[page].update(entries)
+      return
+    self._pages[page] = dict(entries)
+    self._unrecorded[page] = []
+
+  def _handle(self, route: Route):
+    request = route.request
+    try:
+      page = request.frame.page
+    except Error:
+      # service worker requests belong to no page
+      page = None
+
+    if page not in self._pages or urlsplit(request.url).path == RESET_PATH:
+      # pages that opened no recording, and the reset page of the context pool, also when a retry restores a page
+      route.fallback()
+      return
+
+    response = self._pages[page].get((request.method, self._key(request.url)))
+    if response is not None:
+      route.fulfill(status=response["status"], headers=self._headers(response), body=self._body(response))
+    elif self.mode == "strict":
+      self._unrecorded[page].append(f"{request.method} {request.url}")
+      route.abort()
+    else:
+      route.fallback()
+
+  def check(self, page: Page):
+    """Fails in strict mode when `page` requested something that was not recorded."""
+    self._pages.pop(page, None)
+    unrecorded = self._unrecorded.pop(page, [])
+    if unrecorded:
+      raise AssertionError(f"{len(unrecorded)} requests missing from the HAR recording:\n" + "\n".join(unrecorded))
+
+  @staticmethod
+  def _headers(response: dict) -> dict:
+    return {
+      header["name"]: header["value"]
+      for header in response["headers"]
+      if header["name"].lower() not in DROPPED_HEADERS
+    }
+
+  @staticmethod
+  def _body(response: dict) -> bytes:
+    content = response["content"]
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+      return base64.b64decode(text)
+    return text.encode()
@@ -0,0 +1,78 @@
+"""
+Concurrent image availability checks.
+
+Every URL is probed once with a HEAD request, falling back to a one-byte
+ranged GET when the server does not allow HEAD. Probes run on a bounded
+thread pool so the total time stays close to the slowest single image
+instead of growing with the catalog size.
+"""
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+
+# status codes that mean the server refuses HEAD rather than the image is missing
+HEAD_NOT_ALLOWED = (405, 501)
+
+@dataclass
+class ImageStatus:
+  url: Optional[str]
+  method: Optional[str]
+  status: Optional[int] = None
+  content_type: Optional[str] = None
+  elapsed_ms: float = 0
+  error: Optional[str] = None
+
+  @property
+  def ok(self) -> bool:
+    return self.status in (200, 206)
+
+def _probe(session: requests.Session, url: str, timeout: float) -> ImageStatus:
+  started = time.perf_counter()
+  method = "HEAD"
+  try:
+    response = session.head(url, timeout=timeout, allow_redirects=True)
+    if response.status_code in HEAD_NOT_ALLOWED:
+      method = "GET bytes=0-0"
+      response = session.get(url, timeout=timeout, headers={"Range": "bytes=0-0"}, stream=True)
+      response.close()
+  except requests.RequestException as e:
+    return ImageStatus(url, method, elapsed_ms=(time.perf_counter() - started) * 1000, error=str(e))
+
+  return ImageStatus(
+    url,
+    method,
+    status=response.status_code,
+    content_type=response.headers.get("content-type"),
+    elapsed_ms=(time.perf_counter() - started) * 1000,
+  )
+
+def check_images(urls: list[Optional[str]], cookies: Optional[list[dict]] = None, max_workers: int = 8, timeout: float = 10) -> list[ImageStatus]:
+  """
+    Probes every distinct URL concurrently and returns one status per input URL
+    in the order they were given. A missing or empty URL is reported as failed
+    without a probe. `cookies` takes Playwright's cookie format so a page's
+    session can be reused.
+  """
+  unique_urls = list(dict.fromkeys(url for url in urls if url))
+  statuses = dict(zip(unique_urls, _probe_all(unique_urls, cookies, max_workers, timeout)))
+  return [statuses[url] if url else ImageStatus(url, None, error="missing image src") for url in urls]
+
+def _probe_all(urls: list[str], cookies: Optional[list[dict]], max_workers: int, timeout: float) -> list[ImageStatus]:
+  if not urls:
+    return []
+
+  with requests.Session() as session:
+    for cookie in cookies or []:
+      session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+
+    # the default pool keeps 10 connections per host, match it to our parallelism
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+      return list(executor.map(lambda url: _probe(session, url, timeout), urls))
@@ -0,0 +1,104 @@
+"""
+Keys that change whenever anything a test depends on changes.
+
+A test's key hashes the source of its module and every `tests.*` module it
+imports (page objects, support code), the fixtures it uses together with
+the `tests.*` code they refer to, and a fingerprint of the app under test.
+A test that passed with the same key has nothing new to check.
+"""
+import ast
+import functools
+import hashlib
+import importlib.util
+import inspect
+import re
+import types
+
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin
+
+import requests
+
+PACKAGE = "tests"
+
+# same-origin scripts and stylesheets make up the app, their content is part of the fingerprint
+ASSET_PATTERN = re.compile(r'<(?:script[^>]*\ssrc|link[^>]*\shref)="([^"]+\.(?:js|css))"')
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path: str) -> str:
+  return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def module_file(module_name: str) -> Optional[str]:
+  spec = importlib.util.find_spec(module_name)
+  return spec.origin if spec is not None and spec.origin and spec.origin.endswith(".py") else None
+
+@functools.lru_cache(maxsize=None)
+def module_files(module_name: str) -> frozenset:
+  """The file of `module_name` and of every `tests.*` module it imports, transitively."""
+  path = module_file(module_name)
+  if path is None:
+    return frozenset()
+
+  files = {path}
+  for node in ast.walk(ast.parse(Path(path).read_text())):
+    if isinstance(node, ast.Import):
+      names = [alias.name for alias in node.names]
+    elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+      names = [node.module]
+    else:
+      continue
+
+    for name in names:
+      if name == PACKAGE or name.startswith(PACKAGE + "."):
+        files |= module_files(name)
+  return frozenset(files)
+
+def function_files(func) -> frozenset:
+  """`tests.*` modules a fixture function refers to by name, with their own imports."""
+  files = set()
+  for name in func.__code__.co_names:
+    value = func.__globals__.get(name)
+    if isinstance(value, types.ModuleType):
+      module_name = value.__name__
+    else:
+      module_name = getattr(value, "__module__", None)
+    if module_name and module_name.startswith(PACKAGE + "."):
+      files |= module_files(module_name)
+  return frozenset(files)
+
+def dependency_key(item, app_fingerprint: str) -> str:
+  digest = hashlib.sha256(app_fingerprint.encode())
+  files = set(module_files(item.module.__name__))
+
+  for name, definitions in sorted(item._fixtureinfo.name2fixturedefs.items()):
+    for definition in definitions:
+      func = definition.func
+      if not getattr(func, "__module__", "").startswith(PACKAGE):
+        # fixtures of installed plugins change with requirements.txt, not with this repo
+        continue
+      digest.update(f"{name}:{inspect.getsource(func)}".encode())
+      files |= function_files(func)
+
+  for path in sorted(files):
+    digest.update(f"{Path(path).name}:{file_digest(path)}".encode())
+  return digest.hexdigest()
+
+def app_fingerprint(base_url: str, timeout: float = 10) -> Optional[str]:
+  """Hashes the entry page of the app and its scripts and stylesheets, None when the app cannot be reached."""
+  try:
+    with requests.Session() as session:
+      index = session.get(base_url, timeout=timeout)
+      index.raise_for_status()
+      digest = hashlib.sha256(index.content)
+      for asset in sorted(set(ASSET_PATTERN.findall(index.text))):
+        url = urljoin(index.url, asset)
+        if not url.startswith(urljoin(index.url, "/")):
+          continue
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        digest.update(response.content)
+  except requests.RequestException:
+    return None
+  return digest.hexdigest()
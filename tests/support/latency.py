@@ -0,0 +1,101 @@
+"""
+Wall time and call counts of page-object steps and the Playwright calls they make.
+
+Steps are timed by the `step` decorator under their qualified name
+(`LoginPage.perform_login`), Playwright calls by wrapping every method that
+talks to the browser (`Locator.fill`, `Page.goto`, `LocatorAssertions.to_have_url`).
+Recording is a dictionary update per call, cheap enough to stay on in every run.
+"""
+import functools
+import inspect
+import time
+
+from playwright import async_api, sync_api
+
+# classes whose awaitable methods talk to the browser, locator builders are not timed
+INSTRUMENTED_CLASSES = ("Page", "Locator", "LocatorAssertions", "PageAssertions")
+
+class LatencyRecorder:
+  """Timings of the running test as name -> [calls, total seconds, max seconds]."""
+  def __init__(self):
+    self.timings = {}
+
+  def reset(self):
+    self.timings = {}
+
+  def add(self, name: str, seconds: float):
+    entry = self.timings.get(name)
+    if entry is None:
+      self.timings[name] = [1, seconds, seconds]
+      return
+    entry[0] += 1
+    entry[1] += seconds
+    if seconds > entry[2]:
+      entry[2] = seconds
+
+  def report(self) -> dict:
+    """Timings in milliseconds, small enough to travel with a test report."""
+    return {
+      name: [calls, round(total * 1000, 3), round(longest * 1000, 3)]
+      for name, (calls, total, longest) in self.timings.items()
+    }
+
+LATENCY = LatencyRecorder()
+
+def merge(target: dict, report: dict) -> dict:
+  """Adds one `LatencyRecorder.report()` to another."""
+  for name, (calls, total_ms, max_ms) in report.items():
+    entry = target.setdefault(name, [0, 0.0, 0.0])
+    entry[0] += calls
+    entry[1] = round(entry[1] + total_ms, 3)
+    entry[2] = max(entry[2], max_ms)
+  return target
+
+def slowest(report: dict, limit: int = 10) -> list[str]:
+  """Table rows of the actions that took the most time in total."""
+  rows = sorted(report.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+  width = max((len(name) for name, _ in rows), default=0)
+  lines = [f"{'action':<{width}} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+  for name, (calls, total_ms, max_ms) in rows:
+    lines.append(f"{name:<{width}} {calls:>7} {total_ms:>10.1f} {total_ms / calls:>9.2f} {max_ms:>9.1f}")
+  return lines
+
+def _timed_sync(name: str, method):
+  @functools.wraps(method)
+  def wrapper(*args, **kwargs):
+    started = time.perf_counter()
+    try:
+      return method(*args, **kwargs)
+    finally:
+      LATENCY.add(name, time.perf_counter() - started)
+
+  wrapper.__latency_timed__ = True
+  return wrapper
+
+def _timed_async(name: str, method):
+  @functools.wraps(method)
+  async def wrapper(*args, **kwargs):
+    started = time.perf_counter()
+    try:
+      return await method(*args, **kwargs)
+    finally:
+      LATENCY.add(name, time.perf_counter() - started)
+
+  wrapper.__latency_timed__ = True
+  return wrapper
+
+def instrument_playwright():
+  """Wraps the browser calls of both Playwright APIs, safe to call more than once."""
+  for class_name in INSTRUMENTED_CLASSES:
+    async_class = getattr(async_api, class_name)
+    sync_class = getattr(sync_api, class_name)
+    for attr, method in list(vars(async_class).items()):
+      # the async API tells which calls wait on the browser, the sync API has the same names
+      if attr.startswith("_") or not inspect.iscoroutinefunction(method) or getattr(method, "__latency_timed__", False):
+        continue
+      name = f"{class_name}.{attr}"
+      setattr(async_class, attr, _timed_async(name, method))
+
+      sync_method = vars(sync_class).get(attr)
+      if sync_method is not None:
+        setattr(sync_class, attr, _timed_sync(name, sync_method))
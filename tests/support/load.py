@@ -0,0 +1,195 @@
+"""
+Load generation with the async page objects.
+
+  python -m tests.support.load --users 20 --ramp-up 30 --steady 120
+
+Every virtual user repeats the checkout journey of `tests/concurrent_test.py`
+in a fresh browser context: log in through the form, add an item to the
+cart, open the cart, fill in the checkout information and finish the
+order. Users start evenly spread over the ramp-up, then all of them keep
+shopping for the steady state. Without `--base-url` the journeys run
+against the local stand-in app.
+
+The report has throughput and p50/p95/p99 latency of every journey step,
+separately for both phases, since numbers taken while users are still
+arriving say little about capacity.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+
+from collections import defaultdict
+from urllib.parse import urljoin
+
+from playwright.async_api import async_playwright, Browser
+
+from tests.page_objects.cart_page import CartPage
+from tests.page_objects.checkout_complete import CheckoutCompletePage
+from tests.page_objects.checkout_finalize_page import CheckoutFinalizePage
+from tests.page_objects.checkout_info_page import CheckoutInfoPage
+from tests.page_objects.inventory_page import InventoryPage
+from tests.page_objects.login_page import LoginPage
+from tests.page_objects.shared.nav_bar import NavBar
+from tests.support.benchmark import percentile
+from tests.support.local_app import LocalApp, USERNAME, PASSWORD
+
+PHASES = ("ramp-up", "steady")
+STEPS = ("login", "add_to_cart", "open_cart", "checkout_info", "finish", "journey")
+
+class LoadStats:
+  """Step latencies in milliseconds, by the phase the step started in."""
+  def __init__(self, steady_at: float):
+    self.steady_at = steady_at
+    self.samples = {phase: defaultdict(list) for phase in PHASES}
+    self.errors = {phase: defaultdict(int) for phase in PHASES}
+
+  def phase(self, at: float) -> str:
+    return "ramp-up" if at < self.steady_at else "steady"
+
+  @contextlib.asynccontextmanager
+  async def timed(self, step: str):
+    started = time.monotonic()
+    phase = self.phase(started)
+    try:
+      yield
+    except Exception:
+      self.errors[phase][step] += 1
+      raise
+    self.samples[phase][step].append((time.monotonic() - started) * 1000)
+
+  def report(self, durations: dict[str, float]) -> dict:
+    report = {}
+    for phase in PHASES:
+      seconds = max(durations[phase], 1e-9)
+      report[phase] = {"seconds": round(durations[phase], 1), "steps": {}}
+      for step in STEPS:
+        samples = self.samples[phase][step]
+        errors = self.errors[phase][step]
+        if not samples and not errors:
+          continue
+        report[phase]["steps"][step] = {
+          "count": len(samples),
+          "errors": errors,
+          "per_second": round(len(samples) / seconds, 2),
+          **{
+            f"p{q}_ms": round(percentile(samples, q), 1) if samples else None
+            for q in (50, 95, 99)
+          },
+        }
+    return report
+
+async def shop(browser: Browser, base_url: str, username: str, password: str, stats: LoadStats, item_index: int):
+  """One checkout of a single item, every step timed."""
+  context = await browser.new_context()
+  try:
+    page = await context.new_page()
+    async with stats.timed("login"):
+      await page.goto(base_url)
+      await LoginPage(page).perform_login(username, password)
+
+    async with stats.timed("add_to_cart"):
+      items = await InventoryPage(page).get_inventory_items()
+      await items[item_index % len(items)].add_to_cart()
+
+    async with stats.timed("open_cart"):
+      await NavBar(page).click_shopping_cart_link()
+      await CartPage(page).checkout_button.click()
+
+    async with stats.timed("checkout_info"):
+      info_page = CheckoutInfoPage(page)
+      await info_page.set_first_name('John')
+      await info_page.set_last_name('Doe')
+      await info_page.set_zip_code('12345')
+      await info_page.continue_button_click()
+
+    async with stats.timed("finish"):
+      await CheckoutFinalizePage(page).click_finish()
+      await CheckoutCompletePage(page).verify_order_completion()
+  finally:
+    await context.close()
+
+async def virtual_user(index: int, browser: Browser, start_at: float, stop_at: float, stats: LoadStats, **journey):
+  await asyncio.sleep(max(start_at - time.monotonic(), 0))
+  iteration = 0
+  while time.monotonic() < stop_at:
+    try:
+      async with stats.timed("journey"):
+        await shop(browser, stats=stats, item_index=index + iteration, **journey)
+    except Exception:
+      # counted as an error of the failing step, the user starts over
+      pass
+    iteration += 1
+
+async def run_load(base_url: str, username: str, password: str, users: int, ramp_up: float, steady: float, browsers: int = 1, headless: bool = True) -> dict:
+  async with async_playwright() as playwright:
+    launched = [await playwright.chromium.launch(headless=headless) for _ in range(browsers)]
+    try:
+      started = time.monotonic()
+      stats = LoadStats(started + ramp_up)
+      stop_at = started + ramp_up + steady
+      await asyncio.gather(*[
+        virtual_user(
+          index,
+          launched[index % browsers],
+          start_at=started + ramp_up * index / users,
+          stop_at=stop_at,
+          stats=stats,
+          base_url=base_url,
+          username=username,
+          password=password,
+        )
+        for index in range(users)
+      ])
+      # journeys that were running at the stop time finish after it
+      finished = time.monotonic()
+    finally:
+      for browser in launched:
+        await browser.close()
+
+  return stats.report({"ramp-up": ramp_up, "steady": finished - started - ramp_up})
+
+def format_report(report: dict) -> list[str]:
+  lines = []
+  for phase, result in report.items():
+    lines.append(f"{phase} ({result['seconds']}s)")
+    lines.append(f"  {'step':<14} {'count':>6} {'errors':>6} {'per s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for step, row in result["steps"].items():
+      latencies = " ".join(f"{row[key]:>8.1f}" if row[key] is not None else f"{'-':>8}" for key in ("p50_ms", "p95_ms", "p99_ms"))
+      lines.append(f"  {step:<14} {row['count']:>6} {row['errors']:>6} {row['per_second']:>7.2f} {latencies}")
+  return lines
+
+def main():
+  parser = argparse.ArgumentParser(description="Drive concurrent shoppers through the checkout journey with the page objects.")
+  parser.add_argument("--users", type=int, default=10, help="number of virtual users")
+  parser.add_argument("--ramp-up", type=float, default=10, help="seconds over which users start")
+  parser.add_argument("--steady", type=float, default=60, help="seconds all users keep shopping after the ramp-up")
+  parser.add_argument("--browsers", type=int, default=1, help="browser processes the users are spread over")
+  parser.add_argument("--base-url", help="storefront to load, the local stand-in app when omitted")
+  parser.add_argument("--username", default=USERNAME)
+  parser.add_argument("--password", default=PASSWORD)
+  parser.add_argument("--headed", action="store_true", help="show the browsers")
+  parser.add_argument("--json", help="also write the report to this file")
+  args = parser.parse_args()
+
+  with contextlib.ExitStack() as stack:
+    base_url = args.base_url or stack.enter_context(LocalApp()).url
+    report = asyncio.run(run_load(
+      urljoin(base_url, LoginPage.PATH),
+      args.username,
+      args.password,
+      users=args.users,
+      ramp_up=args.ramp_up,
+      steady=args.steady,
+      browsers=args.browsers,
+      headless=not args.headed,
+    ))
+
+  print("\n".join(format_report(report)))
+  if args.json:
+    with open(args.json, "w") as f:
+      json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+  main()
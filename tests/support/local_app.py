@@ -0,0 +1,191 @@
+"""
+Local stand-in for saucedemo.com.
+
+Serves the login, inventory, cart and checkout pages with the same
+`data-test` DOM the page objects expect, so the suite runs without any
+network access. Enable it with `--local-app` or `BASE_URL=local`.
+"""
+import json
+import struct
+import threading
+import zlib
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+LOCAL_BASE_URL = "local"
+STATIC_DIR = Path(__file__).parent / "static"
+
+USERS = ["standard_user", "locked_out_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"]
+LOCKED_OUT_USERS = ["locked_out_user"]
+USERNAME = "standard_user"
+PASSWORD = "secret_sauce"
+
+# every client-side route serves the same application shell
+ROUTES = ("/", "/inventory.html", "/cart.html", "/checkout-step-one.html", "/checkout-step-two.html", "/checkout-complete.html")
+
+PRODUCTS = [
+  {
+    "id": 4,
+    "name": "Sauce Labs Backpack",
+    "description": "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.",
+    "price": 29.99,
+    "image": "/static/media/sauce-backpack.png",
+    "color": (40, 40, 48),
+  },
+  {
+    "id": 0,
+    "name": "Sauce Labs Bike Light",
+    "description": "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included.",
+    "price": 9.99,
+    "image": "/static/media/bike-light.png",
+    "color": (200, 30, 30),
+  },
+  {
+    "id": 1,
+    "name": "Sauce Labs Bolt T-Shirt",
+    "description": "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.",
+    "price": 15.99,
+    "image": "/static/media/bolt-shirt.png",
+    "color": (128, 128, 128),
+  },
+  {
+    "id": 5,
+    "name": "Sauce Labs Fleece Jacket",
+    "description": "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office.",
+    "price": 49.99,
+    "image": "/static/media/sauce-pullover.png",
+    "color": (20, 60, 120),
+  },
+  {
+    "id": 2,
+    "name": "Sauce Labs Onesie",
+    "description": "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel.",
+    "price": 7.99,
+    "image": "/static/media/red-onesie.png",
+    "color": (220, 60, 60),
+  },
+  {
+    "id": 3,
+    "name": "Test.allTheThings() T-Shirt (Red)",
+    "description": "This classic Sauce Labs t-shirt is perfect to wear when cooking up a batch of freshly baked tests. Super-soft and comfy ringspun combed cotton.",
+    "price": 15.99,
+    "image": "/static/media/red-tatt.png",
+    "color": (180, 20, 40),
+  },
+]
+
+CONTENT_TYPES = {
+  ".html": "text/html; charset=utf-8",
+  ".js": "application/javascript; charset=utf-8",
+  ".css": "text/css; charset=utf-8",
+  ".png": "image/png",
+}
+
+@dataclass(frozen=True)
+class Asset:
+  content_type: str
+  body: bytes
+  cache_control: str = "public, max-age=3600"
+
+def _png(color: tuple, width: int = 24, height: int = 30) -> bytes:
+  """Builds a solid-colour PNG so product images need no binary fixtures."""
+  def chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+  row = b"\x00" + bytes(color) * width
+  return b"".join([
+    b"\x89PNG\r\n\x1a\n",
+    chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+    chunk(b"IDAT", zlib.compress(row * height)),
+    chunk(b"IEND", b""),
+  ])
+
+def build_assets() -> dict[str, Asset]:
+  """Loads every static file into memory so requests never touch the disk."""
+  assets = {}
+  for file in STATIC_DIR.rglob("*"):
+    if file.is_file():
+      url_path = "/static/" + file.relative_to(STATIC_DIR).as_posix()
+      assets[url_path] = Asset(CONTENT_TYPES.get(file.suffix, "application/octet-stream"), file.read_bytes())
+
+  catalog = {
+    "users": USERS,
+    "lockedOutUsers": LOCKED_OUT_USERS,
+    "password": PASSWORD,
+    "products": [{key: value for key, value in product.items() if key != "color"} for product in PRODUCTS],
+  }
+  assets["/static/js/catalog.js"] = Asset(CONTENT_TYPES[".js"], f"window.SWAG_CATALOG = {json.dumps(catalog)};\n".encode())
+
+  for product in PRODUCTS:
+    assets[product["image"]] = Asset(CONTENT_TYPES[".png"], _png(product["color"]))
+
+  shell = assets.pop("/static/index.html")
+  for route in ROUTES:
+    assets[route] = Asset(shell.content_type, shell.body, "no-cache")
+
+  return assets
+
+class LocalAppHandler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+  server_version = "SwagLabsLocal/1.0"
+
+  def do_GET(self):
+    self._respond(send_body=True)
+
+  def do_HEAD(self):
+    self._respond(send_body=False)
+
+  def _respond(self, send_body: bool):
+    asset = self.server.assets.get(urlsplit(self.path).path)
+    if asset is None:
+      asset = Asset("text/plain; charset=utf-8", b"Not Found", "no-store")
+      self.send_response(404)
+    else:
+      self.send_response(200)
+
+    self.send_header("Content-Type", asset.content_type)
+    self.send_header("Content-Length", str(len(asset.body)))
+    self.send_header("Cache-Control", asset.cache_control)
+    self.end_headers()
+    if send_body:
+      self.wfile.write(asset.body)
+
+  def log_message(self, format, *args):
+    # keep the pytest output clean, every request would otherwise be logged
+    pass
+
+class LocalApp:
+  def __init__(self, host: str = "127.0.0.1", port: int = 0):
+    self.host = host
+    self.port = port
+    self._server = None
+    self._thread = None
+
+  @property
+  def url(self) -> str:
+    return f"http://{self.host}:{self._server.server_address[1]}"
+
+  def start(self):
+    self._server = ThreadingHTTPServer((self.host, self.port), LocalAppHandler)
+    self._server.daemon_threads = True
+    self._server.assets = build_assets()
+    self._thread = threading.Thread(target=self._server.serve_forever, name="local-app", daemon=True)
+    self._thread.start()
+    return self
+
+  def stop(self):
+    if self._server is None:
+      return
+    self._server.shutdown()
+    self._server.server_close()
+    self._thread.join()
+    self._server = None
+
+  def __enter__(self):
+    return self.start()
+
+  def __exit__(self, *exc):
+    self.stop()
@@ -0,0 +1,103 @@
+"""
+Batched, deduplicated allure results, and the compressed archive of earlier
+runs next to `--alluredir`, see `tests/support/allure_results.py`.
+"""
+import os
+
+from dataclasses import asdict
+
+import allure_commons
+import pytest
+
+from allure_commons.logger import AllureFileLogger
+
+from tests.support.allure_results import BatchedResultsLogger, ResultsStats, Retention, archive_previous_run, merge_batches
+from tests.support.plugins.core import is_controller, is_test_session
+
+results_logger_key = pytest.StashKey[BatchedResultsLogger]()
+results_stats_key = pytest.StashKey[ResultsStats]()
+retention_key = pytest.StashKey[Retention]()
+merged_results_key = pytest.StashKey[int]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--allure-keep-runs",
+    type=int,
+    default=5,
+    help="number of earlier runs whose allure results are kept, compressed, in <alluredir>.archive",
+  )
+  parser.addoption(
+    "--allure-keep-mb",
+    type=float,
+    default=500,
+    help="maximum size of the archived allure results, the oldest runs are dropped first",
+  )
+
+def pytest_sessionstart(session):
+  config = session.config
+  # --clean-alluredir throws the previous run away instead
+  report_dir = getattr(config.option, "allure_report_dir", None)
+  if is_test_session(config) and report_dir and not config.option.collectonly and not config.option.clean_alluredir:
+    config.stash[retention_key] = archive_previous_run(
+      report_dir,
+      keep_runs=config.getoption("allure_keep_runs"),
+      keep_bytes=int(config.getoption("allure_keep_mb") * 1024 * 1024),
+    )
+  install_results_logger(config)
+
+def install_results_logger(config):
+  """Replaces allure's file logger, which writes every result as soon as it is reported, with a batched one."""
+  report_dir = getattr(config.option, "allure_report_dir", None)
+  if not report_dir or config.option.collectonly:
+    return
+
+  file_loggers = [plugin for plugin in allure_commons.plugin_manager.get_plugins() if isinstance(plugin, AllureFileLogger)]
+  for plugin in file_loggers:
+    allure_commons.plugin_manager.unregister(plugin)
+  logger = BatchedResultsLogger(report_dir, os.environ.get("PYTEST_XDIST_WORKER", "main"))
+  allure_commons.plugin_manager.register(logger)
+  config.stash[results_logger_key] = logger
+
+  def restore():
+    allure_commons.plugin_manager.unregister(logger)
+    # allure unregisters its own logger when it cleans up, after this
+    for plugin in file_loggers:
+      allure_commons.plugin_manager.register(plugin)
+  config.add_cleanup(restore)
+
+# after the session fixtures are torn down, which report their own results
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  logger = session.config.stash.get(results_logger_key, None)
+  if logger is None:
+    return
+
+  logger.close()
+  session.config.stash.setdefault(results_stats_key, ResultsStats()).merge(logger.stats)
+  if is_controller(session.config):
+    # xdist workers have all finished and closed their loggers by now
+    session.config.stash[merged_results_key] = merge_batches(session.config.option.allure_report_dir)
+  workeroutput = getattr(session.config, "workeroutput", None)
+  if workeroutput is not None:
+    workeroutput["allure_results_stats"] = asdict(logger.stats)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+  results = getattr(node, "workeroutput", {}).get("allure_results_stats")
+  if results is not None:
+    node.config.stash.setdefault(results_stats_key, ResultsStats()).merge(ResultsStats(**results))
+
+def pytest_terminal_summary(terminalreporter, config):
+  results = config.stash.get(results_stats_key, None)
+  if results is not None and is_controller(config):
+    retention = config.stash.get(retention_key, Retention())
+    saved_kb = results.saved_bytes / 1024
+    terminalreporter.write_sep("-", "allure results")
+    terminalreporter.write_line(
+      f"{config.stash.get(merged_results_key, 0)} result files from {results.results} results and {results.containers} containers, "
+      f"{results.attachments} attachments ({results.duplicate_attachments} duplicates, {saved_kb:.1f} KB saved)"
+    )
+    terminalreporter.write_line(
+      f"previous run: {retention.archived} files archived, {retention.pruned} old runs pruned, "
+      f"{retention.archive_bytes / 1024 / 1024:.1f} MB of archives kept"
+    )
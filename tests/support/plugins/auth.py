@@ -0,0 +1,65 @@
+"""
+The login state behind `context_with_auth`, shared by all xdist workers.
+
+`--login-mode cookie` seeds the session cookie directly. `--login-mode ui`
+logs in through the form once and caches the storage state, see
+`tests/support/auth_state.py`.
+"""
+import os
+
+import pytest
+
+from playwright.sync_api import Browser
+
+from tests.page_objects.login_page import LoginPage
+from tests.support.auth_state import AuthStateCache
+from tests.support.plugins.core import is_controller
+
+AUTH_STATE_PATH = ".auth/storagestate.json"
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--auth-ttl",
+    type=float,
+    default=0,
+    help="reuse the cached login state across runs for this many seconds (0 discards it at session end)",
+  )
+  parser.addoption(
+    "--login-mode",
+    choices=("cookie", "ui"),
+    default="cookie",
+    help="how context_with_auth logs in: seed the session cookie directly, or fill in the login form once",
+  )
+
+def pytest_configure(config):
+  # without a TTL every run starts from a fresh login
+  if is_controller(config) and config.getoption("auth_ttl") <= 0 and os.path.exists(AUTH_STATE_PATH):
+    os.remove(AUTH_STATE_PATH)
+
+def pytest_unconfigure(config):
+  # only the controller cleans up, workers finish at different times
+  if is_controller(config) and config.getoption("auth_ttl") <= 0 and os.path.exists(AUTH_STATE_PATH):
+    os.remove(AUTH_STATE_PATH)
+
+@pytest.fixture(scope='session')
+def auth_state(pytestconfig, env):
+  return AuthStateCache(AUTH_STATE_PATH, env["base_url"], env["username"], ttl=pytestconfig.getoption("auth_ttl"))
+
+def login_storage_state(browser: Browser, env) -> dict:
+  """Logs in through the UI in a throwaway context and returns its storage state."""
+  with browser.new_context() as context:
+    with context.new_page() as page:
+      page.goto(env["base_url"])
+      login = LoginPage(page)
+      login.perform_login(env["username"], env["password"])
+      assert login.has_logged_in()
+
+    return context.storage_state()
+
+def auth_storage_state(browser: Browser, env, auth_state: AuthStateCache, pytestconfig) -> dict:
+  if pytestconfig.getoption("login_mode") == "cookie":
+    # the session is just a client-side cookie, seed it before the first navigation
+    return LoginPage.session_state(env["base_url"], env["username"])
+
+  # only one xdist worker logs in, the rest reuse the cached session
+  return auth_state.get_or_create(lambda: login_storage_state(browser, env))
@@ -0,0 +1,67 @@
+"""
+`--budgets`: fails the run when the page loads, journeys or action
+latencies of the `--web-vitals` profile exceed their limits or regress, see
+`tests/support/budgets.py`.
+"""
+import pytest
+
+from tests.support.budgets import BASELINE_KEY, Budgets, Check, check as check_budgets, collect as collect_budget_samples, format_checks, update_history as update_budget_history
+from tests.support.plugins.core import has_cache, is_controller, teardown_properties
+
+budget_checks_key = pytest.StashKey[list[Check]]()
+budget_history_key = pytest.StashKey[bool]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--budgets",
+    help="fail the run when page loads, journeys or action latencies of the --web-vitals profile exceed the limits "
+         "in this file or regress from the recent runs",
+  )
+
+def web_vitals_profile(config) -> str:
+  # "off" as well when the web vitals plugin is disabled
+  return config.getoption("web_vitals", "off")
+
+def pytest_configure(config):
+  if is_controller(config) and config.getoption("budgets") and web_vitals_profile(config) == "off":
+    raise pytest.UsageError("--budgets needs --web-vitals <profile>, budgets are set per throttling profile")
+  # the limits still hold without the cache, only regressions from the recent runs go unnoticed
+  if is_controller(config) and config.getoption("budgets"):
+    config.stash[budget_history_key] = has_cache(config, "The regression check of --budgets")
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  if is_controller(session.config):
+    enforce_budgets(session)
+
+def enforce_budgets(session):
+  """Checks the run against the budget file and fails it on any exceeded or regressed metric."""
+  config = session.config
+  terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+  if not config.getoption("budgets") or terminalreporter is None:
+    return
+
+  budgets = Budgets.load(config.getoption("budgets"), web_vitals_profile(config))
+  samples = collect_budget_samples(
+    budgets,
+    teardown_properties(terminalreporter, "web_vitals"),
+    teardown_properties(terminalreporter, "latency"),
+  )
+  # every profile has a baseline of its own
+  key = f"{BASELINE_KEY}/{budgets.profile}"
+  history = config.cache.get(key, {}) if config.stash[budget_history_key] else {}
+  checks = check_budgets(budgets, samples, history)
+  if config.stash[budget_history_key]:
+    config.cache.set(key, update_budget_history(history, checks, budgets.tolerance.runs))
+  config.stash[budget_checks_key] = checks
+
+  if any(result.failure for result in checks) and session.exitstatus == pytest.ExitCode.OK:
+    session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+def pytest_terminal_summary(terminalreporter, config):
+  checks = config.stash.get(budget_checks_key, None)
+  if checks:
+    failed = sum(1 for result in checks if result.failure)
+    terminalreporter.write_sep("-", f"performance budgets ({web_vitals_profile(config)}), {failed} failed", red=bool(failed))
+    for line in format_checks(checks):
+      terminalreporter.write_line(line)
@@ -0,0 +1,50 @@
+"""
+`--context-pool-size`: per-worker pool of warm browser contexts, see
+`tests/support/context_pool.py`. Hit rate and reset time are printed at
+the end of the run.
+"""
+from dataclasses import asdict
+
+import pytest
+
+from playwright.sync_api import Browser
+
+from tests.support.context_pool import ContextPool, PoolStats
+from tests.support.plugins.core import is_controller
+
+context_pool_stats_key = pytest.StashKey[PoolStats]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--context-pool-size",
+    type=int,
+    default=2,
+    help="number of idle browser contexts each worker keeps for reuse (0 creates a fresh context per test)",
+  )
+
+@pytest.fixture(scope='session')
+def context_pool(browser: Browser, env, pytestconfig):
+  pool = ContextPool(browser, env["base_url"], max_size=pytestconfig.getoption("context_pool_size"))
+  yield pool
+  pool.close()
+  pytestconfig.stash.setdefault(context_pool_stats_key, PoolStats()).merge(pool.stats)
+
+# after the session fixtures are torn down, the pool reports its stats then
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  workeroutput = getattr(session.config, "workeroutput", None)
+  stats = session.config.stash.get(context_pool_stats_key, None)
+  if workeroutput is not None and stats is not None:
+    workeroutput["context_pool_stats"] = asdict(stats)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+  stats = getattr(node, "workeroutput", {}).get("context_pool_stats")
+  if stats is not None:
+    node.config.stash.setdefault(context_pool_stats_key, PoolStats()).merge(PoolStats(**stats))
+
+def pytest_terminal_summary(terminalreporter, config):
+  stats = config.stash.get(context_pool_stats_key, None)
+  if stats is not None and is_controller(config):
+    terminalreporter.write_sep("-", "browser context pool")
+    terminalreporter.write_line(stats.summary())
@@ -0,0 +1,75 @@
+"""
+Helpers every other plugin builds on, always loaded.
+
+Plugins record their per-test data with `record_suite_property`. It travels
+on the teardown report as `suite_properties`, also from xdist workers, and
+is read back at the end of the run with `teardown_properties`. Unlike
+`user_properties` it never ends up in `--junitxml`.
+"""
+from typing import Optional
+
+import pytest
+
+from tests.support.shared_pages import call_report_key
+
+suite_properties_key = pytest.StashKey[dict]()
+setup_report_key = pytest.StashKey[pytest.TestReport]()
+
+def is_controller(config) -> bool:
+  return not hasattr(config, "workerinput")
+
+def is_test_session(config) -> bool:
+  """True on the controller of a session that collects or runs tests, not one that only lists fixtures."""
+  return is_controller(config) and not (config.option.showfixtures or config.option.show_fixtures_per_test)
+
+def has_cache(config, feature: str) -> bool:
+  """False, with a warning, when `-p no:cacheprovider` leaves `feature` without the results of earlier runs."""
+  if hasattr(config, "cache"):
+    return True
+  config.issue_config_time_warning(pytest.PytestConfigWarning(f"{feature} needs the pytest cache, turned off"), stacklevel=3)
+  return False
+
+def is_failure(report: Optional[pytest.TestReport]) -> bool:
+  """True for a phase that failed, or an xfailed test that failed as expected."""
+  if report is None:
+    return False
+  return report.outcome == ("skipped" if hasattr(report, "wasxfail") else "failed")
+
+def record_suite_property(node, name: str, value):
+  """Stores per-test data for the teardown report, kept out of `user_properties` so it stays out of junitxml."""
+  node.stash.setdefault(suite_properties_key, {})[name] = value
+
+def teardown_properties(terminalreporter, name: str) -> list:
+  """Collects a per-test suite property from the teardown reports, which also arrive from xdist workers."""
+  return [
+    report.suite_properties[name]
+    for reports in terminalreporter.stats.values()
+    for report in reports
+    if getattr(report, "when", None) == "teardown" and name in getattr(report, "suite_properties", {})
+  ]
+
+@pytest.hookimpl(wrapper=True)
+def pytest_report_to_serializable(config, report):
+  data = yield
+  if data is not None and hasattr(report, "suite_properties"):
+    data["suite_properties"] = report.suite_properties
+  return data
+
+@pytest.hookimpl(wrapper=True)
+def pytest_report_from_serializable(config, data):
+  report = yield
+  if report is not None and "suite_properties" in data:
+    report.suite_properties = data["suite_properties"]
+  return report
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "setup":
+    item.stash[setup_report_key] = report
+  if report.when == "call":
+    item.stash[call_report_key] = report
+  if report.when == "teardown":
+    # the same dict, so properties other plugins record for this report still show up
+    report.suite_properties = item.stash.setdefault(suite_properties_key, {})
+  return report
@@ -0,0 +1,48 @@
+"""
+Fixtures of the optional plugins in their "off" state.
+
+Listed first in `pytest_plugins`, so the feature plugins override them, and
+a feature disabled with `-p no:tests.support.plugins.<name>` falls back to
+these.
+"""
+import pytest
+
+from playwright.sync_api import Browser
+
+from tests.support.context_pool import ContextPool
+from tests.support.har_archive import HarArchive
+from tests.support.resource_policy import ResourcePolicy
+from tests.support.tracing import Tracer
+from tests.support.web_vitals import WebVitals
+
+@pytest.fixture(scope='session')
+def context_pool(browser: Browser, env):
+  pool = ContextPool(browser, env["base_url"], max_size=0)
+  yield pool
+  pool.close()
+
+@pytest.fixture(scope='session')
+def resource_sizes():
+  return {}
+
+@pytest.fixture(scope='session')
+def default_resource_policy() -> str:
+  return "all"
+
+@pytest.fixture(scope='function')
+def resource_policy(env, resource_sizes, default_resource_policy):
+  return ResourcePolicy(default_resource_policy, env["base_url"], resource_sizes)
+
+@pytest.fixture(scope='session')
+def tracer():
+  return Tracer("test-results", "off")
+
+@pytest.fixture(scope='session')
+def har_archive(browser: Browser, env) -> HarArchive:
+  return HarArchive("hars", env["base_url"], "off", browser)
+
+@pytest.fixture(scope='function')
+def web_vitals() -> WebVitals:
+  web_vitals = WebVitals(None)
+  yield web_vitals
+  web_vitals.close()
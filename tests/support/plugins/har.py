@@ -0,0 +1,38 @@
+"""
+`--har`: serves the page loads of the navigation fixtures from HAR
+recordings, see `tests/support/har_archive.py`.
+"""
+import time
+
+import pytest
+
+from playwright.sync_api import Browser
+
+from tests.support.har_archive import HarArchive, MODES as HAR_MODES
+from tests.support.plugins.core import is_controller
+
+run_started_key = pytest.StashKey[float]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--har",
+    choices=HAR_MODES,
+    default="off",
+    help="serve page loads of the navigation fixtures from HAR recordings: record them in this run, replay them, "
+         "or replay strictly, failing on requests that were not recorded",
+  )
+
+def pytest_configure(config):
+  # recordings made by any xdist worker during this run count as fresh
+  if is_controller(config):
+    config.stash[run_started_key] = time.time()
+  else:
+    config.stash[run_started_key] = config.workerinput["run_started"]
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+  node.workerinput["run_started"] = node.config.stash[run_started_key]
+
+@pytest.fixture(scope='session')
+def har_archive(browser: Browser, env, pytestconfig) -> HarArchive:
+  return HarArchive("hars", env["base_url"], pytestconfig.getoption("har"), browser, pytestconfig.stash[run_started_key])
@@ -0,0 +1,101 @@
+"""
+`--impact`: deselects tests that passed before and whose test module, page
+objects, fixtures and target app are unchanged, see `tests/support/impact.py`.
+"""
+import pytest
+
+from tests.support.impact import app_fingerprint, dependency_key
+from tests.support.plugins.core import has_cache, is_controller, is_test_session, record_suite_property
+from tests.support.plugins.local_app import app_url
+
+OUTCOMES_KEY = "swaglab/passed_dependency_keys"
+
+app_fingerprint_key = pytest.StashKey[str]()
+dependency_key_key = pytest.StashKey[str]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--impact",
+    action="store_true",
+    help="skip tests that passed before and whose test module, page objects, fixtures and target app are unchanged",
+  )
+
+def pytest_configure(config):
+  if is_controller(config) and config.getoption("impact") and not has_cache(config, "--impact"):
+    config.option.impact = False
+
+  workerinput = getattr(config, "workerinput", None)
+  if workerinput is not None and "app_fingerprint" in workerinput:
+    config.stash[app_fingerprint_key] = workerinput["app_fingerprint"]
+
+# after the local app started, its url is part of the fingerprint
+def pytest_sessionstart(session):
+  config = session.config
+  if not is_test_session(config) or not config.getoption("impact"):
+    return
+
+  # without a fingerprint nothing counts as unchanged and every test runs
+  fingerprint = app_fingerprint(app_url(config))
+  if fingerprint is not None:
+    config.stash[app_fingerprint_key] = fingerprint
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+  fingerprint = node.config.stash.get(app_fingerprint_key, None)
+  if fingerprint is not None:
+    node.workerinput["app_fingerprint"] = fingerprint
+
+def pytest_collection_modifyitems(config, items):
+  fingerprint = config.stash.get(app_fingerprint_key, None)
+  if fingerprint is None:
+    return
+
+  # every xdist worker reads the same cache and fingerprint, so they all keep the same tests
+  passed = config.cache.get(OUTCOMES_KEY, {})
+  selected, deselected = [], []
+  for item in items:
+    item.stash[dependency_key_key] = dependency_key(item, fingerprint)
+    if passed.get(item.nodeid) == item.stash[dependency_key_key]:
+      deselected.append(item)
+    else:
+      selected.append(item)
+
+  if deselected:
+    config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "teardown" and dependency_key_key in item.stash:
+    record_suite_property(item, "dependency_key", item.stash[dependency_key_key])
+  return report
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  if is_controller(session.config):
+    save_outcomes(session.config)
+
+def save_outcomes(config):
+  """Remembers the dependency key of every test that passed, forgets the ones that did not."""
+  terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+  if terminalreporter is None or config.stash.get(app_fingerprint_key, None) is None:
+    return
+
+  keys, failed = {}, set()
+  for reports in terminalreporter.stats.values():
+    for report in reports:
+      if not isinstance(report, pytest.TestReport):
+        continue
+      if not report.passed or hasattr(report, "wasxfail"):
+        failed.add(report.nodeid)
+      if "dependency_key" in getattr(report, "suite_properties", {}):
+        keys[report.nodeid] = report.suite_properties["dependency_key"]
+
+  passed = config.cache.get(OUTCOMES_KEY, {})
+  for nodeid, key in keys.items():
+    if nodeid in failed:
+      passed.pop(nodeid, None)
+    else:
+      passed[nodeid] = key
+  config.cache.set(OUTCOMES_KEY, passed)
@@ -0,0 +1,65 @@
+"""
+Per-test timings of page-object steps and Playwright calls, see
+`tests/support/latency.py`. The slowest actions are printed at the end of
+the run and all timings written to `--latency-report`.
+"""
+import functools
+import json
+import os
+
+import pytest
+
+from tests.support.latency import LATENCY, instrument_playwright, merge as merge_latency, slowest
+from tests.support.plugins.core import record_suite_property, teardown_properties
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--latency-report",
+    default="latency.json",
+    help="where to write the per-test timings of page-object steps and Playwright calls, empty to skip the file",
+  )
+
+def pytest_configure(config):
+  instrument_playwright()
+
+def pytest_runtest_setup(item):
+  LATENCY.reset()
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "teardown":
+    record_suite_property(item, "latency", {
+      "test": item.nodeid,
+      "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+      "timings": LATENCY.report(),
+    })
+  return report
+
+def pytest_terminal_summary(terminalreporter, config):
+  latency = teardown_properties(terminalreporter, "latency")
+  if latency:
+    write_latency_report(config, latency)
+    total = {}
+    for item in latency:
+      merge_latency(total, item["timings"])
+    terminalreporter.write_sep("-", "slowest actions")
+    for line in slowest(total):
+      terminalreporter.write_line(line)
+
+def write_latency_report(config, latency: list):
+  path = config.getoption("latency_report")
+  if not path:
+    return
+
+  workers = {}
+  for item in latency:
+    merge_latency(workers.setdefault(item["worker"], {}), item["timings"])
+  summary = {
+    "columns": ["calls", "total_ms", "max_ms"],
+    "total": functools.reduce(merge_latency, workers.values(), {}),
+    "workers": workers,
+    "tests": {item["test"]: item["timings"] for item in latency},
+  }
+  with open(path, "w") as f:
+    json.dump(summary, f, indent=2)
@@ -0,0 +1,53 @@
+"""
+`--local-app`: runs the suite against the built-in saucedemo stand-in.
+
+The controller starts the app once per test session and xdist workers get
+its url through `workerinput`. The `env` fixture switches to it when
+`local_app_url_key` is set.
+"""
+import os
+
+import pytest
+
+from dotenv import load_dotenv
+
+from tests.support.local_app import LocalApp, LOCAL_BASE_URL
+from tests.support.plugins.core import is_test_session
+
+local_app_url_key = pytest.StashKey[str]()
+
+def app_url(config) -> str:
+  return config.stash.get(local_app_url_key, None) or os.getenv("BASE_URL")
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--local-app",
+    action="store_true",
+    default=False,
+    help="run the suite against the built-in saucedemo stand-in instead of BASE_URL",
+  )
+
+def pytest_configure(config):
+  # xdist workers share the stand-in started by the controller
+  workerinput = getattr(config, "workerinput", None)
+  if workerinput is not None and "local_app_url" in workerinput:
+    config.stash[local_app_url_key] = workerinput["local_app_url"]
+
+# before xdist starts its workers, and before the plugins that need the app's url
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+  config = session.config
+  if not is_test_session(config):
+    return
+
+  load_dotenv()
+  if config.getoption("local_app") or os.getenv("BASE_URL") == LOCAL_BASE_URL:
+    app = LocalApp().start()
+    config.add_cleanup(app.stop)
+    config.stash[local_app_url_key] = app.url
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+  url = node.config.stash.get(local_app_url_key, None)
+  if url is not None:
+    node.workerinput["local_app_url"] = url
@@ -0,0 +1,45 @@
+"""
+`--resources` and the `resources` marker: which requests a test's browser
+context may make, see `tests/support/resource_policy.py`.
+"""
+from dataclasses import asdict
+
+import pytest
+
+from tests.support.resource_policy import ResourcePolicy, POLICIES
+from tests.support.plugins.core import record_suite_property, teardown_properties
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--resources",
+    choices=POLICIES,
+    default="none",
+    help="default resource policy for tests without a resources marker",
+  )
+
+@pytest.fixture(scope='session')
+def resource_sizes():
+  """Response sizes seen by this worker, used to estimate what blocked requests would have cost."""
+  return {}
+
+@pytest.fixture(scope='session')
+def default_resource_policy(pytestconfig) -> str:
+  """Policy of tests without a `resources` marker, and of shared pages."""
+  return pytestconfig.getoption("resources")
+
+@pytest.fixture(scope='function')
+def resource_policy(request, env, resource_sizes, default_resource_policy):
+  marker = request.node.get_closest_marker("resources")
+  policy = marker.args[0] if marker else default_resource_policy
+  resource_policy = ResourcePolicy(policy, env["base_url"], resource_sizes)
+  yield resource_policy
+  record_suite_property(request.node, "resources", asdict(resource_policy.stats))
+
+def pytest_terminal_summary(terminalreporter, config):
+  saved = teardown_properties(terminalreporter, "resources")
+  if saved:
+    blocked = sum(item["blocked"] + item["stubbed"] for item in saved)
+    saved_kb = sum(item["saved_bytes"] for item in saved) / 1024
+    unknown = sum(item["unknown_size"] for item in saved)
+    terminalreporter.write_sep("-", "resource policy")
+    terminalreporter.write_line(f"{blocked} requests blocked or stubbed across {len(saved)} tests, at least {saved_kb:.1f} KB saved ({unknown} of unknown size not counted)")
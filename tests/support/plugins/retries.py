@@ -0,0 +1,104 @@
+"""
+`--retries`: reruns a failed test body from the page state its fixtures
+left, without setting them up again, see `tests/support/retry.py`.
+"""
+import allure
+import pytest
+
+from tests.support.retry import FLAKINESS_KEY, restore as restore_snapshot, snapshot_pages, update_flakiness
+from tests.support.shared_pages import call_report_key
+from tests.support.plugins.core import has_cache, is_controller, record_suite_property, teardown_properties
+from tests.support.plugins.local_app import app_url
+
+retry_attempts_key = pytest.StashKey[int]()
+retrying_key = pytest.StashKey[bool]()
+flakiness_key = pytest.StashKey[bool]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--retries",
+    type=int,
+    default=0,
+    help="rerun a failed test body up to this many times from the page state its fixtures left, without setting them up again",
+  )
+
+def pytest_configure(config):
+  # retries work without the cache, only the flakiness history is lost
+  if is_controller(config) and config.getoption("retries") > 0:
+    config.stash[flakiness_key] = has_cache(config, "The flakiness history of --retries")
+
+# inside the capture, logging and allure wrappers of pytest_runtest_call, so every attempt goes through them
+@pytest.hookimpl(wrapper=True)
+def pytest_pyfunc_call(pyfuncitem):
+  item = pyfuncitem
+  retries = item.config.getoption("retries")
+  # an expected failure is not worth retrying, and the retries below come through here too
+  if retries <= 0 or item.get_closest_marker("xfail") or item.stash.get(retrying_key, False):
+    return (yield)
+
+  snapshots = snapshot_pages(item.funcargs)
+  try:
+    return (yield)
+  except (Exception, pytest.fail.Exception) as error:
+    failure = error
+
+  item.stash[retrying_key] = True
+  try:
+    for attempt in range(1, retries + 1):
+      item.stash[retry_attempts_key] = attempt
+      try:
+        with allure.step(f"Retry {attempt} of {retries} from the state after setup"):
+          for snapshot in snapshots:
+            restore_snapshot(snapshot, app_url(item.config))
+          return item.ihook.pytest_pyfunc_call(pyfuncitem=item)
+      except (Exception, pytest.fail.Exception) as error:
+        failure = error
+  finally:
+    item.stash[retrying_key] = False
+  raise failure
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "teardown" and retry_attempts_key in item.stash:
+    call_report = item.stash.get(call_report_key, None)
+    record_suite_property(item, "retries", {
+      "test": item.nodeid,
+      "attempts": item.stash[retry_attempts_key],
+      "passed": call_report is not None and call_report.passed,
+    })
+  return report
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  if is_controller(session.config):
+    save_flakiness(session.config)
+
+def save_flakiness(config):
+  """Counts, per test, the runs that needed a retry and the ones that only passed on a retry."""
+  terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+  if terminalreporter is None or not config.stash.get(flakiness_key, False):
+    return
+
+  runs = {}
+  for reports in terminalreporter.stats.values():
+    for report in reports:
+      if isinstance(report, pytest.TestReport) and report.when == "call":
+        runs[report.nodeid] = {"attempts": 0, "passed": report.passed}
+  for item in teardown_properties(terminalreporter, "retries"):
+    if item["test"] in runs:
+      runs[item["test"]]["attempts"] = item["attempts"]
+
+  if runs:
+    config.cache.set(FLAKINESS_KEY, update_flakiness(config.cache.get(FLAKINESS_KEY, {}), runs))
+
+def pytest_terminal_summary(terminalreporter, config):
+  retried = teardown_properties(terminalreporter, "retries")
+  if retried:
+    history = config.cache.get(FLAKINESS_KEY, {}) if config.stash.get(flakiness_key, False) else {}
+    terminalreporter.write_sep("-", "retries")
+    for item in retried:
+      counts = history.get(item["test"], {})
+      outcome = "passed" if item["passed"] else "still failed"
+      rate = f", flaky in {counts['flaky']} of {counts['runs']} runs" if counts.get("runs") else ""
+      terminalreporter.write_line(f"{item['test']}: {outcome} after {item['attempts']} retries{rate}")
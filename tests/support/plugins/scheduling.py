@@ -0,0 +1,61 @@
+"""
+`--schedule durations`: with `-n`, hands out the longest tests first using
+the durations of earlier runs, see `tests/support/scheduling.py`.
+"""
+import pytest
+
+from tests.support.scheduling import DurationScheduling, HISTORY_KEY, update_history
+from tests.support.plugins.core import has_cache, is_controller, record_suite_property
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--schedule",
+    choices=("durations", "xdist"),
+    default="durations",
+    help="with -n, run the longest tests first using the durations of earlier runs, or keep xdist's load scheduling",
+  )
+
+def pytest_configure(config):
+  if is_controller(config) and config.getoption("schedule") == "durations" and not has_cache(config, "--schedule durations"):
+    config.option.schedule = "xdist"
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+  if config.getoption("dist") != "load" or config.getoption("schedule") != "durations":
+    return None
+  return DurationScheduling(config, log, history=config.cache.get(HISTORY_KEY, {}))
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "teardown":
+    record_suite_property(item, "session_fixtures", sorted(
+      name for name, definitions in item._fixtureinfo.name2fixturedefs.items()
+      if definitions[-1].scope == "session"
+    ))
+  return report
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  if is_controller(session.config):
+    save_test_durations(session.config)
+
+def save_test_durations(config):
+  """Records how long every test took for the next run's scheduling, reports from xdist workers included."""
+  terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+  if terminalreporter is None or config.getoption("schedule") != "durations":
+    return
+
+  durations, setups, fixtures = {}, {}, {}
+  for reports in terminalreporter.stats.values():
+    for report in reports:
+      if not isinstance(report, pytest.TestReport):
+        continue
+      durations[report.nodeid] = durations.get(report.nodeid, 0) + report.duration
+      if report.when == "setup":
+        setups[report.nodeid] = report.duration
+      if "session_fixtures" in getattr(report, "suite_properties", {}):
+        fixtures[report.nodeid] = report.suite_properties["session_fixtures"]
+
+  if durations:
+    config.cache.set(HISTORY_KEY, update_history(config.cache.get(HISTORY_KEY, {}), durations, setups, fixtures))
@@ -0,0 +1,79 @@
+"""
+Screenshots of every page a failing test used, attached to its allure
+result, see `tests/support/screenshots.py`.
+"""
+import os
+
+from dataclasses import asdict
+
+import pytest
+
+from playwright.sync_api import Page
+
+from tests.support.screenshots import ScreenshotStats, ScreenshotWriter
+from tests.support.plugins.core import is_controller, is_failure
+
+screenshot_writer_key = pytest.StashKey[ScreenshotWriter]()
+screenshot_stats_key = pytest.StashKey[ScreenshotStats]()
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--screenshot-quality",
+    type=int,
+    default=70,
+    help="JPEG quality of failure screenshots, 0 stores lossless PNG",
+  )
+  parser.addoption(
+    "--screenshot-budget-mb",
+    type=float,
+    default=50,
+    help="maximum size of all failure screenshots in one run",
+  )
+
+def screenshot_writer(config) -> ScreenshotWriter:
+  writer = config.stash.get(screenshot_writer_key, None)
+  if writer is None:
+    quality = config.getoption("screenshot_quality")
+    # every xdist worker gets an equal share of the budget
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+    writer = ScreenshotWriter(
+      quality=quality or None,
+      max_bytes=int(config.getoption("screenshot_budget_mb") * 1024 * 1024 / workers),
+    )
+    config.stash[screenshot_writer_key] = writer
+  return writer
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "call" and is_failure(report):
+    for arg in item.funcargs:
+      if isinstance(item.funcargs[arg], Page):
+        screenshot_writer(item.config).capture(item.funcargs[arg], f"{item.name} ({arg})")
+  return report
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+  writer = session.config.stash.get(screenshot_writer_key, None)
+  if writer is None:
+    return
+
+  session.config.stash.setdefault(screenshot_stats_key, ScreenshotStats()).merge(writer.stats)
+  workeroutput = getattr(session.config, "workeroutput", None)
+  if workeroutput is not None:
+    workeroutput["screenshot_stats"] = asdict(writer.stats)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+  screenshots = getattr(node, "workeroutput", {}).get("screenshot_stats")
+  if screenshots is not None:
+    node.config.stash.setdefault(screenshot_stats_key, ScreenshotStats()).merge(ScreenshotStats(**screenshots))
+
+def pytest_terminal_summary(terminalreporter, config):
+  screenshots = config.stash.get(screenshot_stats_key, None)
+  if screenshots is not None and is_controller(config):
+    terminalreporter.write_sep("-", "failure screenshots")
+    terminalreporter.write_line(
+      f"{screenshots.captured} screenshots attached ({screenshots.duplicates} duplicates), "
+      f"{screenshots.written_bytes / 1024:.1f} KB written, {screenshots.skipped} skipped over the budget"
+    )
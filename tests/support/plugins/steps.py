@@ -0,0 +1,34 @@
+"""
+Fine-grained page-object steps, buffered per test and only attached to the
+allure report when the test fails, see `tests/page_objects/shared/steps.py`.
+"""
+from dataclasses import asdict
+
+import allure
+import pytest
+
+from tests.page_objects.shared.steps import STEP_BUFFER, STEP_LEVEL
+from tests.support.plugins.core import is_failure, record_suite_property, teardown_properties
+
+def pytest_runtest_setup(item):
+  STEP_BUFFER.clear()
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+  report = yield
+  if report.when == "teardown":
+    record_suite_property(item, "allure_steps", asdict(STEP_BUFFER.stats))
+
+  # fine-grained steps are only worth the report space when something broke
+  if report.when == "call" and is_failure(report) and STEP_BUFFER.entries:
+    allure.attach(STEP_BUFFER.render(), name="Detailed steps", attachment_type=allure.attachment_type.TEXT)
+  return report
+
+def pytest_terminal_summary(terminalreporter, config):
+  steps = teardown_properties(terminalreporter, "allure_steps")
+  if steps:
+    recorded = sum(item["recorded"] for item in steps)
+    buffered = sum(item["buffered"] for item in steps)
+    overhead_ms = sum(item["overhead_seconds"] for item in steps) * 1000
+    terminalreporter.write_sep("-", f"allure steps ({STEP_LEVEL})")
+    terminalreporter.write_line(f"{recorded} recorded, {buffered} buffered across {len(steps)} tests, {overhead_ms:.1f}ms reporting overhead ({overhead_ms / len(steps):.2f}ms per test)")
@@ -0,0 +1,63 @@
+"""
+`--trace-history`, and the trace ring buffer behind pytest-playwright's
+`--tracing` and `--output`, see `tests/support/tracing.py`.
+"""
+import contextlib
+
+from dataclasses import asdict
+
+import allure
+import pytest
+
+from playwright.sync_api import BrowserContext
+
+from tests.support.shared_pages import call_report_key
+from tests.support.tracing import Tracer
+from tests.support.plugins.core import is_failure, record_suite_property, setup_report_key, teardown_properties
+
+def pytest_addoption(parser):
+  # --tracing and --output come from pytest-playwright, whose context fixture is replaced by the suite's
+  parser.addoption(
+    "--trace-history",
+    type=int,
+    default=0,
+    help="with --tracing, also keep the traces of up to this many earlier tests on the failing test's browser context",
+  )
+
+@pytest.fixture(scope='session')
+def tracer(pytestconfig):
+  tracer = Tracer(pytestconfig.getoption("output"), pytestconfig.getoption("tracing"), pytestconfig.getoption("trace_history"))
+  yield tracer
+  tracer.close()
+
+@contextlib.contextmanager
+def traced(request, tracer: Tracer, context: BrowserContext):
+  """Records the test's trace chunk on `context`, kept when the test fails or is xfailed, or always with `--tracing on`."""
+  if not tracer.enabled:
+    yield
+    return
+
+  marker = request.node.get_closest_marker("trace")
+  stats = tracer.start(context, request.node.nodeid, marker.args if marker else ())
+  yield
+
+  # a later fixture's setup can fail after the context was handed out, or the test itself
+  keep = tracer.mode == "on" or any(
+    is_failure(request.node.stash.get(key, None)) for key in (setup_report_key, call_report_key)
+  )
+  for path in tracer.stop(context, request.node.nodeid, keep, stats):
+    allure.attach.file(str(path), name=path.name, extension="zip")
+  record_suite_property(request.node, "tracing", asdict(stats))
+
+def pytest_terminal_summary(terminalreporter, config):
+  traces = teardown_properties(terminalreporter, "tracing")
+  if traces:
+    passing = [item for item in traces if not item["retained"]]
+    overhead_ms = sum(item["seconds"] for item in passing) * 1000
+    written_kb = sum(item["written_bytes"] for item in passing) / 1024
+    retained = [item for item in traces if item["retained"]]
+    retained_mb = sum(item["retained_bytes"] for item in retained) / 1024 / 1024
+    terminalreporter.write_sep("-", "tracing")
+    if passing:
+      terminalreporter.write_line(f"{len(passing)} passing tests: {overhead_ms:.1f}ms tracing overhead ({overhead_ms / len(passing):.2f}ms per test), {written_kb:.1f} KB written to the ring buffer")
+    terminalreporter.write_line(f"{sum(item['retained'] for item in retained)} traces kept for {len(retained)} tests, {retained_mb:.1f} MB in {config.getoption('output')}/")
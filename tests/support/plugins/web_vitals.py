@@ -0,0 +1,59 @@
+"""
+`--web-vitals`: load timing, paints, LCP, CLS, heap and transfer size of
+every fixture navigation, see `tests/support/web_vitals.py`.
+"""
+import json
+
+import pytest
+
+from tests.support.web_vitals import WebVitals, PROFILES as WEB_VITALS_PROFILES, by_path, format_summary as format_web_vitals
+from tests.support.plugins.core import record_suite_property, teardown_properties
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--web-vitals",
+    choices=("off", *WEB_VITALS_PROFILES),
+    default="off",
+    help="record load timing, paints, LCP, CLS, heap and transfer size of every fixture navigation, "
+         "throttled to this profile (Chromium only)",
+  )
+  parser.addoption(
+    "--web-vitals-report",
+    default="web_vitals.json",
+    help="where to write the web vitals per page path and per test, empty to skip the file",
+  )
+
+@pytest.fixture(scope='function')
+def web_vitals(request) -> WebVitals:
+  """Metrics of the navigations wrapped in `web_vitals.navigation`, see `tests/support/web_vitals.py`."""
+  profile = request.config.getoption("web_vitals")
+  web_vitals = WebVitals(None if profile == "off" else profile)
+  yield web_vitals
+  web_vitals.close()
+  if web_vitals.navigations or web_vitals.visits:
+    record_suite_property(request.node, "web_vitals", {
+      "test": request.node.nodeid,
+      "navigations": web_vitals.navigations,
+      "visits": web_vitals.visits,
+    })
+
+def pytest_terminal_summary(terminalreporter, config):
+  web_vitals = teardown_properties(terminalreporter, "web_vitals")
+  if web_vitals:
+    summary = by_path([navigation for item in web_vitals for navigation in item["navigations"]])
+    write_web_vitals_report(config, summary, web_vitals)
+    terminalreporter.write_sep("-", f"web vitals ({config.getoption('web_vitals')}), medians")
+    for line in format_web_vitals(summary):
+      terminalreporter.write_line(line)
+
+def write_web_vitals_report(config, summary: dict, web_vitals: list):
+  path = config.getoption("web_vitals_report")
+  if not path:
+    return
+
+  with open(path, "w") as f:
+    json.dump({
+      "profile": config.getoption("web_vitals"),
+      "paths": summary,
+      "tests": {item["test"]: item["navigations"] for item in web_vitals},
+    }, f, indent=2)
@@ -0,0 +1,86 @@
+"""
+Per-test resource policy applied through context routing.
+
+Most tests never look at images or fonts, so by default those requests are
+stubbed or aborted before they leave the browser, together with every
+request to a third-party host. Tests opt back in with
+`@pytest.mark.resources("images")` or `@pytest.mark.resources("all")`.
+"""
+import base64
+
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Response, Route
+
+POLICIES = ("none", "images", "all")
+
+# resource types each policy keeps off the network
+BLOCKED_TYPES = {
+  "none": {"image", "font", "media"},
+  "images": {"font", "media"},
+  "all": set(),
+}
+
+# 1x1 transparent PNG, images still decode and keep their layout
+STUB_IMAGE = base64.b64decode(
+  "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+@dataclass
+class ResourceStats:
+  blocked: int = 0
+  stubbed: int = 0
+  saved_bytes: int = 0
+  unknown_size: int = 0
+
+class ResourcePolicy:
+  def __init__(self, policy: str, base_url: str, known_sizes: dict[str, int]):
+    if policy not in POLICIES:
+      raise ValueError(f"Unknown resource policy {policy!r}, expected one of {POLICIES}")
+
+    self.policy = policy
+    self.host = urlsplit(base_url).hostname
+    self.known_sizes = known_sizes
+    self.stats = ResourceStats()
+
+  def install(self, context: BrowserContext):
+    context.on("response", self._record_size)
+    if self.policy != "all":
+      context.route("**/*", self._handle)
+
+  def uninstall(self, context: BrowserContext):
+    context.remove_listener("response", self._record_size)
+    if self.policy != "all":
+      context.unroute("**/*", self._handle)
+
+  def _record_size(self, response: Response):
+    length = response.headers.get("content-length")
+    if length is not None and length.isdigit():
+      self.known_sizes[response.url] = int(length)
+
+  def _count_saved(self, url: str):
+    size = self.known_sizes.get(url)
+    if size is None:
+      self.stats.unknown_size += 1
+    else:
+      self.stats.saved_bytes += size
+
+  def _handle(self, route: Route):
+    request = route.request
+    third_party = urlsplit(request.url).hostname != self.host
+
+    if third_party:
+      self.stats.blocked += 1
+      self._count_saved(request.url)
+      route.abort()
+    elif request.resource_type not in BLOCKED_TYPES[self.policy]:
+      route.fallback()
+    elif request.resource_type == "image":
+      self.stats.stubbed += 1
+      self._count_saved(request.url)
+      route.fulfill(status=200, content_type="image/png", body=STUB_IMAGE)
+    else:
+      self.stats.blocked += 1
+      self._count_saved(request.url)
+      route.abort()
@@ -0,0 +1,87 @@
+"""
+Failed tests retried in place from the state their fixtures left.
+
+Right before a test body runs, every page it was given is snapshotted:
+URL, cookies, localStorage and the cart. When the body fails, the pages
+are put back to that state and the body runs again, without tearing down
+and setting up the context, the login or the seeded cart again. A test
+that passes on a retry is flaky, and how often that happens to each test
+is kept across runs.
+"""
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
+
+from playwright.sync_api import Page
+
+from tests.page_objects.cart_state import CartState
+from tests.support.context_pool import CLEAR_STORAGE_SCRIPT, RESET_PATH, RESTORE_STORAGE_SCRIPT
+
+FLAKINESS_KEY = "swaglab/flakiness"
+
+@dataclass
+class PageSnapshot:
+  page: Page
+  url: str
+  storage_state: dict
+  cart: list[int]
+
+def snapshot_pages(funcargs: dict) -> list[PageSnapshot]:
+  """The state of every distinct page among a test's fixture values."""
+  snapshots, seen = [], set()
+  for value in funcargs.values():
+    if not isinstance(value, Page) or id(value) in seen or value.is_closed():
+      continue
+    seen.add(id(value))
+
+    # a blank page has no origin to read the cart from
+    on_app = value.url.startswith("http")
+    snapshots.append(PageSnapshot(
+      value,
+      value.url,
+      value.context.storage_state(),
+      CartState(value).get_items() if on_app else [],
+    ))
+  return snapshots
+
+def origin(url: str) -> str:
+  parts = urlsplit(url)
+  return f"{parts.scheme}://{parts.netloc}"
+
+def restore(snapshot: PageSnapshot, app_url: str):
+  """
+    Puts the page's context back to the snapshot and reopens the URL it was on.
+    Only the app's origin gets its storage back, navigating to any other one
+    is aborted by the resource policy and by strict HAR replay.
+  """
+  page, context = snapshot.page, snapshot.page.context
+  context.clear_cookies()
+  if snapshot.storage_state.get("cookies"):
+    context.add_cookies(snapshot.storage_state["cookies"])
+
+  app_origin = origin(app_url)
+  entries = next(
+    (entry.get("localStorage", []) for entry in snapshot.storage_state.get("origins", []) if entry["origin"] == app_origin),
+    []
+  )
+  # storage is rewritten from the pool's blank page, before any app code runs;
+  # whatever the failed attempt stored there has to go too
+  page.goto(urljoin(app_origin, RESET_PATH))
+  page.evaluate(CLEAR_STORAGE_SCRIPT)
+  page.evaluate(RESTORE_STORAGE_SCRIPT, entries)
+  if origin(snapshot.url) == app_origin:
+    CartState(page).set_items(snapshot.cart)
+
+  page.goto(snapshot.url)
+  if snapshot.url.startswith("http"):
+    page.wait_for_load_state("domcontentloaded")
+
+def update_flakiness(history: dict, runs: dict[str, dict]) -> dict:
+  """Adds this run's outcome of every test: ran, needed a retry, passed only on a retry."""
+  history = dict(history)
+  for nodeid, run in runs.items():
+    counts = dict(history.get(nodeid, {"runs": 0, "retried": 0, "flaky": 0}))
+    counts["runs"] += 1
+    counts["retried"] += run["attempts"] > 0
+    counts["flaky"] += run["attempts"] > 0 and run["passed"]
+    history[nodeid] = counts
+  return history
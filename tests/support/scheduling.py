@@ -0,0 +1,158 @@
+"""
+xdist scheduling driven by how long every test took in earlier runs.
+
+Before the first test is sent, the collection is split longest test first,
+each test going to the worker where it would finish earliest. A test that
+uses a session fixture only some tests need (`async_browser`, for
+example) is charged that fixture's setup time on workers that have not set
+it up yet, which keeps such tests together unless that makes the run longer.
+
+Workers still pull their tests two at a time. A worker that runs out of
+its own plan takes the shortest planned test of the busiest worker, so a
+wrong estimate costs at most one short test of imbalance.
+"""
+import statistics
+
+from collections import deque
+
+from xdist.scheduler import LoadScheduling
+
+HISTORY_KEY = "swaglab/test_durations"
+
+# share of the newest run in the recorded durations, the rest is history
+HISTORY_WEIGHT = 0.5
+
+# tests a worker holds at once, pytest needs the next test to finish the current one
+IN_FLIGHT = 2
+
+def update_history(history: dict, durations: dict, setups: dict, fixtures: dict) -> dict:
+  """Blends the durations of this run into the recorded ones."""
+  for nodeid, duration in durations.items():
+    previous = history.get(nodeid)
+    entry = {
+      "duration": duration,
+      "setup": setups.get(nodeid, 0),
+      "fixtures": fixtures.get(nodeid, previous["fixtures"] if previous else []),
+    }
+    if previous is not None:
+      entry["duration"] = round(HISTORY_WEIGHT * duration + (1 - HISTORY_WEIGHT) * previous["duration"], 4)
+      entry["setup"] = round(HISTORY_WEIGHT * entry["setup"] + (1 - HISTORY_WEIGHT) * previous["setup"], 4)
+    history[nodeid] = entry
+  return history
+
+def plan(nodeids: list[str], history: dict, workers: int) -> tuple[list[list[int]], list[float]]:
+  """Returns the collection indices every worker should run, and the estimated duration of each test."""
+  known = [nodeid for nodeid in nodeids if nodeid in history]
+  default = statistics.median(history[nodeid]["duration"] for nodeid in known) if known else 1.0
+  typical_setup = statistics.median(history[nodeid]["setup"] for nodeid in known) if known else 0.0
+
+  # fixtures every test uses are set up by every worker anyway
+  fixture_sets = [set(history[nodeid]["fixtures"]) for nodeid in known]
+  shared = set.intersection(*fixture_sets) if fixture_sets else set()
+
+  # the test that happened to set a session fixture up paid for it, take that out
+  # of its own duration and charge it once to every worker that needs the fixture
+  durations, groups, setup_costs = [], [], {}
+  for nodeid in nodeids:
+    if nodeid not in history:
+      durations.append(default)
+      groups.append(frozenset())
+      continue
+
+    entry = history[nodeid]
+    group = frozenset(set(entry["fixtures"]) - shared)
+    extra_setup = max(entry["setup"] - typical_setup, 0) if group else 0
+    # the setup can be recorded longer than the blended duration it is part of
+    durations.append(max(entry["duration"] - extra_setup, 0.0))
+    groups.append(group)
+    if group:
+      setup_costs[group] = max(setup_costs.get(group, 0), extra_setup)
+
+  loads = [0.0] * workers
+  worker_groups = [set() for _ in range(workers)]
+  queues = [[] for _ in range(workers)]
+  for index in sorted(range(len(nodeids)), key=durations.__getitem__, reverse=True):
+    group = groups[index]
+
+    def finish(worker):
+      setup = setup_costs.get(group, 0) if group and group not in worker_groups[worker] else 0
+      return loads[worker] + setup + durations[index]
+
+    target = min(range(workers), key=finish)
+    loads[target] = finish(target)
+    worker_groups[target].add(group)
+    queues[target].append(index)
+
+  return queues, durations
+
+class DurationScheduling(LoadScheduling):
+  def __init__(self, config, log=None, history: dict = None):
+    super().__init__(config, log)
+    self.history = history or {}
+    self.durations = []
+    self.node2queue = {}
+    self._unsent = set()
+
+  def schedule(self):
+    assert self.collection_is_completed
+
+    # initial distribution already happened, newly added nodes steal work
+    if self.collection is not None:
+      for node in self.nodes:
+        self.check_schedule(node)
+      return
+
+    if not self._check_nodes_have_same_collection():
+      self.log("**Different tests collected, aborting run**")
+      return
+
+    self.collection = next(iter(self.node2collection.values()))
+    self.pending[:] = range(len(self.collection))
+    self._unsent = set(self.pending)
+    if not self.collection:
+      return
+
+    queues, self.durations = plan(self.collection, self.history, len(self.nodes))
+    self.node2queue = {node: deque(queue) for node, queue in zip(self.nodes, queues)}
+    for node in self.nodes:
+      self.check_schedule(node)
+
+  def check_schedule(self, node, duration: float = 0):
+    if node.shutting_down:
+      return
+
+    indices = []
+    while len(self.node2pending[node]) + len(indices) < IN_FLIGHT:
+      index = self._next_test(node)
+      if index is None:
+        break
+      self.pending.remove(index)
+      self._unsent.discard(index)
+      indices.append(index)
+
+    if indices:
+      self.node2pending[node].extend(indices)
+      node.send_runtest_some(indices)
+
+    if not self.pending:
+      node.shutdown()
+
+  def _planned_seconds(self, queue: deque) -> float:
+    return sum(self.durations[index] for index in queue if index in self._unsent)
+
+  def _next_test(self, node):
+    queue = self.node2queue.get(node)
+    while queue:
+      index = queue.popleft()
+      if index in self._unsent:
+        return index
+
+    # out of its own plan, help the worker with the most work left
+    busiest = max(self.node2queue.values(), key=self._planned_seconds, default=None)
+    while busiest:
+      index = busiest.pop()
+      if index in self._unsent:
+        return index
+
+    # tests of a crashed worker come back through `pending` without a plan
+    return self.pending[0] if self.pending else None
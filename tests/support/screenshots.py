@@ -0,0 +1,65 @@
+"""
+Failure screenshots that stay cheap when many tests fail at once.
+
+Screenshots are only stored as allure attachments. The results logger (see
+`tests/support/allure_results.py`) names attachments after their content
+hash, so identical images (for example every test failing on the same outage
+page) are stored once. A byte budget caps the total size of screenshots per
+run.
+"""
+import hashlib
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import allure
+
+from allure_commons.types import AttachmentType
+from playwright.sync_api import Page
+
+@dataclass
+class ScreenshotStats:
+  captured: int = 0
+  duplicates: int = 0
+  skipped: int = 0
+  written_bytes: int = 0
+
+  def merge(self, other: "ScreenshotStats"):
+    for key, value in asdict(other).items():
+      setattr(self, key, getattr(self, key) + value)
+
+class ScreenshotWriter:
+  def __init__(self, quality: Optional[int], max_bytes: int):
+    self.quality = quality
+    self.max_bytes = max_bytes
+
+    self.stats = ScreenshotStats()
+    self._seen = set()
+
+  @property
+  def attachment_type(self) -> AttachmentType:
+    return AttachmentType.PNG if self.quality is None else AttachmentType.JPG
+
+  def capture(self, page: Page, name: str):
+    """Takes a screenshot of `page` and attaches it to the running allure test."""
+    if self.quality is None:
+      body = page.screenshot(type="png")
+    else:
+      body = page.screenshot(type="jpeg", quality=self.quality)
+
+    # the results logger stores a duplicate only once, so it does not count against the budget
+    digest = hashlib.sha256(body).hexdigest()
+    duplicate = digest in self._seen
+    if not duplicate and self.stats.written_bytes + len(body) > self.max_bytes:
+      self.stats.skipped += 1
+      return
+
+    self.stats.captured += 1
+    allure.attach(body, name=name, attachment_type=self.attachment_type)
+
+    if duplicate:
+      self.stats.duplicates += 1
+      return
+
+    self._seen.add(digest)
+    self.stats.written_bytes += len(body)
@@ -0,0 +1,71 @@
+"""
+Pages prepared once and reused by every case of a parametrized test.
+
+Meant for read-only checks and form validation, where a case only fills a
+form and reads what the page says. Every case is still its own test
+result: the page is reset in place before the case runs, and thrown away
+when a case fails so a broken page cannot fail the cases after it.
+"""
+import contextlib
+
+from typing import Callable, Optional
+
+import pytest
+
+from playwright.sync_api import BrowserContext, Page
+
+from tests.support.context_pool import ContextPool
+from tests.support.resource_policy import ResourcePolicy
+
+# report of the call phase, set by `pytest_runtest_makereport`
+call_report_key = pytest.StashKey[pytest.TestReport]()
+
+class SharedPages:
+  def __init__(self, context_pool: ContextPool, resource_policy: ResourcePolicy, login_state: Callable[[], dict]):
+    self.context_pool = context_pool
+    self.resource_policy = resource_policy
+    self.login_state = login_state
+    self.pages: dict[str, tuple[BrowserContext, Page]] = {}
+
+  def get(self, key: str, prepare: Callable[[Page], None], logged_in: bool = False) -> Page:
+    """Returns the page stored under `key`, calling `prepare` on a new one the first time."""
+    if key in self.pages and not self.pages[key][1].is_closed():
+      return self.pages[key][1]
+    if key in self.pages:
+      self.discard(key)
+
+    context = self.context_pool.acquire(self.login_state() if logged_in else None)
+    self.resource_policy.install(context)
+    page = context.new_page()
+    self.pages[key] = (context, page)
+    try:
+      prepare(page)
+    except BaseException:
+      self.discard(key)
+      raise
+    return page
+
+  def discard(self, key: str):
+    context, _ = self.pages.pop(key)
+    self.resource_policy.uninstall(context)
+    self.context_pool.release(context)
+
+  @contextlib.contextmanager
+  def case(self, item: pytest.Item, key: str, prepare: Callable[[Page], None], reset: Callable[[Page], None], logged_in: bool = False):
+    """Hands one test case the shared page, reset for it, and drops the page if the case fails."""
+    page = self.get(key, prepare, logged_in)
+    try:
+      reset(page)
+    except Exception:
+      # whatever the last case left behind cannot be undone in place, start over
+      self.discard(key)
+      page = self.get(key, prepare, logged_in)
+    yield page
+
+    report: Optional[pytest.TestReport] = item.stash.get(call_report_key, None)
+    if (report is None or report.failed) and key in self.pages:
+      self.discard(key)
+
+  def close(self):
+    for key in list(self.pages):
+      self.discard(key)
@@ -0,0 +1,485 @@
+/*
+ * Minimal client for the local saucedemo stand-in.
+ *
+ * Mirrors the parts of the public site the page objects rely on: the
+ * `data-test` attributes, the `session-username` cookie and the
+ * `cart-contents` localStorage key. Routing is client side (pushState),
+ * like the real site, so in-app navigation never hits the server.
+ */
+(function () {
+  'use strict';
+
+  var SESSION_COOKIE = 'session-username';
+  var SESSION_TTL_MS = 10 * 60 * 1000;
+  var CART_KEY = 'cart-contents';
+  var TAX_RATE = 0.08;
+
+  var catalog = window.SWAG_CATALOG;
+  var sortOrder = 'az';
+
+  var SORTERS = {
+    az: function (a, b) { return a.name < b.name ? -1 : a.name > b.name ? 1 : 0; },
+    za: function (a, b) { return a.name < b.name ? 1 : a.name > b.name ? -1 : 0; },
+    lohi: function (a, b) { return a.price - b.price; },
+    hilo: function (a, b) { return b.price - a.price; }
+  };
+
+  // -- session -------------------------------------------------------------
+
+  function getSession() {
+    var cookies = document.cookie ? document.cookie.split('; ') : [];
+    for (var i = 0; i < cookies.length; i++) {
+      var idx = cookies[i].indexOf('=');
+      if (cookies[i].slice(0, idx) === SESSION_COOKIE) {
+        return decodeURIComponent(cookies[i].slice(idx + 1));
+      }
+    }
+    return null;
+  }
+
+  function startSession(username) {
+    var expires = new Date(Date.now() + SESSION_TTL_MS).toUTCString();
+    document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; expires=' + expires + '; path=/';
+  }
+
+  function endSession() {
+    document.cookie = SESSION_COOKIE + '=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/';
+  }
+
+  // -- cart ----------------------------------------------------------------
+
+  function getCart() {
+    try {
+      var ids = JSON.parse(window.localStorage.getItem(CART_KEY) || '[]');
+      return Array.isArray(ids) ? ids : [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function setCart(ids) {
+    if (ids.length === 0) {
+      window.localStorage.removeItem(CART_KEY);
+    } else {
+      window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    }
+  }
+
+  function addToCart(id) {
+    var ids = getCart();
+    if (ids.indexOf(id) === -1) {
+      ids.push(id);
+      setCart(ids);
+    }
+  }
+
+  function removeFromCart(id) {
+    setCart(getCart().filter(function (other) { return other !== id; }));
+  }
+
+  function cartProducts() {
+    return getCart().map(productById).filter(Boolean);
+  }
+
+  function productById(id) {
+    for (var i = 0; i < catalog.products.length; i++) {
+      if (catalog.products[i].id === id) {
+        return catalog.products[i];
+      }
+    }
+    return null;
+  }
+
+  // -- dom helpers ---------------------------------------------------------
+
+  function el(tag, attrs, children) {
+    var node = document.createElement(tag);
+    Object.keys(attrs || {}).forEach(function (key) {
+      var value = attrs[key];
+      if (key.slice(0, 2) === 'on') {
+        node.addEventListener(key.slice(2).toLowerCase(), value);
+      } else if (key === 'text') {
+        node.textContent = value;
+      } else if (value !== null && value !== undefined && value !== false) {
+        node.setAttribute(key, value === true ? '' : value);
+      }
+    });
+    (children || []).forEach(function (child) {
+      if (child) {
+        node.appendChild(typeof child === 'string' ? document.createTextNode(child) : child);
+      }
+    });
+    return node;
+  }
+
+  function slug(name) {
+    return name.toLowerCase().replace(/\s+/g, '-');
+  }
+
+  function formatPrice(value) {
+    return '$' + value.toFixed(2);
+  }
+
+  function link(attrs, path, children) {
+    attrs.href = path;
+    attrs.onClick = function (event) {
+      event.preventDefault();
+      navigate(path);
+    };
+    return el('a', attrs, children);
+  }
+
+  function errorBanner(container, message) {
+    container.className = 'error-message-container' + (message ? ' error' : '');
+    container.replaceChildren();
+    if (!message) {
+      return;
+    }
+    container.appendChild(el('h3', { 'data-test': 'error' }, [
+      message,
+      el('button', {
+        'class': 'error-button',
+        'data-test': 'error-button',
+        'aria-label': 'Dismiss error',
+        type: 'button',
+        onClick: function () { errorBanner(container, null); }
+      })
+    ]));
+  }
+
+  function mount(children) {
+    document.getElementById('root').replaceChildren.apply(document.getElementById('root'), children);
+  }
+
+  // -- routing -------------------------------------------------------------
+
+  function navigate(path) {
+    window.history.pushState(null, '', path);
+    render();
+  }
+
+  function render() {
+    var path = window.location.pathname;
+    var view = ROUTES[path];
+
+    if (!view) {
+      mount([el('h1', { text: 'Not Found' })]);
+      return;
+    }
+
+    if (view !== loginView && !getSession()) {
+      window.history.replaceState(null, '', '/');
+      loginView("Epic sadface: You can only access '" + path + "' when you are logged in.");
+      return;
+    }
+
+    view();
+  }
+
+  // -- shared chrome -------------------------------------------------------
+
+  function header(title, secondary) {
+    var menu = el('div', { 'class': 'bm-menu-wrap', 'aria-hidden': 'true' });
+    var toggleMenu = function (open) {
+      menu.className = 'bm-menu-wrap' + (open ? ' open' : '');
+      menu.setAttribute('aria-hidden', open ? 'false' : 'true');
+    };
+
+    menu.appendChild(el('nav', { 'class': 'bm-item-list' }, [
+      link({ id: 'inventory_sidebar_link', 'data-test': 'inventory-sidebar-link', 'class': 'bm-item menu-item' }, '/inventory.html', ['All Items']),
+      el('a', { id: 'about_sidebar_link', 'data-test': 'about-sidebar-link', 'class': 'bm-item menu-item', href: 'https://saucelabs.com/' }, ['About']),
+      el('a', {
+        id: 'logout_sidebar_link',
+        'data-test': 'logout-sidebar-link',
+        'class': 'bm-item menu-item',
+        href: '/',
+        onClick: function (event) {
+          event.preventDefault();
+          endSession();
+          navigate('/');
+        }
+      }, ['Logout']),
+      el('a', {
+        id: 'reset_sidebar_link',
+        'data-test': 'reset-sidebar-link',
+        'class': 'bm-item menu-item',
+        href: '#',
+        onClick: function (event) {
+          event.preventDefault();
+          setCart([]);
+          render();
+        }
+      }, ['Reset App State'])
+    ]));
+    menu.appendChild(el('div', { 'class': 'bm-cross-button' }, [
+      el('button', { id: 'react-burger-cross-btn', type: 'button', onClick: function () { toggleMenu(false); } }, ['Close Menu'])
+    ]));
+
+    var count = getCart().length;
+    var cartLink = link({ 'class': 'shopping_cart_link', 'data-test': 'shopping-cart-link' }, '/cart.html', [
+      count > 0 ? el('span', { 'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge', text: String(count) }) : null
+    ]);
+
+    return el('div', { id: 'header_container', 'class': 'header_container', 'data-test': 'header-container' }, [
+      el('div', { 'class': 'primary_header', 'data-test': 'primary-header' }, [
+        el('div', { id: 'menu_button_container' }, [
+          el('div', { 'class': 'bm-burger-button' }, [
+            el('button', { id: 'react-burger-menu-btn', type: 'button', onClick: function () { toggleMenu(true); } }, ['Open Menu'])
+          ]),
+          menu
+        ]),
+        el('div', { 'class': 'app_logo', text: 'Swag Labs' }),
+        el('div', { id: 'shopping_cart_container', 'class': 'shopping_cart_container' }, [cartLink])
+      ]),
+      el('div', { 'class': 'header_secondary_container', 'data-test': 'secondary-header' }, [
+        el('span', { 'class': 'title', 'data-test': 'title', text: title }),
+        secondary
+      ])
+    ]);
+  }
+
+  function itemLabel(product, extra) {
+    return el('div', { 'class': 'inventory_item_label' }, [
+      el('a', { href: '#', id: 'item_' + product.id + '_title_link', 'data-test': 'item-' + product.id + '-title-link' }, [
+        el('div', { 'class': 'inventory_item_name', 'data-test': 'inventory-item-name', text: product.name })
+      ]),
+      el('div', { 'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc', text: product.description }),
+      extra
+    ]);
+  }
+
+  function cartButton(product, inCart) {
+    var prefix = inCart ? 'remove-' : 'add-to-cart-';
+    return el('button', {
+      'class': 'btn btn_small btn_inventory ' + (inCart ? 'btn_secondary' : 'btn_primary'),
+      'data-test': prefix + slug(product.name),
+      id: prefix + slug(product.name),
+      name: prefix + slug(product.name),
+      type: 'button',
+      onClick: function () {
+        if (inCart) {
+          removeFromCart(product.id);
+        } else {
+          addToCart(product.id);
+        }
+        render();
+      }
+    }, [inCart ? 'Remove' : 'Add to cart']);
+  }
+
+  function cartItem(product, removable) {
+    return el('div', { 'class': 'cart_item', 'data-test': 'inventory-item' }, [
+      el('div', { 'class': 'cart_quantity', 'data-test': 'item-quantity', text: '1' }),
+      itemLabel(product, el('div', { 'class': 'item_pricebar' }, [
+        el('div', { 'class': 'inventory_item_price', 'data-test': 'inventory-item-price', text: formatPrice(product.price) }),
+        removable ? cartButton(product, true) : null
+      ]))
+    ]);
+  }
+
+  // -- views ---------------------------------------------------------------
+
+  function loginView(initialError) {
+    var errors = el('div', { 'class': 'error-message-container' });
+    var username = el('input', { 'class': 'input_error form_input', placeholder: 'Username', type: 'text', 'data-test': 'username', id: 'user-name', name: 'user-name', autocorrect: 'off', autocapitalize: 'none' });
+    var password = el('input', { 'class': 'input_error form_input', placeholder: 'Password', type: 'password', 'data-test': 'password', id: 'password', name: 'password', autocorrect: 'off', autocapitalize: 'none' });
+
+    var form = el('form', {
+      onSubmit: function (event) {
+        event.preventDefault();
+        var user = username.value;
+        var pass = password.value;
+
+        if (!user) {
+          errorBanner(errors, 'Epic sadface: Username is required');
+        } else if (!pass) {
+          errorBanner(errors, 'Epic sadface: Password is required');
+        } else if (catalog.users.indexOf(user) === -1 || pass !== catalog.password) {
+          errorBanner(errors, 'Epic sadface: Username and password do not match any user in this service');
+        } else if (catalog.lockedOutUsers.indexOf(user) !== -1) {
+          errorBanner(errors, 'Epic sadface: Sorry, this user has been locked out.');
+        } else {
+          startSession(user);
+          navigate('/inventory.html');
+        }
+      }
+    }, [
+      el('div', { 'class': 'form_group' }, [username]),
+      el('div', { 'class': 'form_group' }, [password]),
+      errors,
+      el('input', { type: 'submit', 'class': 'submit-button btn_action', 'data-test': 'login-button', id: 'login-button', name: 'login-button', value: 'Login' })
+    ]);
+
+    errorBanner(errors, typeof initialError === 'string' ? initialError : null);
+    mount([
+      el('div', { 'class': 'login_logo', text: 'Swag Labs' }),
+      el('div', { 'class': 'login_wrapper', 'data-test': 'login-container' }, [form])
+    ]);
+  }
+
+  function inventoryView() {
+    var select = el('select', {
+      'class': 'product_sort_container',
+      'data-test': 'product-sort-container',
+      onChange: function (event) {
+        sortOrder = event.target.value;
+        render();
+      }
+    }, [
+      el('option', { value: 'az', text: 'Name (A to Z)' }),
+      el('option', { value: 'za', text: 'Name (Z to A)' }),
+      el('option', { value: 'lohi', text: 'Price (low to high)' }),
+      el('option', { value: 'hilo', text: 'Price (high to low)' })
+    ]);
+    select.value = sortOrder;
+
+    var cart = getCart();
+    var products = catalog.products.slice().sort(SORTERS.az).sort(SORTERS[sortOrder]);
+
+    mount([
+      header('Products', el('div', { 'class': 'right_component' }, [select])),
+      el('div', { 'class': 'inventory_list', 'data-test': 'inventory-list' }, products.map(function (product) {
+        return el('div', { 'class': 'inventory_item', 'data-test': 'inventory-item' }, [
+          el('div', { 'class': 'inventory_item_img' }, [
+            el('a', { href: '#', id: 'item_' + product.id + '_img_link' }, [
+              el('img', { alt: product.name, 'class': 'inventory_item_img', src: product.image, 'data-test': 'inventory-item-' + slug(product.name) + '-img' })
+            ])
+          ]),
+          el('div', { 'class': 'inventory_item_description', 'data-test': 'inventory-item-description' }, [
+            itemLabel(product, null),
+            el('div', { 'class': 'pricebar' }, [
+              el('div', { 'class': 'inventory_item_price', 'data-test': 'inventory-item-price', text: formatPrice(product.price) }),
+              cartButton(product, cart.indexOf(product.id) !== -1)
+            ])
+          ])
+        ]);
+      }))
+    ]);
+  }
+
+  function cartView() {
+    mount([
+      header('Your Cart', null),
+      el('div', { id: 'cart_contents_container', 'class': 'cart_contents_container', 'data-test': 'cart-contents-container' }, [
+        el('div', { 'class': 'cart_list', 'data-test': 'cart-list' }, cartProducts().map(function (product) {
+          return cartItem(product, true);
+        })),
+        el('div', { 'class': 'cart_footer' }, [
+          link({ 'class': 'btn btn_secondary back btn_medium', id: 'continue-shopping', 'data-test': 'continue-shopping' }, '/inventory.html', ['Continue Shopping']),
+          el('button', {
+            'class': 'btn btn_action btn_medium checkout_button',
+            id: 'checkout',
+            'data-test': 'checkout',
+            type: 'button',
+            onClick: function () { navigate('/checkout-step-one.html'); }
+          }, ['Checkout'])
+        ])
+      ])
+    ]);
+  }
+
+  function checkoutInfoView() {
+    var errors = el('div', { 'class': 'error-message-container' });
+    var fields = [
+      ['firstName', 'first-name', 'First Name'],
+      ['lastName', 'last-name', 'Last Name'],
+      ['postalCode', 'postal-code', 'Zip/Postal Code']
+    ].map(function (spec) {
+      return el('input', { 'class': 'input_error form_input', placeholder: spec[2], type: 'text', 'data-test': spec[0], id: spec[1], name: spec[0], label: spec[2] });
+    });
+
+    var form = el('form', {
+      onSubmit: function (event) {
+        event.preventDefault();
+        if (!fields[0].value) {
+          errorBanner(errors, 'Error: First Name is required');
+        } else if (!fields[1].value) {
+          errorBanner(errors, 'Error: Last Name is required');
+        } else if (!fields[2].value) {
+          errorBanner(errors, 'Error: Postal Code is required');
+        } else {
+          navigate('/checkout-step-two.html');
+        }
+      }
+    }, [
+      el('div', { 'class': 'checkout_info' }, fields.map(function (field) {
+        return el('div', { 'class': 'form_group' }, [field]);
+      }).concat([errors])),
+      el('div', { 'class': 'checkout_buttons' }, [
+        link({ 'class': 'btn btn_secondary back btn_medium cart_cancel_link', id: 'cancel', 'data-test': 'cancel' }, '/cart.html', ['Cancel']),
+        el('input', { type: 'submit', 'class': 'submit-button btn btn_primary cart_button btn_action', 'data-test': 'continue', id: 'continue', name: 'continue', value: 'Continue' })
+      ])
+    ]);
+
+    mount([
+      header('Checkout: Your Information', null),
+      el('div', { id: 'checkout_info_container', 'class': 'checkout_info_container', 'data-test': 'checkout-info-container' }, [form])
+    ]);
+  }
+
+  function checkoutOverviewView() {
+    var products = cartProducts();
+    var subtotal = products.reduce(function (sum, product) { return sum + product.price; }, 0);
+    var tax = Number((subtotal * TAX_RATE).toFixed(2));
+
+    mount([
+      header('Checkout: Overview', null),
+      el('div', { id: 'checkout_summary_container', 'class': 'checkout_summary_container', 'data-test': 'checkout-summary-container' }, [
+        el('div', { 'class': 'cart_list', 'data-test': 'cart-list' }, products.map(function (product) {
+          return cartItem(product, false);
+        })),
+        el('div', { 'class': 'summary_info' }, [
+          el('div', { 'class': 'summary_info_label', 'data-test': 'payment-info-label', text: 'Payment Information:' }),
+          el('div', { 'class': 'summary_value_label', 'data-test': 'payment-info-value', text: 'SauceCard #31337' }),
+          el('div', { 'class': 'summary_info_label', 'data-test': 'shipping-info-label', text: 'Shipping Information:' }),
+          el('div', { 'class': 'summary_value_label', 'data-test': 'shipping-info-value', text: 'Free Pony Express Delivery!' }),
+          el('div', { 'class': 'summary_info_label', 'data-test': 'total-info-label', text: 'Price Total' }),
+          el('div', { 'class': 'summary_subtotal_label', 'data-test': 'subtotal-label', text: 'Item total: ' + formatPrice(subtotal) }),
+          el('div', { 'class': 'summary_tax_label', 'data-test': 'tax-label', text: 'Tax: ' + formatPrice(tax) }),
+          el('div', { 'class': 'summary_total_label', 'data-test': 'total-label', text: 'Total: ' + formatPrice(subtotal + tax) })
+        ]),
+        el('div', { 'class': 'cart_footer' }, [
+          link({ 'class': 'btn btn_secondary back btn_medium cart_cancel_link', id: 'cancel', 'data-test': 'cancel' }, '/inventory.html', ['Cancel']),
+          el('button', {
+            'class': 'btn btn_action btn_medium cart_button',
+            id: 'finish',
+            'data-test': 'finish',
+            type: 'button',
+            onClick: function () {
+              setCart([]);
+              navigate('/checkout-complete.html');
+            }
+          }, ['Finish'])
+        ])
+      ])
+    ]);
+  }
+
+  function checkoutCompleteView() {
+    mount([
+      header('Checkout: Complete!', null),
+      el('div', { id: 'checkout_complete_container', 'class': 'checkout_complete_container', 'data-test': 'checkout-complete-container' }, [
+        el('h2', { 'class': 'complete-header', 'data-test': 'complete-header', text: 'Thank you for your order!' }),
+        el('div', { 'class': 'complete-text', 'data-test': 'complete-text', text: 'Your order has been dispatched, and will arrive just as fast as the pony can get there!' }),
+        link({ 'class': 'btn btn_primary btn_small', id: 'back-to-products', 'data-test': 'back-to-products' }, '/inventory.html', ['Back Home'])
+      ])
+    ]);
+  }
+
+  var ROUTES = {
+    '/': loginView,
+    '/inventory.html': inventoryView,
+    '/cart.html': cartView,
+    '/checkout-step-one.html': checkoutInfoView,
+    '/checkout-step-two.html': checkoutOverviewView,
+    '/checkout-complete.html': checkoutCompleteView
+  };
+
+  window.addEventListener('popstate', render);
+  window.addEventListener('pageshow', function (event) {
+    if (event.persisted) {
+      render();
+    }
+  });
+  render();
+})();
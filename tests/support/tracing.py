@@ -0,0 +1,113 @@
+"""
+Playwright traces kept only for tests that fail.
+
+  pytest --tracing retain-on-failure --trace-history 2
+
+Tracing is started once per browser context and every test records its own
+chunk, so pooled contexts pay the start-up once. The chunk of a passing
+test is dropped without being written. With a history the last chunks of
+every context are written to a ring buffer instead, and a failure keeps
+them together with its own: a pooled context carries over whatever the
+tests before it left behind.
+
+DOM snapshots, screenshots and sources make traces much larger, so they
+are only recorded for tests marked with, for example,
+`@pytest.mark.trace("snapshots", "screenshots")`.
+"""
+import os
+import re
+import time
+import weakref
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext
+
+# the values of pytest-playwright's --tracing
+MODES = ("off", "on", "retain-on-failure")
+DETAILS = ("snapshots", "screenshots", "sources")
+
+@dataclass
+class TraceStats:
+  seconds: float = 0
+  written_bytes: int = 0
+  retained: int = 0
+  retained_bytes: int = 0
+
+def trace_name(name: str) -> str:
+  return re.sub(r"[^\w.-]+", "_", name).strip("_")
+
+class Tracer:
+  def __init__(self, directory: str, mode: str, history: int = 0):
+    if mode not in MODES:
+      raise ValueError(f"Unknown tracing mode {mode!r}, expected one of {MODES}")
+
+    self.directory = Path(directory)
+    self.buffer = self.directory / ".buffer"
+    self.mode = mode
+    self.history = history
+    self._details: weakref.WeakKeyDictionary[BrowserContext, tuple] = weakref.WeakKeyDictionary()
+    self._chunks: weakref.WeakKeyDictionary[BrowserContext, deque] = weakref.WeakKeyDictionary()
+    self._written = 0
+
+  @property
+  def enabled(self) -> bool:
+    return self.mode != "off"
+
+  def start(self, context: BrowserContext, title: str, details: tuple = ()) -> TraceStats:
+    """Starts the chunk of one test, restarting tracing when the test asks for other details."""
+    unknown = set(details) - set(DETAILS)
+    if unknown:
+      raise ValueError(f"Unknown trace details {sorted(unknown)}, expected some of {DETAILS}")
+
+    stats = TraceStats()
+    started = time.perf_counter()
+    details = tuple(sorted(details))
+    if self._details.get(context) != details:
+      if context in self._details:
+        context.tracing.stop()
+      context.tracing.start(**{detail: detail in details for detail in DETAILS})
+      self._details[context] = details
+    context.tracing.start_chunk(title=title)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+  def stop(self, context: BrowserContext, name: str, keep: bool, stats: TraceStats) -> list[Path]:
+    """Ends the chunk started by `start`, returns the trace files kept for a failure."""
+    started = time.perf_counter()
+    if not keep and not self.history:
+      context.tracing.stop_chunk()
+      stats.seconds += time.perf_counter() - started
+      return []
+
+    self.buffer.mkdir(parents=True, exist_ok=True)
+    self._written += 1
+    path = self.buffer / f"{trace_name(name)}.{os.getpid()}.{self._written}.zip"
+    context.tracing.stop_chunk(path=path)
+    stats.written_bytes += path.stat().st_size
+
+    chunks = self._chunks.setdefault(context, deque())
+    kept = []
+    if keep:
+      # the chunks of earlier tests on this context first, oldest first
+      for index, chunk in enumerate(reversed(chunks), start=1):
+        kept.insert(0, chunk.replace(self.directory / f"{trace_name(name)}.before-{index}.zip"))
+      chunks.clear()
+      kept.append(path.replace(self.directory / f"{trace_name(name)}.zip"))
+      stats.retained = len(kept)
+      stats.retained_bytes = sum(file.stat().st_size for file in kept)
+    else:
+      chunks.append(path)
+      while len(chunks) > self.history:
+        chunks.popleft().unlink(missing_ok=True)
+
+    stats.seconds += time.perf_counter() - started
+    return kept
+
+  def close(self):
+    for chunks in self._chunks.values():
+      for chunk in chunks:
+        chunk.unlink(missing_ok=True)
+    self._chunks.clear()
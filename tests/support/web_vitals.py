@@ -0,0 +1,192 @@
+"""
+Page-load metrics of the navigation fixtures.
+
+  with web_vitals.navigation(page, CartPage.PATH):
+    page.goto(urljoin(env["base_url"], CartPage.PATH))
+
+With `--web-vitals <profile>` every navigation wrapped like this waits for
+the load event and records navigation timing, first (contentful) paint,
+largest contentful paint, cumulative layout shift, JS heap size, request
+count and transferred bytes under the page-object `PATH`. The paths the
+page moves through afterwards are kept with their arrival times, so
+journeys like login to inventory can be timed. The profile throttles
+network and CPU through the Chrome DevTools Protocol, so the metrics are
+only collected with Chromium.
+"""
+import contextlib
+import json
+import statistics
+import time
+
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import allure
+
+from playwright.sync_api import CDPSession, Frame, Page
+
+@dataclass(frozen=True)
+class Profile:
+  latency_ms: float = 0
+  # bytes per second, -1 leaves the direction unthrottled
+  download: float = -1
+  upload: float = -1
+  cpu_slowdown: float = 1
+
+  @property
+  def throttles_network(self) -> bool:
+    return self.latency_ms > 0 or self.download >= 0 or self.upload >= 0
+
+# the network presets of Chrome DevTools, "mobile" is what Lighthouse assumes for phones
+FAST_3G = Profile(latency_ms=562.5, download=1.6 * 1024 * 1024 / 8 * 0.9, upload=750 * 1024 / 8 * 0.9)
+PROFILES = {
+  "desktop": Profile(),
+  "fast-3g": FAST_3G,
+  "slow-3g": Profile(latency_ms=2000, download=500 * 1024 / 8 * 0.8, upload=500 * 1024 / 8 * 0.8),
+  "4x-cpu": Profile(cpu_slowdown=4),
+  "mobile": Profile(FAST_3G.latency_ms, FAST_3G.download, FAST_3G.upload, cpu_slowdown=4),
+}
+
+# LCP and layout shifts are only reported to observers, so they have to be watched from the start
+OBSERVERS_SCRIPT = """
+(() => {
+  const vitals = window.__webVitals = { lcp: null, cls: 0 };
+  new PerformanceObserver(list => {
+    for (const entry of list.getEntries()) vitals.lcp = entry.startTime;
+  }).observe({ type: "largest-contentful-paint", buffered: true });
+  new PerformanceObserver(list => {
+    for (const entry of list.getEntries()) if (!entry.hadRecentInput) vitals.cls += entry.value;
+  }).observe({ type: "layout-shift", buffered: true });
+})();
+"""
+
+COLLECT_SCRIPT = """
+() => {
+  const [navigation] = performance.getEntriesByType("navigation");
+  const paints = Object.fromEntries(performance.getEntriesByType("paint").map(entry => [entry.name, entry.startTime]));
+  const resources = performance.getEntriesByType("resource");
+  const vitals = window.__webVitals || {};
+  return {
+    ttfb_ms: navigation ? navigation.responseStart : null,
+    dom_content_loaded_ms: navigation ? navigation.domContentLoadedEventEnd : null,
+    load_ms: navigation ? navigation.loadEventEnd : null,
+    first_paint_ms: paints["first-paint"] ?? null,
+    first_contentful_paint_ms: paints["first-contentful-paint"] ?? null,
+    largest_contentful_paint_ms: vitals.lcp ?? null,
+    cumulative_layout_shift: vitals.cls ?? null,
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+    requests: resources.length + (navigation ? 1 : 0),
+    transferred_bytes: resources.reduce((total, entry) => total + entry.transferSize, navigation ? navigation.transferSize : 0),
+  };
+}
+"""
+
+# columns of the terminal summary, with the unit they are shown in
+SUMMARY_COLUMNS = {
+  "ttfb_ms": ("ttfb", 1),
+  "first_contentful_paint_ms": ("fcp", 1),
+  "largest_contentful_paint_ms": ("lcp", 1),
+  "load_ms": ("load", 1),
+  "cumulative_layout_shift": ("cls", 1),
+  "requests": ("reqs", 1),
+  "transferred_bytes": ("KB", 1024),
+  "js_heap_bytes": ("heap MB", 1024 * 1024),
+}
+
+class WebVitals:
+  """Metrics of the navigations of one test, nothing is done when `profile` is None."""
+  def __init__(self, profile: Optional[str]):
+    if profile is not None and profile not in PROFILES:
+      raise ValueError(f"Unknown throttling profile {profile!r}, expected one of {tuple(PROFILES)}")
+
+    self.profile = profile
+    self.navigations: list[dict] = []
+    # per page, every path it arrived at and when
+    self.visits: list[list[dict]] = []
+    self._started = time.perf_counter()
+    self._sessions: dict[Page, CDPSession] = {}
+
+  def _prepare(self, page: Page):
+    if page in self._sessions:
+      return
+
+    page.add_init_script(OBSERVERS_SCRIPT)
+    visits = []
+    self.visits.append(visits)
+    page.on("framenavigated", lambda frame: self._visit(page, frame, visits))
+    session = page.context.new_cdp_session(page)
+    profile = PROFILES[self.profile]
+    if profile.throttles_network:
+      session.send("Network.enable")
+      session.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile.latency_ms,
+        "downloadThroughput": profile.download,
+        "uploadThroughput": profile.upload,
+      })
+    if profile.cpu_slowdown != 1:
+      session.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_slowdown})
+    self._sessions[page] = session
+
+  def _visit(self, page: Page, frame: Frame, visits: list[dict]):
+    # also fires for client-side route changes, which is how the app moves between most pages
+    if frame == page.main_frame:
+      visits.append({"path": urlsplit(frame.url).path, "at_ms": (time.perf_counter() - self._started) * 1000})
+
+  @contextlib.contextmanager
+  def navigation(self, page: Page, path: str):
+    """Records the page load started inside the block under `path`."""
+    if self.profile is None:
+      yield
+      return
+
+    self._prepare(page)
+    started = time.perf_counter()
+    yield
+    page.wait_for_load_state("load")
+    metrics = {
+      "path": path,
+      "profile": self.profile,
+      "navigation_ms": (time.perf_counter() - started) * 1000,
+      **page.evaluate(COLLECT_SCRIPT),
+    }
+    self.navigations.append(metrics)
+    allure.attach(json.dumps(metrics, indent=2), name=f"Web vitals {path} ({self.profile})", attachment_type=allure.attachment_type.JSON)
+
+  def close(self):
+    for page, session in self._sessions.items():
+      if not page.is_closed():
+        session.detach()
+    self._sessions.clear()
+
+def by_path(navigations: list[dict]) -> dict[str, dict]:
+  """Median of every metric per path, with the number of navigations it was taken from."""
+  paths = {}
+  for navigation in navigations:
+    paths.setdefault(navigation["path"], []).append(navigation)
+
+  summary = {}
+  for path, loads in sorted(paths.items()):
+    summary[path] = {"navigations": len(loads)}
+    for key in loads[0]:
+      values = [load[key] for load in loads if isinstance(load.get(key), (int, float))]
+      if key not in ("path", "profile") and values:
+        summary[path][key] = statistics.median(values)
+  return summary
+
+def format_summary(summary: dict[str, dict]) -> list[str]:
+  header = " ".join(f"{label:>8}" for label, _ in SUMMARY_COLUMNS.values())
+  lines = [f"{'path':<28} {'loads':>5} {header}"]
+  for path, metrics in summary.items():
+    cells = []
+    for key, (_, unit) in SUMMARY_COLUMNS.items():
+      value = metrics.get(key)
+      if value is None:
+        cells.append(f"{'-':>8}")
+      elif key == "cumulative_layout_shift":
+        cells.append(f"{value:>8.3f}")
+      else:
+        cells.append(f"{value / unit:>8.1f}")
+    lines.append(f"{path:<28} {metrics['navigations']:>5} {' '.join(cells)}")
+  return lines
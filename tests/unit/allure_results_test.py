@@ -0,0 +1,118 @@
+import json
+import os
+import tarfile
+import time
+
+import pytest
+
+from allure_commons import model2
+
+from tests.support.allure_results import BatchedResultsLogger, archive_previous_run, archive_dir, merge_batches
+
+FINISHED = 1767323045
+
+def archive_name(finished: float, suffix: str = "") -> str:
+  return time.strftime("%Y%m%d-%H%M%S", time.localtime(finished)) + f"{suffix}.tar.gz"
+
+def results(report_dir) -> list[dict]:
+  return [json.loads(path.read_text()) for path in sorted(report_dir.glob("*-result.json"))]
+
+def write_run(report_dir, finished: float = FINISHED, files: int = 2, size: int = 100):
+  """Leaves the result files of a run in `report_dir`, the newest written at `finished`."""
+  report_dir.mkdir(exist_ok=True)
+  for index in range(files):
+    path = report_dir / f"{index}-result.json"
+    path.write_bytes(os.urandom(size))
+    os.utime(path, (finished, finished))
+
+def archives(report_dir) -> list[str]:
+  return sorted(path.name for path in archive_dir(report_dir).glob("*.tar.gz"))
+
+def test_merge_points_duplicate_attachments_at_one_copy(tmp_path):
+  report_dir = tmp_path / "reports"
+  logger = BatchedResultsLogger(str(report_dir), "gw0")
+  logger.report_attached_data(b"same screenshot", "first-attachment.png")
+  logger.report_attached_data(b"same screenshot", "second-attachment.png")
+  logger.report_attached_data(b"other screenshot", "third-attachment.png")
+  logger.report_result(model2.TestResult(
+    name="test_a",
+    attachments=[model2.Attachment(name="page", source="first-attachment.png", type="image/png")],
+    steps=[model2.TestStepResult(name="step", attachments=[model2.Attachment(name="page", source="second-attachment.png", type="image/png")])],
+  ))
+  logger.report_result(model2.TestResult(name="test_b", attachments=[model2.Attachment(name="page", source="third-attachment.png", type="image/png")]))
+  logger.close()
+
+  assert merge_batches(str(report_dir)) == 2
+  stored = sorted(path.name for path in report_dir.glob("*-attachment.png"))
+  assert len(stored) == 2
+  assert (logger.stats.attachments, logger.stats.duplicate_attachments, logger.stats.saved_bytes) == (3, 1, len(b"same screenshot"))
+
+  by_name = {result["name"]: result for result in results(report_dir)}
+  first = by_name["test_a"]["attachments"][0]["source"]
+  assert by_name["test_a"]["steps"][0]["attachments"][0]["source"] == first
+  assert by_name["test_b"]["attachments"][0]["source"] != first
+  assert {first, by_name["test_b"]["attachments"][0]["source"]} == set(stored)
+
+def test_merge_collects_the_batches_of_every_worker(tmp_path):
+  report_dir = tmp_path / "reports"
+  for worker in ("gw0", "gw1"):
+    logger = BatchedResultsLogger(str(report_dir), worker, batch_size=1)
+    logger.report_result(model2.TestResult(name=f"test_{worker}"))
+    logger.close()
+
+  assert merge_batches(str(report_dir)) == 2
+  assert sorted(result["name"] for result in results(report_dir)) == ["test_gw0", "test_gw1"]
+  # the batches are consumed, a second merge writes nothing
+  assert merge_batches(str(report_dir)) == 0
+
+def test_archive_moves_the_previous_run(tmp_path):
+  report_dir = tmp_path / "reports"
+  write_run(report_dir)
+
+  retention = archive_previous_run(str(report_dir), keep_runs=5, keep_bytes=10 * 1024 * 1024)
+  assert list(report_dir.iterdir()) == []
+  assert archives(report_dir) == [archive_name(FINISHED)]
+  with tarfile.open(archive_dir(report_dir) / archive_name(FINISHED)) as archive:
+    assert sorted(archive.getnames()) == ["0-result.json", "1-result.json"]
+  assert (retention.archived, retention.pruned) == (2, 0)
+
+def test_archive_numbers_runs_that_finished_in_the_same_second(tmp_path):
+  report_dir = tmp_path / "reports"
+  for _ in range(3):
+    write_run(report_dir)
+    archive_previous_run(str(report_dir), keep_runs=5, keep_bytes=10 * 1024 * 1024)
+
+  assert archives(report_dir) == sorted(archive_name(FINISHED, suffix) for suffix in ("", "-2", "-3"))
+
+@pytest.mark.parametrize("runs,keep_runs,kept", [
+  (3, 2, 2),
+  (3, 5, 3),
+  (2, 0, 0),
+])
+def test_archive_keeps_the_newest_runs(tmp_path, runs, keep_runs, kept):
+  report_dir = tmp_path / "reports"
+  for run in range(runs):
+    write_run(report_dir, finished=FINISHED + run * 60)
+    archive_previous_run(str(report_dir), keep_runs=keep_runs, keep_bytes=10 * 1024 * 1024)
+    # the archive's own time decides which run is newest
+    for index, path in enumerate(sorted(archive_dir(report_dir).glob("*.tar.gz"))):
+      os.utime(path, (FINISHED + index * 60, FINISHED + index * 60))
+
+  expected = [archive_name(FINISHED + run * 60) for run in range(runs)][runs - kept:]
+  assert archives(report_dir) == expected
+  assert list(report_dir.iterdir()) == []
+
+def test_archive_keeps_the_newest_runs_within_the_size_limit(tmp_path):
+  report_dir = tmp_path / "reports"
+  for run in range(3):
+    # random content does not compress, so every archive is larger than 4 KB
+    write_run(report_dir, finished=FINISHED + run * 60, size=4096)
+    archive_previous_run(str(report_dir), keep_runs=5, keep_bytes=10 * 1024 * 1024)
+    os.utime(archive_dir(report_dir) / archive_name(FINISHED + run * 60), (FINISHED + run * 60, FINISHED + run * 60))
+
+  sizes = {name: (archive_dir(report_dir) / name).stat().st_size for name in archives(report_dir)}
+  newest, second = archive_name(FINISHED + 120), archive_name(FINISHED + 60)
+  retention = archive_previous_run(str(report_dir), keep_runs=5, keep_bytes=sizes[newest] + sizes[second] + 1)
+
+  assert archives(report_dir) == [second, newest]
+  assert (retention.archived, retention.pruned, retention.archive_bytes) == (0, 1, sizes[newest] + sizes[second])
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+
+from tests.page_objects.login_page import LoginPage
+from tests.support.auth_state import AuthStateCache, EXPIRY_MARGIN_SECONDS
+
+BASE_URL = "https://www.saucedemo.com/"
+USERNAME = "standard_user"
+
+def state(username: str = USERNAME, domain: str = "www.saucedemo.com", expires: float = None) -> dict:
+  state = LoginPage.session_state(BASE_URL, username)
+  state["cookies"][0]["domain"] = domain
+  if expires is not None:
+    state["cookies"][0]["expires"] = expires
+  return state
+
+@pytest.fixture
+def cache(tmp_path):
+  return AuthStateCache(str(tmp_path / ".auth" / "storagestate.json"), BASE_URL, USERNAME, ttl=60)
+
+@pytest.mark.parametrize("cookies,valid", [
+  (state()["cookies"], True),
+  # session cookies live as long as the browser
+  (state(expires=-1)["cookies"], True),
+  (state(domain=".www.saucedemo.com")["cookies"], True),
+  ([], False),
+  (state(username="locked_out_user")["cookies"], False),
+  (state(domain="localhost")["cookies"], False),
+  (state(expires=time.time() - 1)["cookies"], False),
+  # about to expire counts as expired
+  (state(expires=time.time() + EXPIRY_MARGIN_SECONDS / 2)["cookies"], False),
+])
+def test_is_valid_checks_the_session_cookie(cache, cookies, valid):
+  assert cache.is_valid({"cookies": cookies, "origins": []}, time.time()) == valid
+
+def test_is_valid_expires_with_the_ttl(cache):
+  assert cache.is_valid(state(), time.time() - 59)
+  assert not cache.is_valid(state(), time.time() - 61)
+
+def test_is_valid_without_ttl_only_checks_the_cookie(tmp_path):
+  cache = AuthStateCache(str(tmp_path / "storagestate.json"), BASE_URL, USERNAME)
+  assert cache.is_valid(state(), 0)
+
+def test_load_forgets_a_saved_state_after_the_ttl(cache, monkeypatch):
+  saved = state()
+  cache.save(saved)
+  assert AuthStateCache(cache.path, BASE_URL, USERNAME, ttl=60).load() == saved
+
+  # another run, after the TTL
+  os.utime(cache.path, (time.time() - 61, time.time() - 61))
+  assert AuthStateCache(cache.path, BASE_URL, USERNAME, ttl=60).load() is None
+
+  # the copy in memory expires as well
+  now = time.time()
+  monkeypatch.setattr(time, "time", lambda: now + 61)
+  assert cache.load() is None
+
+def test_load_ignores_a_state_for_another_user(cache):
+  cache.save(state(username="locked_out_user"))
+  assert AuthStateCache(cache.path, BASE_URL, USERNAME, ttl=60).load() is None
+
+def test_get_or_create_logs_in_once(cache):
+  saved, logins = state(), []
+  login = lambda: logins.append(1) or saved
+  assert cache.get_or_create(login) == saved
+  assert AuthStateCache(cache.path, BASE_URL, USERNAME, ttl=60).get_or_create(login) == saved
+  assert len(logins) == 1
+
+def test_get_or_create_clears_the_cache_when_the_login_fails(cache):
+  cache.save(state(username="locked_out_user"))
+
+  def login():
+    raise AssertionError("login failed")
+  with pytest.raises(AssertionError):
+    cache.get_or_create(login)
+  assert not os.path.exists(cache.path)
@@ -0,0 +1,56 @@
+import pytest
+
+from tests.support.budgets import Budgets, Check, Tolerance, check, update_history
+
+METRIC = "page /inventory.html load_ms"
+
+BUDGETS = Budgets(
+  "desktop",
+  pages={"/inventory.html": {"load_ms": 2000}},
+  tolerance=Tolerance(sigmas=3, relative=0.1, runs=3, min_runs=3),
+)
+
+@pytest.mark.parametrize("samples,history,baseline,allowed,failure", [
+  # within budget, nothing to compare with yet
+  ([900, 1000, 1100], [], None, None, ""),
+  # over the budget itself
+  ([2100, 2200, 2300], [], None, None, "over budget by 200"),
+  # above the baseline, but by less than the relative tolerance
+  ([1080], [1000, 1000, 1000], 1000, 1100, ""),
+  # above the baseline, but inside the noise of the recent runs
+  ([1150], [900, 1000, 1100], 1000, pytest.approx(1444.78), ""),
+  # regressed past the tolerance
+  ([1200], [1000, 1000, 1000], 1000, 1100, "regressed +20% from the baseline"),
+  # too few recent runs for a baseline
+  ([1200], [500, 500], None, None, ""),
+  # only the last `tolerance.runs` runs make the baseline, older ones are forgotten
+  ([1080], [400, 400, 400, 1000, 1000, 1000], 1000, 1100, ""),
+  ([1080], [1000, 1000, 1000, 400, 400, 400], 400, 440, "regressed +170% from the baseline"),
+  # a metric that is usually zero is only held to its budget
+  ([5], [0, 0, 0], 0, None, ""),
+  # no samples in this run
+  ([], [1000, 1000, 1000], None, None, ""),
+])
+def test_check(samples, history, baseline, allowed, failure):
+  [result] = check(BUDGETS, {METRIC: samples}, {METRIC: history})
+  assert (result.baseline, result.allowed, result.failure) == (baseline, allowed, failure)
+
+@pytest.mark.parametrize("history,result,expected", [
+  # passing metrics join the baseline
+  ([], Check(METRIC, 2000, 1000), [1000]),
+  ([900, 1000], Check(METRIC, 2000, 1100), [900, 1000, 1100]),
+  # only the last `tolerance.runs` are kept
+  ([800, 900, 1000], Check(METRIC, 2000, 1100), [900, 1000, 1100]),
+  # a failure never becomes the new normal
+  ([1000], Check(METRIC, 2000, 1200, 1000, 1100, "regressed +20% from the baseline"), [1000]),
+  ([1000], Check(METRIC, 2000, 2100, failure="over budget by 100"), [1000]),
+  # a metric without samples adds nothing
+  ([1000], Check(METRIC, 2000, None), [1000]),
+])
+def test_update_history(history, result, expected):
+  assert update_history({METRIC: history}, [result], BUDGETS.tolerance.runs) == {METRIC: expected}
+
+def test_update_history_leaves_the_old_history_alone():
+  history = {METRIC: [1000]}
+  update_history(history, [Check(METRIC, 2000, 1100)], BUDGETS.tolerance.runs)
+  assert history == {METRIC: [1000]}
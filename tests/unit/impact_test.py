@@ -0,0 +1,71 @@
+import importlib
+import json
+import sys
+import types
+
+import pytest
+
+from tests.support import impact
+from tests.support.impact import dependency_key
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+  """A throwaway package standing in for `tests`: a test module, a page object and two versions of a fixture."""
+  root = tmp_path / "impactpkg"
+  root.mkdir()
+  (root / "__init__.py").write_text("")
+  (root / "page.py").write_text("class Page:\n  PATH = '/inventory.html'\n")
+  (root / "helper.py").write_text("def url():\n  return '/'\n")
+  (root / "flow_test.py").write_text("from impactpkg.page import Page\n\ndef test_flow(page):\n  assert Page.PATH\n")
+  (root / "fixtures_v1.py").write_text("from impactpkg import helper\n\ndef page():\n  return helper.url()\n")
+  (root / "fixtures_v2.py").write_text("from impactpkg import helper\n\ndef page():\n  return helper.url() + 'inventory.html'\n")
+
+  monkeypatch.syspath_prepend(str(tmp_path))
+  monkeypatch.setattr(impact, "PACKAGE", "impactpkg")
+  forget()
+  yield root
+  forget()
+
+def forget():
+  """Drops the package of an earlier test, and what the caches of `impact` remember about it."""
+  for name in [name for name in sys.modules if name.split(".")[0] == "impactpkg"]:
+    del sys.modules[name]
+  for cache in (impact.file_digest, impact.module_file, impact.module_files):
+    cache.cache_clear()
+
+def item(fixture_module: str = "fixtures_v1", *fixtures):
+  """Just the parts of a pytest item that `dependency_key` reads."""
+  fixture = importlib.import_module(f"impactpkg.{fixture_module}").page
+  definitions = {"page": [types.SimpleNamespace(func=fixture)]}
+  for func in fixtures:
+    definitions[func.__name__] = [types.SimpleNamespace(func=func)]
+  return types.SimpleNamespace(
+    module=importlib.import_module("impactpkg.flow_test"),
+    _fixtureinfo=types.SimpleNamespace(name2fixturedefs=definitions),
+  )
+
+def changed(path, text: str):
+  path.write_text(text)
+  impact.file_digest.cache_clear()
+
+def test_key_is_stable(package):
+  assert dependency_key(item(), "app") == dependency_key(item(), "app")
+
+def test_key_changes_with_the_app(package):
+  assert dependency_key(item(), "app") != dependency_key(item(), "new app")
+
+def test_key_changes_with_a_page_object(package):
+  before = dependency_key(item(), "app")
+  changed(package / "page.py", "class Page:\n  PATH = '/cart.html'\n")
+  assert dependency_key(item(), "app") != before
+
+def test_key_changes_with_a_fixture(package):
+  assert dependency_key(item("fixtures_v1"), "app") != dependency_key(item("fixtures_v2"), "app")
+
+def test_key_changes_with_code_a_fixture_uses(package):
+  before = dependency_key(item(), "app")
+  changed(package / "helper.py", "def url():\n  return '/index.html'\n")
+  assert dependency_key(item(), "app") != before
+
+def test_key_ignores_fixtures_of_installed_packages(package):
+  assert dependency_key(item("fixtures_v1", json.dumps), "app") == dependency_key(item(), "app")
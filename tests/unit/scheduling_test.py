@@ -0,0 +1,59 @@
+import pytest
+
+from tests.support.scheduling import plan, update_history
+
+def entry(duration: float, setup: float = 0.0, fixtures: list = None) -> dict:
+  return {"duration": duration, "setup": setup, "fixtures": fixtures or []}
+
+def test_update_history_records_new_tests():
+  history = update_history({}, {"a": 2.0}, {"a": 0.5}, {"a": ["browser"]})
+  assert history == {"a": entry(2.0, 0.5, ["browser"])}
+
+def test_update_history_blends_with_earlier_runs():
+  history = update_history({"a": entry(4.0, 1.0, ["browser"])}, {"a": 2.0}, {"a": 0.5}, {})
+  # keeps the fixtures of the earlier run when this one reported none
+  assert history == {"a": entry(3.0, 0.75, ["browser"])}
+
+def test_update_history_keeps_tests_that_did_not_run():
+  history = update_history({"a": entry(1.0)}, {"b": 2.0}, {}, {})
+  assert history == {"a": entry(1.0), "b": entry(2.0)}
+
+def test_plan_runs_the_longest_tests_first_on_the_emptiest_worker():
+  history = {"a": entry(1.0), "b": entry(5.0), "c": entry(3.0), "d": entry(2.0)}
+  queues, durations = plan(["a", "b", "c", "d"], history, workers=2)
+  assert durations == [1.0, 5.0, 3.0, 2.0]
+  assert queues == [[1, 0], [2, 3]]
+
+def test_plan_estimates_unknown_tests_as_a_median_test():
+  history = {"a": entry(1.0), "b": entry(3.0), "c": entry(8.0)}
+  _, durations = plan(["a", "b", "c", "new"], history, workers=2)
+  assert durations[3] == 3.0
+
+def test_plan_estimates_one_second_without_history():
+  queues, durations = plan(["a", "b"], {}, workers=2)
+  assert durations == [1.0, 1.0]
+  assert sorted(index for queue in queues for index in queue) == [0, 1]
+
+def test_plan_keeps_tests_of_an_expensive_fixture_together():
+  history = {
+    "async_a": entry(6.0, 5.0, ["browser", "async_browser"]),
+    "async_b": entry(1.5, 0.5, ["browser", "async_browser"]),
+    "sync_a": entry(6.0, 0.5, ["browser"]),
+    "sync_b": entry(1.0, 0.5, ["browser"]),
+  }
+  queues, durations = plan(list(history), history, workers=2)
+  # the test that set async_browser up is charged its run time only
+  assert durations[0] == pytest.approx(1.5)
+  assert sorted(queues) == [[0, 1], [2, 3]]
+
+@pytest.mark.parametrize("duration,setup", [
+  (0.2, 5.0),
+  (0.0, 0.5),
+])
+def test_plan_never_estimates_a_negative_duration(duration, setup):
+  history = {
+    "slow_setup": entry(duration, setup, ["browser", "async_browser"]),
+    "other": entry(1.0, 0.0, ["browser"]),
+  }
+  _, durations = plan(list(history), history, workers=2)
+  assert min(durations) >= 0.0